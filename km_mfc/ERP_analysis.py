@@ -1,42 +1,13 @@
 import pandas as pd
-import json
 import matplotlib.pyplot as plt
+from node.storage import load_by_sensor, PCB_COLUMNS, TEROS_COLUMNS
+from node.utils import plot_downsampled
 
 pd.set_option('display.max_columns', None)
 
-def unpackPcbData(dict_input):
-    def safe_get(adc, name, field):
-        return dict_input.get(adc, {}).get(name, {}).get(field, None)
-
-    # Explicit fixed order
-    v0 = safe_get("ADC0", "voltage 1", "voltage")
-    v1 = safe_get("ADC0", "voltage 2", "voltage")
-    v2 = safe_get("ADC1", "voltage 1", "voltage")
-    v3 = safe_get("ADC1", "voltage 2", "voltage")
-
-    i0 = safe_get("ADC0", "current 1", "current")
-    i1 = safe_get("ADC0", "current 2", "current")
-    i2 = safe_get("ADC1", "current 1", "current")
-    i3 = safe_get("ADC1", "current 2", "current")
-
-    return [v0, v1, v2, v3, i0, i1, i2, i3]
-
-
-def unpackTerosData(data_dict):
-    """
-    Extracts elapsed_time, volumetric_water_content, temperature, electric_conductivity.
-    Returns None if any field is missing.
-    """
-    if not isinstance(data_dict, dict):
-        return [None, None, None, None]
-
-    return [
-        data_dict.get("elapsed_time"),
-        data_dict.get("volumetric_water_content"),
-        data_dict.get("temperature"),
-        data_dict.get("electric_conductivity")
-    ]
-
+START = None  # Epoch seconds; None reads from the beginning
+END = None  # Epoch seconds; None reads to the end
+CACHE_DIR = "data/cache"  # Parsed logs; reruns only parse what was appended since the last one
 
 
 while(True):
@@ -56,39 +27,20 @@ waterlogged = pd.read_excel("C:\\Users\\omerm\\OneDrive - Georgia Institute of T
 
 flooded_cells = ['Mehmet', 'Suleyman', 'Lanai', 'Oahu', 'Maui', 'Osman']
 
-pcb_json = []
-teros_json = []
-with open(f"ERPdata/{board}_ERP_{t}s.json", "r") as f:
-    for line in f:
-        record = json.loads(line)
-        if record["sensor_name"] == "pcb_main":
-            pcb_json.append(record)
-        elif record["sensor_name"] == "teros_main":
-            teros_json.append(record)
-
-pcb_df = pd.DataFrame(pcb_json)[['timestamp', 'data']]
-
-try:
-    teros_df = pd.DataFrame(teros_json)[['timestamp', 'data']]
-    # Flatten 'data' into separate columns
-    teros_flat = pd.DataFrame(
-        teros_df["data"].map(unpackTerosData).tolist(),
-        columns=["elapsed_time", "vwc", "temp", "ec"],
-        index=teros_df.index)
-    teros_df = pd.concat([teros_df["timestamp"], teros_flat], axis=1)
-    teros_df.drop('elapsed_time', axis=1, inplace=True)
-    teros_df["Timestamp"] = pd.to_datetime(teros_df.iloc[:, 0], unit='s')
-    teros_df.drop("timestamp", axis=1, inplace=True)
-    ts = teros_df['Timestamp'].copy()
-    teros_df = teros_df.drop(columns=['Timestamp'])
-    teros_df.insert(0, 'Timestamp', ts)
-except:
-    teros_df = pd.DataFrame()
-
-
-pcb_df["data"] = pcb_df["data"].map(unpackPcbData)
-pcb_df[["v0", "v1", "v2", "v3", "i0", "i1", "i2", "i3"]] = pcb_df['data'].tolist()
-pcb_df.drop('data', axis=1, inplace=True)
+# One streaming pass over the log, flattened straight into typed columns; a time
+# window only reads the part of the log its sidecar index points to
+frames = load_by_sensor(f"ERPdata/{board}_ERP_{t}s.json", ['pcb_main', 'teros_main'],
+                        {'pcb_main': ['timestamp'] + list(PCB_COLUMNS),
+                         'teros_main': ['timestamp'] + list(TEROS_COLUMNS)},
+                        start=START, end=END, cache_dir=CACHE_DIR)
+pcb_df = frames['pcb_main']
+
+teros_df = frames['teros_main']
+teros_df["Timestamp"] = pd.to_datetime(teros_df.iloc[:, 0], unit='s')
+teros_df.drop("timestamp", axis=1, inplace=True)
+ts = teros_df['Timestamp'].copy()
+teros_df = teros_df.drop(columns=['Timestamp'])
+teros_df.insert(0, 'Timestamp', ts)
 
 
 
@@ -119,10 +71,10 @@ print(pcb_df)
 # Graph
 fig, ax1 = plt.subplots(figsize=(8, 5))
 
-# Plot PCB voltages on the first y-axis
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 1], label='v0')
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 2], label='v1')
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 3], label='v2')
+# Plot PCB voltages on the first y-axis, decimated to screen resolution and refined on zoom
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 1], label='v0')
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 2], label='v1')
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 3], label='v2')
 """
 if board == 'KMM1':
     ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 4], label=cell_names[3])
@@ -150,6 +102,6 @@ combined_labels = labels1 + labels2
 # Create a single legend using the combined handles and labels
 legend_texts = ax1.legend(combined_handles, combined_labels, loc='lower right').get_texts()
 """
-plt.xlim(min(pcb_df['Timestamp'].tolist()), max(pcb_df['Timestamp'].tolist()))
+plt.xlim(pcb_df['Timestamp'].min(), pcb_df['Timestamp'].max())
 
 plt.show()
@@ -1,42 +1,15 @@
 import pandas as pd
-import json
 import matplotlib.pyplot as plt
+from node.storage import export_parquet, read_parquet, export_excel, PCB_COLUMNS, TEROS_COLUMNS
+from node.utils import plot_downsampled
 
 pd.set_option('display.max_columns', None)
 
-def unpackPcbData(dict_input):
-    def safe_get(adc, name, field):
-        return dict_input.get(adc, {}).get(name, {}).get(field, None)
-
-    # Explicit fixed order
-    v0 = safe_get("ADC0", "voltage 1", "voltage")
-    v1 = safe_get("ADC0", "voltage 2", "voltage")
-    v2 = safe_get("ADC1", "voltage 1", "voltage")
-    v3 = safe_get("ADC1", "voltage 2", "voltage")
-
-    i0 = safe_get("ADC0", "current 1", "current")
-    i1 = safe_get("ADC0", "current 2", "current")
-    i2 = safe_get("ADC1", "current 1", "current")
-    i3 = safe_get("ADC1", "current 2", "current")
-
-    return [v0, v1, v2, v3, i0, i1, i2, i3]
-
-
-def unpackTerosData(data_dict):
-    """
-    Extracts elapsed_time, volumetric_water_content, temperature, electric_conductivity.
-    Returns None if any field is missing.
-    """
-    if not isinstance(data_dict, dict):
-        return [None, None, None, None]
-
-    return [
-        data_dict.get("elapsed_time"),
-        data_dict.get("volumetric_water_content"),
-        data_dict.get("temperature"),
-        data_dict.get("electric_conductivity")
-    ]
-
+PARQUET_ROOT = "data/parquet"
+CACHE_DIR = "data/cache"  # Parsed logs; reruns only parse what was appended since the last one
+START = None  # Epoch seconds; None reads from the beginning
+END = None  # Epoch seconds; None reads to the end
+EXPORT_EXCEL = False  # Excel export of the filtered subset, after the Parquet step
 
 
 while(True):
@@ -51,32 +24,13 @@ waterlogged = pd.read_excel("C:\\Users\\omerm\\OneDrive - Georgia Institute of T
 
 flooded_cells = ['Mehmet', 'Suleyman', 'Lanai', 'Oahu', 'Maui', 'Osman']
 
-json_pcb = []
-with open(f"{board}pcb_main.json", "r") as f:
-    for line in f:
-        json_pcb.append(json.loads(line))
-
-pcb_df = pd.DataFrame(json_pcb)[['timestamp', 'data']]
-
-json_teros = []
-with open(f"{board}teros_main.json", "r") as f:
-    for line in f:
-        json_teros.append(json.loads(line))
-
-teros_df = pd.DataFrame(json_teros)[['timestamp', 'data']]
-
-
-pcb_df["data"] = pcb_df["data"].map(unpackPcbData)
-pcb_df[["v0", "v1", "v2", "v3", "i0", "i1", "i2", "i3"]] = pcb_df['data'].tolist()
-pcb_df.drop('data', axis=1, inplace=True)
+# Export what was appended since the last run into the partitioned dataset, then read back only the needed columns
+export_parquet([f"{board}pcb_main.json", f"{board}teros_main.json"], PARQUET_ROOT, board, cache_dir=CACHE_DIR)
 
-# Flatten 'data' into separate columns
-teros_flat = pd.DataFrame(
-    teros_df["data"].map(unpackTerosData).tolist(),
-    columns=["elapsed_time", "vwc", "temp", "ec"],
-    index=teros_df.index)
-teros_df = pd.concat([teros_df["timestamp"], teros_flat], axis=1)
-teros_df.drop('elapsed_time', axis=1, inplace=True)
+pcb_df = read_parquet(PARQUET_ROOT, columns=['timestamp'] + list(PCB_COLUMNS), board=board,
+                      sensor='pcb_main', start=START, end=END)
+teros_df = read_parquet(PARQUET_ROOT, columns=['timestamp'] + list(TEROS_COLUMNS), board=board,
+                        sensor='teros_main', start=START, end=END)
 
 pcb_df["Timestamp"] = pd.to_datetime(pcb_df.iloc[:, 0], unit='s')
 teros_df["Timestamp"] = pd.to_datetime(teros_df.iloc[:, 0], unit='s')
@@ -102,20 +56,21 @@ ts = teros_df['Timestamp'].copy()
 teros_df = teros_df.drop(columns=['Timestamp'])
 teros_df.insert(0, 'Timestamp', ts)
 
-pcb_df.to_excel(f"data/{board}_pcb_9-15.xlsx", index=False)
-teros_df.to_excel(f"data/{board}_teros_9-15.xlsx", index=False)
+if EXPORT_EXCEL:
+    export_excel(pcb_df, f"data/{board}_pcb_9-15.xlsx")
+    export_excel(teros_df, f"data/{board}_teros_9-15.xlsx")
 print(pcb_df)
 print(teros_df)
 
 # Graph
 fig, ax1 = plt.subplots(figsize=(8, 5))
 
-# Plot PCB voltages on the first y-axis
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 1], label=cell_names[0])
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 2], label=cell_names[1])
-ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 3], label=cell_names[2])
+# Plot PCB voltages on the first y-axis, decimated to screen resolution and refined on zoom
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 1], label=cell_names[0])
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 2], label=cell_names[1])
+plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 3], label=cell_names[2])
 if board == 'KMM1':
-    ax1.plot(pcb_df.iloc[:, 0], pcb_df.iloc[:, 4], label=cell_names[3])
+    plot_downsampled(ax1, pcb_df.iloc[:, 0], pcb_df.iloc[:, 4], label=cell_names[3])
 
 ax1.set_xlabel(pcb_df.columns[0])  # x-axis label
 ax1.set_ylabel("Voltage")
@@ -138,7 +93,8 @@ else:
 
 # Create secondary y-axis for Teros VWC
 ax2 = ax1.twinx()
-ax2.plot(teros_df['Timestamp'], teros_df['vwc'], color='purple', linestyle='--', lw=0.5, label='Teros VWC')
+plot_downsampled(ax2, teros_df['Timestamp'], teros_df['vwc'], color='purple', linestyle='--', lw=0.5,
+                 label='Teros VWC')
 ax2.set_ylabel("VWC")
 
 # Collect handles and labels from both axes
@@ -158,6 +114,6 @@ for text in legend_texts:
 for x in waterlogged['Datetime']:
     plt.axvline(x=x, color='black', linestyle='--', lw=3)
 
-plt.xlim(min(pcb_df['Timestamp'].tolist()), max(pcb_df['Timestamp'].tolist()))
+plt.xlim(pcb_df['Timestamp'].min(), pcb_df['Timestamp'].max())
 
 plt.show()
@@ -1,14 +1,11 @@
 """Used for experiments to see if pcb current data is accurate"""
 
-import os
 import logging
-import queue
 import time
-import json
 import RPi.GPIO as GPIO
 from node.config import HardwareConfig, DigitalPotChannel
 from node.sensors import PCBSensor, TerosArduinoSensor
-from node.adapters import LoggingAdapter, QueueAdapter
+from node.adapters import LoggingAdapter, FileStorageAdapter
 from node.management import SensorManager
 from node.utils import get_current_serial_device
 
@@ -37,32 +34,6 @@ def set_closed_circuit(gpio_pins):
     print("Switched to CLOSED circuit")
 
 
-def data_processor(data_queue: queue.Queue):
-    """Process sensor data from queue"""
-    while True:
-        try:
-            reading = data_queue.get(timeout=1.0)
-
-            # Add mode info to reading dictionary
-            reading_dict = reading.to_dict()
-            reading_dict["circuit_mode"] = current_mode
-
-            # Process the reading (e.g., save to database, send to cloud, etc.)
-            print(f"Processing: {reading.sensor_name} at {reading.timestamp} ({current_mode})")
-
-            output_dir = "logs"
-            os.makedirs(output_dir, exist_ok=True)
-
-            filename = os.path.join(output_dir, f"ERP_1s_{reading.sensor_name}_data.json")
-            with open(filename, "a") as f:
-                json.dump(reading_dict, f)
-                f.write('\n')
-
-        except queue.Empty:
-            continue
-        except Exception as e:
-            print(f"Data processing error: {e}")
-
 def main():
 
     # Configure logging
@@ -74,10 +45,13 @@ def main():
     # Create configuration
     config = HardwareConfig()
 
-    # Create data queue and adapters
-    data_queue = queue.Queue(maxsize=1000)
+    # Create adapters; each record is tagged with the circuit mode
     logger_adapter = LoggingAdapter()
-    queue_adapter = QueueAdapter(data_queue)
+    storage_adapter = FileStorageAdapter(
+        directory="logs",
+        filename="ERP_1s_{sensor_name}_data.json",
+        annotate=lambda reading: {"circuit_mode": current_mode}
+    )
 
     # Initialize sensors
     pcb_sensor = PCBSensor("pcb_main", config)
@@ -85,16 +59,10 @@ def main():
 
     # Initialize sensor manager and add sensors
     manager = SensorManager()
-    manager.add_sensor(pcb_sensor, interval=.1, adapters=[logger_adapter, queue_adapter])
-    manager.add_sensor(arduino_sensor, interval=300, adapters=[logger_adapter, queue_adapter])
+    manager.add_sensor(pcb_sensor, interval=.1, adapters=[logger_adapter, storage_adapter])
+    manager.add_sensor(arduino_sensor, interval=300, adapters=[logger_adapter, storage_adapter])
 
     try:
-        # Start data processor thread
-        from threading import Thread
-        processor_thread = Thread(target=data_processor, args=(data_queue,))
-        processor_thread.daemon = True
-        processor_thread.start()
-
         # Start all sensors
         manager.start_all()
 
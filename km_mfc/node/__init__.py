@@ -1,14 +1,18 @@
 """Sensor System Package."""
 
-from .config import HardwareConfig, SensorReading, ADCChannel, DigitalPotChannel
-from .sensors import BaseSensor, PCBSensor, TerosArduinoSensor
-from .adapters import SensorDataAdapter, LoggingAdapter, QueueAdapter
-from .management import SensorManager
+from .config import (HardwareConfig, AcquisitionProfile, ChannelScaling, SensorReading, ADCChannel, DigitalPotChannel,
+                     BoardConfig)
+from .sensors import BaseSensor, PCBSensor, TerosArduinoSensor, AsyncBaseSensor
+from .adapters import (SensorDataAdapter, LoggingAdapter, QueueAdapter, BufferedAdapter, OverflowPolicy,
+                       FileStorageAdapter, AsyncSensorDataAdapter)
+from .management import SensorManager, AsyncSensorManager, MissedDeadlinePolicy, BoardRegistry
 
 __version__ = "1.0.0"
 __all__ = [
-    'HardwareConfig', 'SensorReading', 'ADCChannel', 'DigitalPotChannel',
-    'BaseSensor', 'PCBSensor', 'TerosArduinoSensor',
-    'SensorDataAdapter', 'LoggingAdapter', 'QueueAdapter',
-    'SensorManager'
+    'HardwareConfig', 'AcquisitionProfile', 'ChannelScaling', 'SensorReading', 'ADCChannel', 'DigitalPotChannel',
+    'BoardConfig',
+    'BaseSensor', 'PCBSensor', 'TerosArduinoSensor', 'AsyncBaseSensor',
+    'SensorDataAdapter', 'LoggingAdapter', 'QueueAdapter', 'BufferedAdapter', 'OverflowPolicy', 'FileStorageAdapter',
+    'AsyncSensorDataAdapter',
+    'SensorManager', 'AsyncSensorManager', 'MissedDeadlinePolicy', 'BoardRegistry'
 ]
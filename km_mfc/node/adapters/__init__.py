@@ -3,5 +3,14 @@
 from .base_adapter import SensorDataAdapter
 from .logging_adapter import LoggingAdapter
 from .queue_adapter import QueueAdapter
+from .buffered_adapter import BufferedAdapter, OverflowPolicy
+from .batching_adapter import BatchingAdapter
+from .file_storage_adapter import FileStorageAdapter, FsyncPolicy
+from .pcb_segment_adapter import PCBSegmentAdapter
+from .async_adapter import AsyncSensorDataAdapter, ThreadedAdapter, AsyncQueueAdapter
 
-__all__ = ['SensorDataAdapter', 'LoggingAdapter', 'QueueAdapter']
+__all__ = [
+    'SensorDataAdapter', 'LoggingAdapter', 'QueueAdapter', 'BufferedAdapter', 'OverflowPolicy',
+    'BatchingAdapter', 'FileStorageAdapter', 'FsyncPolicy', 'PCBSegmentAdapter',
+    'AsyncSensorDataAdapter', 'ThreadedAdapter', 'AsyncQueueAdapter'
+]
@@ -0,0 +1,59 @@
+"""Asyncio adapter interface and thread-offload shim."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+import logging
+from typing import List, Optional
+from .base_adapter import SensorDataAdapter
+from ..config import SensorReading
+
+class AsyncSensorDataAdapter(ABC):
+    """Abstract adapter for sensor data processing on an asyncio event loop"""
+
+    @abstractmethod
+    async def process_reading(self, reading: SensorReading):
+        """Process a sensor reading"""
+        pass
+
+    async def process_batch(self, readings: List[SensorReading]):
+        """Process several readings at once; override to amortize per-reading cost"""
+        for reading in readings:
+            await self.process_reading(reading)
+
+class ThreadedAdapter(AsyncSensorDataAdapter):
+    """Runs a blocking SensorDataAdapter in a worker thread"""
+
+    def __init__(self, adapter: SensorDataAdapter, executor: Optional[Executor] = None):
+        self.adapter = adapter
+        self.executor = executor
+
+    async def process_reading(self, reading: SensorReading):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.adapter.process_reading, reading)
+
+    async def process_batch(self, readings: List[SensorReading]):
+        # One thread hop for the whole batch
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.adapter.process_batch, readings)
+
+class AsyncQueueAdapter(AsyncSensorDataAdapter):
+    """asyncio.Queue adapter for consumers running on the same event loop"""
+
+    def __init__(self, data_queue: asyncio.Queue):
+        self.queue = data_queue
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def process_reading(self, reading: SensorReading):
+        try:
+            self.queue.put_nowait(reading)
+        except asyncio.QueueFull:
+            self.logger.warning(f"Data queue full, dropping reading from {reading.sensor_name}")
+
+    async def process_batch(self, readings: List[SensorReading]):
+        for i, reading in enumerate(readings):
+            try:
+                self.queue.put_nowait(reading)
+            except asyncio.QueueFull:
+                self.logger.warning(f"Data queue full, dropping {len(readings) - i} readings")
+                return
@@ -1,6 +1,7 @@
 """Base adapter class."""
 
 from abc import ABC, abstractmethod
+from typing import List
 from ..config import SensorReading
 
 class SensorDataAdapter(ABC):
@@ -10,3 +11,12 @@ class SensorDataAdapter(ABC):
     def process_reading(self, reading: SensorReading):
         """Process a sensor reading"""
         pass
+    
+    def process_batch(self, readings: List[SensorReading]):
+        """Process several readings at once; override to amortize per-reading cost"""
+        for reading in readings:
+            self.process_reading(reading)
+    
+    def close(self):
+        """Release resources held by the adapter"""
+        pass
@@ -0,0 +1,127 @@
+"""Adapter wrapper that groups readings into batches."""
+
+import logging
+import time
+from threading import Thread, Condition, Lock
+from typing import Dict, List, Optional
+from .base_adapter import SensorDataAdapter
+from ..config import SensorReading
+
+class BatchingAdapter(SensorDataAdapter):
+    """Collects readings and hands them to another adapter's process_batch()
+
+    A batch is emitted once it holds max_batch readings or once max_delay
+    seconds have passed since its first reading, whichever comes first. Emits
+    run on a flusher thread, so process_reading() never waits on the sink.
+    """
+
+    def __init__(self, adapter: SensorDataAdapter, max_batch: int = 100, max_delay: float = 1.0):
+        if max_batch <= 0:
+            raise ValueError("Batch size must be positive")
+        if max_delay <= 0:
+            raise ValueError("Batch delay must be positive")
+
+        self.adapter = adapter
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{adapter.__class__.__name__}")
+
+        self._batch: List[SensorReading] = []
+        self._arrivals: List[float] = []  # Monotonic arrival time of each pending reading
+        self._first: Optional[float] = None
+        self._cond = Condition()
+        self._emit_lock = Lock()
+        self._closed = False
+        self._stats = {'readings': 0, 'batches': 0, 'errors': 0}
+
+        self._thread = Thread(target=self._flusher, name=f"BatchingAdapter-{adapter.__class__.__name__}",
+                              daemon=True)
+        self._thread.start()
+
+    def process_reading(self, reading: SensorReading):
+        self.process_batch([reading])
+
+    def process_batch(self, readings: List[SensorReading]):
+        if not readings:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if not self._batch:
+                self._first = now
+            self._batch.extend(readings)
+            self._arrivals.extend([now] * len(readings))
+            if len(self._batch) >= self.max_batch:
+                self._cond.notify_all()
+
+    def _take(self) -> List[SensorReading]:
+        """Remove up to max_batch readings from the pending batch; caller holds the condition"""
+        batch = self._batch[:self.max_batch]
+        del self._batch[:self.max_batch]
+        del self._arrivals[:self.max_batch]
+        # Leftovers keep their age, so none waits longer than max_delay for its batch
+        self._first = self._arrivals[0] if self._arrivals else None
+        return batch
+
+    def _flusher(self):
+        """Emit batches when full or when the oldest pending reading reaches max_delay"""
+        while True:
+            with self._cond:
+                while True:
+                    if len(self._batch) >= self.max_batch:
+                        break
+                    if self._closed:
+                        break
+                    if self._first is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._first + self.max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                if self._closed and not self._batch:
+                    return
+                batch = self._take()
+
+            self._emit(batch)
+
+    def _emit(self, batch: List[SensorReading]):
+        """Hand one batch to the wrapped adapter"""
+        if not batch:
+            return
+        with self._emit_lock:
+            try:
+                self.adapter.process_batch(batch)
+                self._stats['readings'] += len(batch)
+                self._stats['batches'] += 1
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"Adapter error for batch of {len(batch)} readings: {e}")
+
+    @property
+    def pending(self) -> int:
+        """Number of readings waiting for the next batch"""
+        return len(self._batch)
+
+    def stats(self) -> Dict[str, int]:
+        """Batch and reading counters"""
+        with self._cond:
+            return dict(self._stats, pending=len(self._batch))
+
+    def flush(self):
+        """Emit everything pending now, from the calling thread"""
+        while True:
+            with self._cond:
+                batch = self._take()
+            if not batch:
+                return
+            self._emit(batch)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Emit pending readings, stop the flusher and close the wrapped adapter"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        self.flush()
+        self.adapter.close()
@@ -0,0 +1,161 @@
+"""Queued adapter wrapper that decouples consumers from acquisition."""
+
+import logging
+import time
+from collections import deque
+from enum import Enum
+from threading import Thread, Condition
+from typing import Dict, List, Optional
+from .base_adapter import SensorDataAdapter
+from ..config import SensorReading
+
+class OverflowPolicy(Enum):
+    """What a full adapter queue does with a new reading"""
+    BLOCK = "block"  # Wait for room, stalling the producer
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest queued reading
+    DROP_NEWEST = "drop_newest"  # Discard the new reading
+    SAMPLE = "sample"  # Past half full keep only every Nth reading, evicting the oldest if full
+
+class BufferedAdapter(SensorDataAdapter):
+    """Runs another adapter on its own worker thread behind a bounded queue
+
+    process_reading() only enqueues, so a slow consumer never delays the sensor
+    that produced the reading. When a backlog builds up the worker drains up to
+    max_batch readings at a time through the adapter's process_batch(). Queue
+    depth and drop counts are kept in stats().
+    """
+
+    def __init__(self, adapter: SensorDataAdapter, maxsize: int = 1000,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 sample_every: int = 10, block_timeout: Optional[float] = None,
+                 max_batch: int = 100):
+        if maxsize <= 0:
+            raise ValueError("Queue size must be positive")
+
+        self.adapter = adapter
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.sample_every = sample_every
+        self.block_timeout = block_timeout
+        self.max_batch = max(1, max_batch)
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{adapter.__class__.__name__}")
+
+        self._queue = deque()
+        self._cond = Condition()
+        self._closed = False
+        self._busy = False
+        self._sample_count = 0
+        self._stats = {'enqueued': 0, 'processed': 0, 'dropped': 0, 'errors': 0, 'max_depth': 0}
+
+        self._thread = Thread(target=self._worker, name=f"BufferedAdapter-{adapter.__class__.__name__}",
+                              daemon=True)
+        self._thread.start()
+
+    def process_reading(self, reading: SensorReading):
+        with self._cond:
+            self._enqueue(reading)
+
+    def process_batch(self, readings: List[SensorReading]):
+        with self._cond:
+            for reading in readings:
+                self._enqueue(reading)
+
+    def _enqueue(self, reading: SensorReading):
+        """Queue one reading under the overflow policy; caller holds the condition"""
+        if self._closed or not self._admit():
+            self._stats['dropped'] += 1
+            return
+
+        self._queue.append(reading)
+        self._stats['enqueued'] += 1
+        self._stats['max_depth'] = max(self._stats['max_depth'], len(self._queue))
+        self._cond.notify_all()
+
+    def _admit(self) -> bool:
+        """Apply the overflow policy, making room if needed; caller holds the condition"""
+        depth = len(self._queue)
+
+        if self.overflow is OverflowPolicy.SAMPLE and depth >= self.maxsize // 2:
+            self._sample_count += 1
+            if self._sample_count % self.sample_every:
+                return False
+            if depth >= self.maxsize:
+                self._queue.popleft()
+                self._stats['dropped'] += 1
+            return True
+
+        if depth < self.maxsize:
+            return True
+
+        if self.overflow is OverflowPolicy.DROP_OLDEST:
+            self._queue.popleft()
+            self._stats['dropped'] += 1
+            return True
+
+        if self.overflow is OverflowPolicy.BLOCK:
+            deadline = None if self.block_timeout is None else time.monotonic() + self.block_timeout
+            while len(self._queue) >= self.maxsize and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return not self._closed
+
+        return False
+
+    def _worker(self):
+        """Hand queued readings to the wrapped adapter until closed and drained"""
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+                self._busy = True
+                self._cond.notify_all()
+
+            try:
+                if len(batch) == 1:
+                    self.adapter.process_reading(batch[0])
+                else:
+                    self.adapter.process_batch(batch)
+                self._stats['processed'] += len(batch)
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"Adapter error for {batch[0].sensor_name}: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    @property
+    def depth(self) -> int:
+        """Number of readings waiting in the queue"""
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth, throughput and drop counters"""
+        with self._cond:
+            return dict(self._stats, depth=len(self._queue))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued reading has been processed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Drain the queue, stop the worker and close the wrapped adapter"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            self.logger.warning(f"Worker still draining {len(self._queue)} readings after close")
+        self.adapter.close()
@@ -0,0 +1,231 @@
+"""Buffered newline-delimited JSON file storage adapter."""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from threading import Thread, Event, RLock
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+from .base_adapter import SensorDataAdapter
+from ..config import SensorReading
+from ..storage.time_index import TimeIndexWriter, index_path
+
+class FsyncPolicy(Enum):
+    """When written data is forced to stable storage"""
+    NEVER = "never"  # Leave it to the OS
+    ON_ROTATE = "on_rotate"  # When a segment is rotated or closed
+    ON_FLUSH = "on_flush"  # After every buffer flush
+    ALWAYS = "always"  # After every write
+
+@dataclass
+class _Segment:
+    """An open output file and its bookkeeping"""
+    path: str
+    handle: BinaryIO
+    size: int
+    opened: float
+    dirty: bool = False
+    index: Optional[TimeIndexWriter] = None
+
+class FileStorageAdapter(SensorDataAdapter):
+    """Appends readings as JSON lines to one file per sensor through open, buffered handles
+
+    Files are named by formatting filename with the reading's sensor_name and
+    live in directory. Buffers are flushed every flush_interval seconds by a
+    background thread (or after every write when it is 0) and fsynced per
+    fsync_policy. With max_bytes or max_age set, the active file is renamed to
+    a timestamped segment and a fresh one started. An existing file whose last
+    line was torn by a crash is truncated back to the last complete line before
+    appending. annotate may return extra fields merged into each record.
+
+    Unless index_every is None, each file gets a sidecar time index with an
+    entry every index_every records, which moves with it on rotation and is
+    trimmed or rebuilt when an existing file is reopened.
+    """
+
+    def __init__(self, directory: str = "logs", filename: str = "sensor_data_{sensor_name}.json",
+                 flush_interval: float = 1.0, fsync_policy: FsyncPolicy = FsyncPolicy.ON_ROTATE,
+                 max_bytes: Optional[int] = None, max_age: Optional[float] = None,
+                 buffer_size: int = 65536, index_every: Optional[int] = 1000,
+                 annotate: Optional[Callable[[SensorReading], Dict[str, Any]]] = None):
+        self.directory = directory
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.buffer_size = buffer_size
+        self.index_every = index_every
+        self.annotate = annotate
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._segments: Dict[str, _Segment] = {}
+        self._lock = RLock()
+        self._stop = Event()
+        self._stats = {'records': 0, 'bytes': 0, 'flushes': 0, 'fsyncs': 0, 'rotations': 0,
+                       'recovered_bytes': 0}
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._thread: Optional[Thread] = None
+        if flush_interval > 0:
+            self._thread = Thread(target=self._flusher, name="FileStorageFlusher", daemon=True)
+            self._thread.start()
+
+    def path_for(self, sensor_name: str) -> str:
+        """Active file path for a sensor"""
+        return os.path.join(self.directory, self.filename.format(sensor_name=sensor_name))
+
+    def _encode(self, reading: SensorReading) -> bytes:
+        """Serialize one reading as a JSON line"""
+        record = reading.to_dict()
+        if self.annotate is not None:
+            record.update(self.annotate(reading))
+        return (json.dumps(record) + '\n').encode('utf-8')
+
+    def process_reading(self, reading: SensorReading):
+        self._write(reading.sensor_name, [(reading.timestamp, self._encode(reading))])
+
+    def process_batch(self, readings: List[SensorReading]):
+        lines: Dict[str, List[Tuple[float, bytes]]] = {}
+        for reading in readings:
+            lines.setdefault(reading.sensor_name, []).append((reading.timestamp, self._encode(reading)))
+        for sensor_name, sensor_lines in lines.items():
+            self._write(sensor_name, sensor_lines)
+
+    def _write(self, sensor_name: str, lines: List[Tuple[float, bytes]]):
+        """Append (timestamp, encoded line) pairs to a sensor's active segment"""
+        data = b''.join(line for _, line in lines)
+        with self._lock:
+            segment = self._segment(sensor_name, len(data))
+            if segment.index is not None:
+                offset = segment.size
+                for timestamp, line in lines:
+                    segment.index.add(timestamp, offset)
+                    offset += len(line)
+            segment.handle.write(data)
+            segment.size += len(data)
+            segment.dirty = True
+            self._stats['records'] += len(lines)
+            self._stats['bytes'] += len(data)
+
+            if self.flush_interval <= 0 or self.fsync_policy is FsyncPolicy.ALWAYS:
+                self._flush_segment(segment)
+
+    def _segment(self, sensor_name: str, incoming: int) -> _Segment:
+        """Open or rotate the segment that the next write of incoming bytes goes to"""
+        segment = self._segments.get(sensor_name)
+        if segment is not None and self._needs_rotation(segment, incoming):
+            self._rotate(sensor_name, segment)
+            segment = None
+
+        if segment is None:
+            path = self.path_for(sensor_name)
+            if os.path.exists(path):
+                self._recover(path)
+            index = TimeIndexWriter(path, self.index_every) if self.index_every else None
+            handle = open(path, 'ab', buffering=self.buffer_size)
+            segment = _Segment(path=path, handle=handle, size=handle.tell(), opened=time.time(), index=index)
+            self._segments[sensor_name] = segment
+        return segment
+
+    def _needs_rotation(self, segment: _Segment, incoming: int) -> bool:
+        """Whether the segment has reached its size or age limit"""
+        if self.max_bytes is not None and segment.size > 0 and segment.size + incoming > self.max_bytes:
+            return True
+        return self.max_age is not None and time.time() - segment.opened >= self.max_age
+
+    def _rotate(self, sensor_name: str, segment: _Segment):
+        """Close the active file and move it aside under a timestamped name"""
+        self._close_segment(segment)
+        del self._segments[sensor_name]
+
+        stem, ext = os.path.splitext(segment.path)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(segment.opened))
+        target = f"{stem}.{stamp}{ext}"
+        counter = 1
+        while os.path.exists(target):
+            target = f"{stem}.{stamp}-{counter}{ext}"
+            counter += 1
+        os.replace(segment.path, target)
+        if segment.index is not None:
+            os.replace(index_path(segment.path), index_path(target))
+        self._stats['rotations'] += 1
+        self.logger.info(f"Rotated {segment.path} to {target}")
+
+    def _recover(self, path: str):
+        """Truncate a torn final line left by a crash"""
+        with open(path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+
+            end = 0
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                index = f.read(step).rfind(b'\n')
+                if index >= 0:
+                    end = pos + index + 1
+                    break
+            f.truncate(end)
+
+        self._stats['recovered_bytes'] += size - end
+        self.logger.warning(f"Truncated {size - end} bytes of partial record from {path}")
+
+    def _flush_segment(self, segment: _Segment, fsync: bool = False):
+        """Flush a segment's buffer and fsync it if the policy asks; caller holds the lock"""
+        if not segment.dirty:
+            return
+        segment.handle.flush()
+        if segment.index is not None:
+            segment.index.flush()  # After the data, so entries never point past it
+        segment.dirty = False
+        self._stats['flushes'] += 1
+        if fsync or self.fsync_policy in (FsyncPolicy.ON_FLUSH, FsyncPolicy.ALWAYS):
+            os.fsync(segment.handle.fileno())
+            self._stats['fsyncs'] += 1
+
+    def _close_segment(self, segment: _Segment):
+        """Flush, fsync per policy and close a segment; caller holds the lock"""
+        segment.dirty = True
+        self._flush_segment(segment, fsync=self.fsync_policy is not FsyncPolicy.NEVER)
+        segment.handle.close()
+        if segment.index is not None:
+            segment.index.close()
+
+    def _flusher(self):
+        """Flush dirty buffers every flush_interval seconds"""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Flush error: {e}")
+
+    def flush(self):
+        """Write out all buffered data now"""
+        with self._lock:
+            for segment in self._segments.values():
+                self._flush_segment(segment)
+
+    def stats(self) -> Dict[str, int]:
+        """Record, byte, flush, fsync, rotation and recovery counters"""
+        with self._lock:
+            return dict(self._stats, open_files=len(self._segments))
+
+    def close(self):
+        """Flush and close every open file"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        with self._lock:
+            for segment in self._segments.values():
+                self._close_segment(segment)
+            self._segments.clear()
@@ -2,7 +2,7 @@
 
 import logging
 import json
-from typing import Optional
+from typing import List, Optional
 from .base_adapter import SensorDataAdapter
 from ..config import SensorReading
 
@@ -14,6 +14,21 @@ class LoggingAdapter(SensorDataAdapter):
     
     def process_reading(self, reading: SensorReading):
         if reading.status == "success":
-            self.logger.info(f"{reading.sensor_name}: {json.dumps(reading.data, indent=2)}")
+            self.logger.info(self._format(reading))
         else:
             self.logger.error(f"{reading.sensor_name} error: {reading.error_message}")
+    
+    def process_batch(self, readings: List[SensorReading]):
+        # One log record per batch, with each reading formatted as process_reading() would
+        lines = []
+        for reading in readings:
+            if reading.status == "success":
+                lines.append(self._format(reading))
+            else:
+                self.logger.error(f"{reading.sensor_name} error: {reading.error_message}")
+        if lines:
+            self.logger.info("\n".join(lines))
+    
+    def _format(self, reading: SensorReading) -> str:
+        """Log line for a successful reading"""
+        return f"{reading.sensor_name}: {json.dumps(reading.data, indent=2)}"
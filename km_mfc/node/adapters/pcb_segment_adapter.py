@@ -0,0 +1,111 @@
+"""Adapter writing PCB readings to binary segment files."""
+
+import logging
+import os
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+from .base_adapter import SensorDataAdapter
+from .file_storage_adapter import FsyncPolicy
+from ..config import HardwareConfig, SensorReading
+from ..sensors import PCBSensor
+from ..storage.pcb_segment import PCBSegmentWriter, segment_channels, SEGMENT_EXTENSION
+
+class PCBSegmentAdapter(SensorDataAdapter):
+    """Stores PCB readings as fixed-size binary records, one segment series per sensor
+
+    Every run starts a new segment named <filename>-<start time>.pcbseg in
+    directory, so a header always matches the configuration that wrote it.
+    Segments rotate after max_records records or max_age seconds. Buffers are
+    flushed on the first write after flush_interval seconds and on close.
+    annotate has the same signature as FileStorageAdapter's; its
+    'circuit_mode' entry fills the record's circuit mode.
+    """
+
+    def __init__(self, config: HardwareConfig, directory: str = "logs", filename: str = "{sensor_name}",
+                 profile: Optional[str] = None, channel_map: Optional[Dict[str, int]] = None,
+                 flush_interval: float = 1.0, fsync_policy: FsyncPolicy = FsyncPolicy.ON_ROTATE,
+                 max_records: Optional[int] = None, max_age: Optional[float] = None,
+                 annotate: Optional[Callable[[SensorReading], Dict[str, Any]]] = None):
+        self.directory = directory
+        self.filename = filename
+        self.slots = segment_channels(channel_map or PCBSensor.CHANNEL_MAP, config, profile)
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.max_records = max_records
+        self.max_age = max_age
+        self.annotate = annotate
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._writers: Dict[str, PCBSegmentWriter] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._lock = Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    def process_reading(self, reading: SensorReading):
+        self.process_batch([reading])
+
+    def process_batch(self, readings: List[SensorReading]):
+        by_sensor: Dict[str, List[SensorReading]] = {}
+        for reading in readings:
+            by_sensor.setdefault(reading.sensor_name, []).append(reading)
+
+        with self._lock:
+            for sensor_name, sensor_readings in by_sensor.items():
+                modes = None
+                if self.annotate is not None:
+                    modes = [self.annotate(reading).get('circuit_mode') for reading in sensor_readings]
+                writer = self._writer(sensor_name)
+                writer.write(sensor_readings, modes)
+
+                now = time.monotonic()
+                always = self.fsync_policy is FsyncPolicy.ALWAYS
+                if always or now - self._last_flush[sensor_name] >= self.flush_interval:
+                    writer.flush(fsync=self.fsync_policy in (FsyncPolicy.ON_FLUSH, FsyncPolicy.ALWAYS))
+                    self._last_flush[sensor_name] = now
+
+    def _writer(self, sensor_name: str) -> PCBSegmentWriter:
+        """Current segment writer for a sensor, rotating when it is full or old"""
+        writer = self._writers.get(sensor_name)
+        if writer is not None and self._needs_rotation(writer):
+            self._close_writer(writer)
+            writer = None
+
+        if writer is None:
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            base = os.path.join(self.directory, f"{self.filename.format(sensor_name=sensor_name)}-{stamp}")
+            path = base + SEGMENT_EXTENSION
+            counter = 1
+            while os.path.exists(path):
+                path = f"{base}-{counter}{SEGMENT_EXTENSION}"
+                counter += 1
+            writer = PCBSegmentWriter(path, self.slots, sensor_name)
+            self._writers[sensor_name] = writer
+            self._last_flush[sensor_name] = time.monotonic()
+            self.logger.info(f"Started segment {path}")
+        return writer
+
+    def _needs_rotation(self, writer: PCBSegmentWriter) -> bool:
+        """Whether a segment has reached its record or age limit"""
+        if self.max_records is not None and writer.records >= self.max_records:
+            return True
+        return self.max_age is not None and time.time() - writer.created >= self.max_age
+
+    def _close_writer(self, writer: PCBSegmentWriter):
+        """Flush, fsync per policy and close a segment"""
+        writer.flush(fsync=self.fsync_policy is not FsyncPolicy.NEVER)
+        writer.close()
+
+    def flush(self):
+        """Write out all buffered records now"""
+        with self._lock:
+            for writer in self._writers.values():
+                writer.flush()
+
+    def close(self):
+        """Close every open segment"""
+        with self._lock:
+            for writer in self._writers.values():
+                self._close_writer(writer)
+            self._writers.clear()
@@ -2,14 +2,20 @@
 
 import queue
 import logging
+from typing import List
 from .base_adapter import SensorDataAdapter
 from ..config import SensorReading
 
 class QueueAdapter(SensorDataAdapter):
-    """Queue-based adapter for async processing"""
+    """Queue-based adapter for async processing
     
-    def __init__(self, data_queue: queue.Queue):
+    With batch_items set, process_batch() puts the whole list on the queue as a
+    single item, so consumers must expect lists of readings.
+    """
+    
+    def __init__(self, data_queue: queue.Queue, batch_items: bool = False):
         self.queue = data_queue
+        self.batch_items = batch_items
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def process_reading(self, reading: SensorReading):
@@ -17,3 +23,20 @@ class QueueAdapter(SensorDataAdapter):
             self.queue.put_nowait(reading)
         except queue.Full:
             self.logger.warning(f"Data queue full, dropping reading from {reading.sensor_name}")
+    
+    def process_batch(self, readings: List[SensorReading]):
+        if not readings:
+            return
+        if self.batch_items:
+            try:
+                self.queue.put_nowait(list(readings))
+            except queue.Full:
+                self.logger.warning(f"Data queue full, dropping batch of {len(readings)} readings")
+            return
+        
+        for i, reading in enumerate(readings):
+            try:
+                self.queue.put_nowait(reading)
+            except queue.Full:
+                self.logger.warning(f"Data queue full, dropping {len(readings) - i} readings")
+                return
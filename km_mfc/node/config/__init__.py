@@ -1,5 +1,10 @@
 """Configuration module for sensor system."""
 
-from .hardware_config import HardwareConfig, SensorReading, ADCChannel, DigitalPotChannel
+from .hardware_config import (
+    HardwareConfig, AcquisitionProfile, ChannelScaling, SensorReading, ADCChannel, DigitalPotChannel, BoardConfig
+)
 
-__all__ = ['HardwareConfig', 'SensorReading', 'ADCChannel', 'DigitalPotChannel']
+__all__ = [
+    'HardwareConfig', 'AcquisitionProfile', 'ChannelScaling', 'SensorReading', 'ADCChannel', 'DigitalPotChannel',
+    'BoardConfig'
+]
@@ -1,8 +1,8 @@
 """Hardware configuration management for sensor system."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, asdict, replace
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import json
 
 class ADCChannel(Enum):
@@ -17,6 +17,128 @@ class DigitalPotChannel(Enum):
     AD2 = 2
     AD3 = 3
 
+# MCP3564 oversampling ratio -> (OSR[3:0] code, SINC3 ratio OSR3, SINC1 ratio OSR2)
+MCP3564_OSR = {
+    32: (0b0000, 32, 1), 64: (0b0001, 64, 1), 128: (0b0010, 128, 1),
+    256: (0b0011, 256, 1), 512: (0b0100, 512, 1), 1024: (0b0101, 512, 2),
+    2048: (0b0110, 512, 4), 4096: (0b0111, 512, 8), 8192: (0b1000, 512, 16),
+    16384: (0b1001, 512, 32), 20480: (0b1010, 512, 40), 24576: (0b1011, 512, 48),
+    40960: (0b1100, 512, 80), 49152: (0b1101, 512, 96), 81920: (0b1110, 512, 160),
+    98304: (0b1111, 512, 192)
+}
+
+# AMCLK prescaler -> PRE[1:0] code
+MCP3564_PRESCALER = {1: 0b00, 2: 0b01, 4: 0b10, 8: 0b11}
+
+# PGA gain -> GAIN[2:0] code
+MCP3564_GAIN = {1 / 3: 0b000, 1: 0b001, 2: 0b010, 4: 0b011, 8: 0b100, 16: 0b101, 32: 0b110, 64: 0b111}
+
+# Conversion mode -> CONV_MODE[1:0] code
+MCP3564_CONVERSION_MODE = {'shutdown': 0b00, 'standby': 0b10, 'continuous': 0b11}
+
+@dataclass
+class AcquisitionProfile:
+    """MCP3564 oversampling and data-rate settings"""
+    osr: int = 1024
+    prescaler: int = 2  # AMCLK = MCLK / prescaler
+    gain: float = 1.0
+    conversion_mode: str = "standby"  # ADC state after a one-shot conversion, or 'continuous'
+    
+    def __post_init__(self):
+        if self.osr not in MCP3564_OSR:
+            raise ValueError(f"Unsupported OSR {self.osr}, expected one of {sorted(MCP3564_OSR)}")
+        if self.prescaler not in MCP3564_PRESCALER:
+            raise ValueError(f"Unsupported prescaler {self.prescaler}, expected one of {sorted(MCP3564_PRESCALER)}")
+        if self.gain_code is None:
+            raise ValueError(f"Unsupported gain {self.gain}")
+        if self.conversion_mode not in MCP3564_CONVERSION_MODE:
+            raise ValueError(f"Unsupported conversion mode '{self.conversion_mode}'")
+    
+    @property
+    def osr_code(self) -> int:
+        """OSR[3:0] field of CONFIG1"""
+        return MCP3564_OSR[self.osr][0]
+    
+    @property
+    def prescaler_code(self) -> int:
+        """PRE[1:0] field of CONFIG1"""
+        return MCP3564_PRESCALER[self.prescaler]
+    
+    @property
+    def gain_code(self) -> Optional[int]:
+        """GAIN[2:0] field of CONFIG2, None if the gain is not supported"""
+        for gain, code in MCP3564_GAIN.items():
+            if abs(gain - self.gain) < 1e-6:
+                return code
+        return None
+    
+    @property
+    def conversion_mode_code(self) -> int:
+        """CONV_MODE[1:0] field of CONFIG3"""
+        return MCP3564_CONVERSION_MODE[self.conversion_mode]
+    
+    def conversion_time(self, mclk: float) -> float:
+        """Expected duration (s) of one one-shot conversion for a master clock in Hz"""
+        _, osr3, osr2 = MCP3564_OSR[self.osr]
+        dmclk = mclk / self.prescaler / 4
+        return osr3 * (osr2 + 2) / dmclk
+    
+    def data_rate(self, mclk: float) -> float:
+        """Output data rate (samples/s) in continuous conversion"""
+        return mclk / self.prescaler / 4 / self.osr
+    
+    def scan_time(self, mclk: float, n_channels: int) -> float:
+        """Expected duration (s) of a one-shot scan over n_channels"""
+        return self.conversion_time(mclk) * n_channels
+
+def _default_profiles() -> Dict[str, AcquisitionProfile]:
+    return {
+        # Matches the original fixed register setup
+        'default': AcquisitionProfile(),
+        # Short conversions for transient capture at switch edges
+        'fast': AcquisitionProfile(osr=64, prescaler=1),
+        # Heavy oversampling for slow long-term logging
+        'precise': AcquisitionProfile(osr=16384),
+    }
+
+@dataclass
+class ChannelScaling:
+    """Engineering-unit scaling of one differential ADC channel"""
+    kind: str = "voltage"  # 'voltage' (V) or 'current' (mA)
+    gain: float = 1.0  # External gain, applied on top of the profile PGA gain
+    vref: Optional[float] = None  # None uses mcp3564_vref
+    full_scale_current: float = 1.0  # Current (A) at full-scale input
+    
+    def __post_init__(self):
+        if self.kind not in ('voltage', 'current'):
+            raise ValueError(f"Unsupported channel kind '{self.kind}'")
+
+def _default_channel_scaling() -> Dict[int, ChannelScaling]:
+    return {
+        0: ChannelScaling(kind='current'),
+        1: ChannelScaling(kind='voltage', vref=5.0),
+        2: ChannelScaling(kind='current'),
+        3: ChannelScaling(kind='voltage', vref=5.0),
+    }
+
+@dataclass
+class BoardConfig:
+    """One board of a multi-board node and its bus mapping
+    
+    overrides replaces HardwareConfig fields for this board only, e.g.
+    {'tca_address': 0x71, 'serial_number': '85735313233351F0A1E1'}.
+    """
+    board_id: str
+    pcb: bool = True
+    teros: bool = False
+    adc_cs: List[int] = field(default_factory=lambda: [0, 1])  # SPI chip-select of ADC0 and ADC1
+    interval: Optional[float] = None  # Read interval (s); None uses the registry default
+    overrides: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        if len(self.adc_cs) != len(ADCChannel):
+            raise ValueError(f"Board '{self.board_id}' needs {len(ADCChannel)} ADC chip-selects, got {self.adc_cs}")
+
 @dataclass
 class HardwareConfig:
     """Centralized hardware configuration"""
@@ -36,10 +158,76 @@ class HardwareConfig:
     # MCP3564 ADC
     mcp3564_vref: float = 3.32
     mcp3564_timeout: float = 0.01
+    mcp3564_mclk: float = 4.9152e6  # Internal oscillator frequency (Hz)
+    
+    # MCP3564 data-ready IRQ: 'rpi', 'gpiod' or 'file'; None polls over SPI
+    mcp3564_irq_backend: Optional[str] = None
+    mcp3564_irq_pins: Optional[List[int]] = None  # IRQ GPIO line per chip-select
+    mcp3564_irq_chip: str = "gpiochip0"
+    mcp3564_irq_path: str = "/sys/class/gpio/gpio{pin}/value"
+    mcp3564_stream_capacity: int = 65536  # Samples held by a continuous stream
+    mcp3564_verify_interval: Optional[float] = None  # Seconds between register readbacks, None disables
+    
+    # MCP3564 acquisition profiles and the one applied when no override is given
+    mcp3564_profiles: Dict[str, AcquisitionProfile] = field(default_factory=_default_profiles)
+    mcp3564_profile: str = "default"
+    
+    # PCB scaling per differential channel, shared by both ADCs
+    pcb_channel_scaling: Dict[int, ChannelScaling] = field(default_factory=_default_channel_scaling)
     
     # Serial Configuration
     serial_baudrate: int = 9600
     serial_timeout: float = 1.0
+    serial_ready_timeout: float = 3.0  # Seconds to wait for the readiness handshake after opening
+    serial_ready_retry: float = 0.25  # Seconds between handshake probes
+    serial_settle_time: float = 2.0  # Blind wait after opening when no handshake is given
+    
+    # USB identity of the Arduino for port discovery; None matches any
+    serial_vid: Optional[int] = None
+    serial_pid: Optional[int] = None
+    serial_number: Optional[str] = None
+    
+    # Teros Arduino push mode: seconds between pushed samples, None polls with R
+    teros_stream_interval: Optional[float] = None
+    teros_stream_capacity: int = 1024  # Samples kept by the stream ring buffer
+    teros_baudrate: Optional[int] = None  # Rate switched to after the handshake, e.g. 115200; None stays put
+    teros_frame_records: int = 0  # Readings per binary frame; 0 keeps the text protocol
+    
+    # Boards driven by one node process; empty for a single-board node
+    boards: List[BoardConfig] = field(default_factory=list)
+    
+    def __post_init__(self):
+        # Profiles loaded from JSON arrive as plain dictionaries
+        self.mcp3564_profiles = {
+            name: profile if isinstance(profile, AcquisitionProfile) else AcquisitionProfile(**profile)
+            for name, profile in self.mcp3564_profiles.items()
+        }
+        if self.mcp3564_profile not in self.mcp3564_profiles:
+            raise ValueError(f"Unknown MCP3564 profile '{self.mcp3564_profile}'")
+        
+        # JSON object keys are strings
+        self.pcb_channel_scaling = {
+            int(channel): scaling if isinstance(scaling, ChannelScaling) else ChannelScaling(**scaling)
+            for channel, scaling in self.pcb_channel_scaling.items()
+        }
+        
+        self.boards = [board if isinstance(board, BoardConfig) else BoardConfig(**board) for board in self.boards]
+    
+    def for_board(self, board: BoardConfig) -> 'HardwareConfig':
+        """This configuration with a board's overrides applied"""
+        names = {f.name for f in fields(self)} - {'boards'}
+        unknown = set(board.overrides) - names
+        if unknown:
+            raise ValueError(f"Unknown override(s) for board '{board.board_id}': {sorted(unknown)}")
+        return replace(self, boards=[], **board.overrides)
+    
+    def get_profile(self, name: Optional[str] = None) -> AcquisitionProfile:
+        """Look up an acquisition profile, defaulting to mcp3564_profile"""
+        name = name or self.mcp3564_profile
+        try:
+            return self.mcp3564_profiles[name]
+        except KeyError:
+            raise ValueError(f"Unknown MCP3564 profile '{name}'")
     
     @classmethod
     def from_json(cls, json_path: str) -> 'HardwareConfig':
@@ -51,7 +239,7 @@ class HardwareConfig:
     def to_json(self, json_path: str):
         """Save configuration to JSON file"""
         with open(json_path, 'w') as f:
-            json.dump(self.__dict__, f, indent=2)
+            json.dump(asdict(self), f, indent=2)
 
 @dataclass
 class SensorReading:
@@ -61,16 +249,21 @@ class SensorReading:
     data: Dict[str, Any]
     status: str = "success"
     error_message: Optional[str] = None
+    board_id: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        return {
+        result = {
             'sensor_name': self.sensor_name,
             'timestamp': self.timestamp,
             'data': self.data,
             'status': self.status,
             'error_message': self.error_message
         }
+        # Single-board logs keep their original layout
+        if self.board_id is not None:
+            result['board_id'] = self.board_id
+        return result
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SensorReading':
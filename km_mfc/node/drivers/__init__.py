@@ -1,11 +1,17 @@
 """Hardware drivers module."""
 
 from .base_driver import BaseDriver, HardwareDriverError
-from .ad5272_driver import AD5272Driver
-from .mcp3564_driver import MCP3564Driver
-from .serial_driver import SerialDriver
+from .ad5272_driver import AD5272Driver, I2CBus
+from .mcp3564_driver import MCP3564Driver, MCP3564Stream
+from .serial_driver import SerialDriver, SerialReader
+from .serial_channel import SerialChannel, LineParser, SerialTimeoutError
+from .serial_framing import Frame, FrameDecoder, encode_frame, crc16_ccitt
+from .irq_waiter import IRQWaiter, RPiGPIOWaiter, GpiodWaiter, FileIRQWaiter, create_irq_waiter
 
 __all__ = [
     'BaseDriver', 'HardwareDriverError',
-    'AD5272Driver', 'MCP3564Driver', 'SerialDriver'
+    'AD5272Driver', 'I2CBus', 'MCP3564Driver', 'MCP3564Stream', 'SerialDriver', 'SerialReader',
+    'SerialChannel', 'LineParser', 'SerialTimeoutError',
+    'Frame', 'FrameDecoder', 'encode_frame', 'crc16_ccitt',
+    'IRQWaiter', 'RPiGPIOWaiter', 'GpiodWaiter', 'FileIRQWaiter', 'create_irq_waiter'
 ]
@@ -1,41 +1,171 @@
 """AD5272 Digital Potentiometer Driver."""
 
-import smbus2
+try:
+    import smbus2
+except ImportError:  # Analysis machines import the package without I2C support
+    smbus2 = None
+import threading
 from contextlib import contextmanager
+from typing import Dict, Optional, Set
 from .base_driver import BaseDriver, HardwareDriverError
 from ..config import DigitalPotChannel
 
+class I2CBus:
+    """One I2C bus handle shared by the AD5272 drivers of several boards
+    
+    Drivers hold lock for each transaction. Every board's AD5272s answer on
+    the same address behind their own TCA mux, so when a different driver
+    claims the bus, the previous one's mux is switched off and the new
+    owner's selected channel is switched back on. A driver's selected
+    channel is thus its intent, valid whenever it holds the bus, even if
+    another board used the bus in between.
+    """
+    
+    def __init__(self, bus_number: int):
+        self.bus_number = bus_number
+        self.lock = threading.RLock()
+        self.owner: Optional['AD5272Driver'] = None
+        self._handle = None
+    
+    def claim(self, driver: 'AD5272Driver'):
+        """Open handle for driver, disconnecting the previous driver's mux; call with lock held"""
+        if self._handle is None:
+            if smbus2 is None:
+                raise HardwareDriverError("smbus2 is not installed")
+            self._handle = smbus2.SMBus(self.bus_number)
+        previous = self.owner
+        if previous is driver:
+            return self._handle
+        self.owner = None
+        if previous is not None:
+            previous._disconnect_mux(self._handle)
+        driver._reconnect_mux(self._handle)
+        self.owner = driver
+        return self._handle
+    
+    def release(self, driver: 'AD5272Driver'):
+        """Switch driver's mux off and forget it as the bus user"""
+        with self.lock:
+            if self.owner is not driver:
+                return
+            self.owner = None
+            if self._handle is not None:
+                try:
+                    driver._disconnect_mux(self._handle)
+                except Exception:
+                    pass  # Closing anyway; the next owner switches its own channel on
+    
+    def close(self):
+        """Close the bus handle"""
+        with self.lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self.owner = None
+
 class AD5272Driver(BaseDriver):
-    """Driver for AD5272 digital potentiometer"""
+    """Driver for AD5272 digital potentiometer
+    
+    Each TCA mux channel leads to its own AD5272. The driver remembers the
+    selected mux channel, which chips have RDAC writes unlocked and the last
+    wiper position written to each, and skips bus writes that would not change
+    anything. Pass force=True to write regardless.
     
-    def __init__(self, config):
+    Pass a shared I2CBus to drive one board among several on the same bus.
+    """
+    
+    def __init__(self, config, bus: Optional[I2CBus] = None):
         super().__init__(config)
         self._bus = None
+        self._shared_bus = bus
+        self._lock = bus.lock if bus is not None else threading.RLock()
+        self._selected_channel: Optional[DigitalPotChannel] = None
+        self._unlocked: Set[Optional[DigitalPotChannel]] = set()
+        self._wiper_cache: Dict[Optional[DigitalPotChannel], int] = {}
+        self.stats = {'writes': 0, 'writes_skipped': 0}
     
     @contextmanager
     def _get_bus(self):
         """Context manager for I2C bus access"""
-        if self._bus is None:
-            self._bus = smbus2.SMBus(self.config.i2c_bus)
+        with self._lock:
+            if self._shared_bus is None and self._bus is None:
+                if smbus2 is None:
+                    raise HardwareDriverError("smbus2 is not installed")
+                self._bus = smbus2.SMBus(self.config.i2c_bus)
+            try:
+                # Claiming a shared bus may first switch another board's mux off
+                yield self._shared_bus.claim(self) if self._shared_bus is not None else self._bus
+            except Exception as e:
+                # A failed transfer leaves mux and chip state unknown
+                self.invalidate_cache()
+                raise HardwareDriverError(f"I2C communication error: {e}")
+    
+    def _disconnect_mux(self, bus):
+        """Switch this board's TCA mux off so another board can use the bus"""
         try:
-            yield self._bus
-        except Exception as e:
-            raise HardwareDriverError(f"I2C communication error: {e}")
+            bus.write_byte_data(self.config.tca_address, 0, 0)
+        except Exception:
+            self._selected_channel = None  # Mux state unknown; select again next time
+            raise
+        self.stats['writes'] += 1
     
-    def select_channel(self, channel: DigitalPotChannel):
+    def _reconnect_mux(self, bus):
+        """Switch this board's selected channel back on after another board used the bus"""
+        if self._selected_channel is None:
+            return
+        try:
+            bus.write_byte_data(self.config.tca_address, 0, 2 ** self._selected_channel.value)
+        except Exception:
+            self._selected_channel = None
+            raise
+        self.stats['writes'] += 1
+    
+    def invalidate_cache(self):
+        """Forget cached mux, unlock and wiper state, e.g. after the board was power-cycled"""
+        with self._lock:
+            self._selected_channel = None
+            self._unlocked.clear()
+            self._wiper_cache.clear()
+    
+    @property
+    def selected_channel(self) -> Optional[DigitalPotChannel]:
+        """Currently selected TCA multiplexer channel, None if unknown"""
+        return self._selected_channel
+    
+    def cached_wiper_position(self, channel: DigitalPotChannel) -> Optional[int]:
+        """Last wiper position written to a channel, None if unknown"""
+        return self._wiper_cache.get(channel)
+    
+    def select_channel(self, channel: DigitalPotChannel, force: bool = False):
         """Select TCA multiplexer channel"""
-        chip_address = 2 ** channel.value
         with self._get_bus() as bus:
+            if not force and self._selected_channel == channel:
+                self.stats['writes_skipped'] += 1
+                return
+            
+            chip_address = 2 ** channel.value
             bus.write_byte_data(self.config.tca_address, 0, chip_address)
+            self.stats['writes'] += 1
+            self._selected_channel = channel
     
-    def set_wiper_position(self, position: int):
-        """Set the wiper position (0-1023)"""
+    def set_wiper_position(self, position: int, force: bool = False):
+        """Set the wiper position (0-1023) of the chip on the selected channel"""
         if not (0 <= position <= self.config.ad5272_max_steps):
             raise ValueError(f"Position must be between 0 and {self.config.ad5272_max_steps}")
         
         with self._get_bus() as bus:
-            # Unlock the resistor
-            bus.write_i2c_block_data(self.config.ad5272_address, 0x1c, [0x02])
+            channel = self._selected_channel
+            if not force and self._wiper_cache.get(channel) == position:
+                self.stats['writes_skipped'] += 1
+                return
+            
+            if force or channel not in self._unlocked:
+                # Unlock the resistor; stays unlocked until the chip is reset
+                bus.write_i2c_block_data(self.config.ad5272_address, 0x1c, [0x02])
+                self.stats['writes'] += 1
+                self._unlocked.add(channel)
+            else:
+                self.stats['writes_skipped'] += 1
             
             # Set wiper position
             command_number = 1
@@ -44,17 +174,37 @@ class AD5272Driver(BaseDriver):
                 position & 0xff
             ]
             bus.write_i2c_block_data(self.config.ad5272_address, command[0], command[1:])
+            self.stats['writes'] += 1
+            self._wiper_cache[channel] = position
     
     def read_wiper_position(self) -> int:
-        """Read current wiper position"""
+        """Read current wiper position of the chip on the selected channel"""
         with self._get_bus() as bus:
+            # Command and readback in one repeated-start transaction
             wr_msg = smbus2.i2c_msg.write(self.config.ad5272_address, [(0b0010 << 2) | 0, 0])
             rd_msg = smbus2.i2c_msg.read(self.config.ad5272_address, 2)
-            bus.i2c_rdwr(wr_msg)
-            bus.i2c_rdwr(rd_msg)
+            bus.i2c_rdwr(wr_msg, rd_msg)
             
             data = list(rd_msg)
-            return (int(data[0]) << 8) | int(data[1])
+            position = (int(data[0]) << 8) | int(data[1])
+            self._wiper_cache[self._selected_channel] = position
+            return position
+    
+    def read_all_wipers(self) -> Dict[DigitalPotChannel, int]:
+        """Read every channel's wiper position in one locked pass through the mux
+        
+        The previously selected mux channel is restored afterwards.
+        """
+        positions = {}
+        with self._lock:
+            previous = self._selected_channel
+            for channel in DigitalPotChannel:
+                self.select_channel(channel)
+                positions[channel] = self.read_wiper_position()
+            
+            if previous is not None:
+                self.select_channel(previous)
+        return positions
     
     def resistance_to_position(self, resistance: float) -> int:
         """Convert resistance value to wiper position"""
@@ -67,6 +217,10 @@ class AD5272Driver(BaseDriver):
     
     def close(self):
         """Clean up resources"""
-        if self._bus:
-            self._bus.close()
-            self._bus = None
+        with self._lock:
+            if self._shared_bus is not None:
+                self._shared_bus.release(self)  # The bus itself belongs to whoever created it
+            if self._bus:
+                self._bus.close()
+                self._bus = None
+            self.invalidate_cache()
@@ -0,0 +1,144 @@
+"""GPIO edge waiters for ADC data-ready interrupts."""
+
+import logging
+import os
+import select
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+from .base_driver import HardwareDriverError
+
+class IRQWaiter(ABC):
+    """Blocks until an active-low data-ready line is asserted"""
+
+    def arm(self):
+        """Discard edges from earlier conversions before starting a new one"""
+        pass
+
+    @abstractmethod
+    def wait(self, timeout: float) -> bool:
+        """Wait for the line to go low, returning False on timeout"""
+        pass
+
+    def close(self):
+        """Release the GPIO line"""
+        pass
+
+class RPiGPIOWaiter(IRQWaiter):
+    """Falling-edge waiter using RPi.GPIO event detection (BCM numbering)"""
+
+    def __init__(self, pin: int):
+        try:
+            import RPi.GPIO as GPIO
+        except ImportError as e:
+            raise HardwareDriverError(f"RPi.GPIO not available: {e}")
+
+        self._gpio = GPIO
+        self.pin = pin
+        self._event = threading.Event()
+
+        if GPIO.getmode() is None:
+            GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.IN)
+        GPIO.add_event_detect(pin, GPIO.FALLING, callback=lambda channel: self._event.set())
+
+    def arm(self):
+        self._event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        if self._gpio.input(self.pin) == self._gpio.LOW:
+            return True
+        return self._event.wait(timeout) or self._gpio.input(self.pin) == self._gpio.LOW
+
+    def close(self):
+        self._gpio.remove_event_detect(self.pin)
+
+class GpiodWaiter(IRQWaiter):
+    """Falling-edge waiter using the libgpiod character device API"""
+
+    def __init__(self, chip: str, offset: int):
+        try:
+            import gpiod
+        except ImportError as e:
+            raise HardwareDriverError(f"gpiod not available: {e}")
+
+        self._chip = gpiod.Chip(chip)
+        self._line = self._chip.get_line(offset)
+        self._line.request(consumer='km_mfc', type=gpiod.LINE_REQ_EV_FALLING_EDGE)
+
+    def arm(self):
+        while self._line.event_wait(sec=0, nsec=0):
+            self._line.event_read()
+
+    def wait(self, timeout: float) -> bool:
+        if self._line.get_value() == 0:
+            return True
+
+        sec = int(timeout)
+        if self._line.event_wait(sec=sec, nsec=int((timeout - sec) * 1e9)):
+            self._line.event_read()
+            return True
+        return self._line.get_value() == 0
+
+    def close(self):
+        self._line.release()
+        self._chip.close()
+
+class FileIRQWaiter(IRQWaiter):
+    """Waiter on a GPIO value file such as /sys/class/gpio/gpioN/value
+
+    Sysfs value files wake poll() with POLLPRI on the configured edge. A regular
+    file never raises POLLPRI, so it is re-read every poll_interval instead, which
+    lets a plain file holding '0' or '1' stand in for the pin during tests.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.0005):
+        try:
+            self._fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            raise HardwareDriverError(f"Cannot open IRQ value file {path}: {e}")
+
+        self.path = path
+        self.poll_interval = poll_interval
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLPRI | select.POLLERR)
+
+    def _is_low(self) -> bool:
+        return os.pread(self._fd, 1, 0) == b'0'
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._is_low():
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            self._poller.poll(min(remaining, self.poll_interval) * 1000)
+
+    def close(self):
+        os.close(self._fd)
+
+def create_irq_waiter(config, cs_pin: int) -> Optional[IRQWaiter]:
+    """Build the configured IRQ waiter for an ADC chip-select, or None to poll over SPI"""
+    backend = config.mcp3564_irq_backend
+    pins = config.mcp3564_irq_pins
+    if not backend or not pins or cs_pin >= len(pins) or pins[cs_pin] is None:
+        return None
+
+    pin = pins[cs_pin]
+    try:
+        if backend == 'rpi':
+            return RPiGPIOWaiter(pin)
+        if backend == 'gpiod':
+            return GpiodWaiter(config.mcp3564_irq_chip, pin)
+        if backend == 'file':
+            return FileIRQWaiter(config.mcp3564_irq_path.format(pin=pin))
+        raise HardwareDriverError(f"Unknown IRQ backend '{backend}'")
+    except Exception as e:
+        logging.getLogger(__name__).warning(
+            f"IRQ waiter unavailable for CS {cs_pin} ({e}), falling back to SPI polling")
+        return None
@@ -1,10 +1,161 @@
 """MCP3564 ADC Driver."""
 
-import spidev
+import logging
+try:
+    import spidev
+except ImportError:  # Analysis machines import the package without SPI support
+    spidev = None
+import threading
 import time
 from contextlib import contextmanager
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional, Dict, List, Tuple, Iterator, Union
+import numpy as np
 from .base_driver import BaseDriver, HardwareDriverError
+from .irq_waiter import IRQWaiter, create_irq_waiter
+from ..config import AcquisitionProfile, ChannelScaling
+from ..utils.ring_buffer import RingBuffer
+from ..utils.conversions import SampleBuffer, decode_24bit, codes_to_voltage, codes_to_current
+
+@dataclass
+class _SpiDevice:
+    """Open SPI handle and init state for one MCP3564 chip-select"""
+    spi: Any
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    initialized: bool = False
+    # Write-through copy of the register file: address -> register bytes
+    shadow: Dict[int, bytes] = field(default_factory=dict)
+    last_verify: float = 0.0
+    # Register traffic counters
+    stats: Dict[str, int] = field(default_factory=lambda: {
+        'writes': 0, 'writes_skipped': 0, 'transactions': 0, 'verifies': 0, 'resets_detected': 0
+    })
+    # Data-ready edge waiter, None to poll over SPI
+    irq: Optional[IRQWaiter] = None
+    # Active continuous-conversion stream
+    stream: Optional['MCP3564Stream'] = None
+
+class MCP3564Stream:
+    """Continuous-conversion sample stream from one MCP3564
+    
+    A reader thread moves every conversion into a preallocated ring buffer of
+    (timestamp, channel, value) records, where timestamp is time.monotonic() at
+    readout and value is the signed 24-bit ADC code.
+    
+    Without an IRQ the reader sleeps until the next conversion is due on the
+    ADC's own cadence and polls from there, so readout overhead does not make
+    it fall behind. Conversions overwritten in ADCDATA before they were read
+    are counted in dropped, from CH_ID gaps in the SCAN order and the time
+    between samples.
+    """
+    
+    SAMPLE_DTYPE = np.dtype([('timestamp', 'f8'), ('channel', 'i1'), ('value', 'i4')])
+    
+    def __init__(self, driver: 'MCP3564Driver', device: _SpiDevice, cs_pin: int, channels: List[int],
+                 capacity: int, profile: AcquisitionProfile):
+        self.cs_pin = cs_pin
+        self.channels = list(channels)
+        self.profile = profile
+        self.buffer = RingBuffer(capacity, self.SAMPLE_DTYPE)
+        self.timeouts = 0
+        self.dropped = 0
+        self._driver = driver
+        self._device = device
+        self._order = sorted(self.channels)  # SCAN converts differential pairs in ascending order
+        self._last: Optional[Tuple[float, int]] = None  # (timestamp, SCAN position) of the previous sample
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._reader_loop, name=f"MCP3564Stream-CS{cs_pin}", daemon=True)
+    
+    def _reader_loop(self):
+        """Drain ADCDATA into the ring buffer until stopped"""
+        driver = self._driver
+        device = self._device
+        expected = driver.conversion_time(self.profile)
+        timeout = max(driver.config.mcp3564_timeout, 2 * expected)
+        interval = driver.poll_interval(expected)
+        ready_at = time.monotonic() + expected
+        
+        while not self._stop_event.is_set():
+            with device.lock:
+                try:
+                    if device.irq is not None:
+                        result = driver._await_data(device, 4, time.monotonic() + timeout, expected)
+                        polls = 1
+                    else:
+                        delay = ready_at - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                        result, polls = driver._poll_data(device, 4, time.monotonic() + timeout, interval)
+                except Exception as e:
+                    driver.logger.error(f"Stream read error on CS {self.cs_pin}: {e}")
+                    break
+            
+            timestamp = time.monotonic()
+            if result is None:
+                self.timeouts += 1
+                ready_at = timestamp
+                continue
+            
+            # A poll that saw no data yet pins the conversion to within one poll interval;
+            # otherwise the sample was already waiting, so stay on the previous cadence
+            ready_at = (timestamp - interval if polls > 1 else ready_at) + expected
+            
+            channel = ((result[1] >> 4) & 0x0f) - driver.SCAN_DIFF_BASE
+            self._count_dropped(timestamp, channel, expected)
+            value = (result[2] << 16) | (result[3] << 8) | result[4]
+            if value & 0x800000:
+                value -= 0x1000000
+            self.buffer.append((timestamp, channel, value))
+    
+    def _count_dropped(self, timestamp: float, channel: int, expected: float):
+        """Add the conversions missed between the previous sample and this one"""
+        if channel not in self._order:
+            return
+        position = self._order.index(channel)
+        if self._last is not None:
+            last_time, last_position = self._last
+            n = len(self._order)
+            gap = (position - last_position - 1) % n
+            # Whole skipped SCAN cycles leave no CH_ID gap, so the elapsed time decides how many
+            periods = max(round((timestamp - last_time) / expected) - 1, 0)
+            self.dropped += gap + n * max(round((periods - gap) / n), 0)
+        self._last = (timestamp, position)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the reader thread is alive"""
+        return self._thread.is_alive()
+    
+    @property
+    def overruns(self) -> int:
+        """Samples overwritten before they were consumed"""
+        return self.buffer.overruns
+    
+    def read_block(self, n: int, timeout: Optional[float] = None) -> np.ndarray:
+        """Return the next n samples, or fewer if the timeout expires"""
+        return self.buffer.read_block(n, timeout)
+    
+    def blocks(self, n: int, timeout: Optional[float] = 1.0) -> Iterator[np.ndarray]:
+        """Yield blocks of up to n samples until the stream stops"""
+        while self.running or len(self.buffer):
+            block = self.read_block(n, timeout)
+            if len(block):
+                yield block
+    
+    def __iter__(self) -> Iterator[np.void]:
+        """Yield samples one at a time until the stream stops"""
+        for block in self.blocks(256):
+            yield from block
+    
+    def stop(self):
+        """Stop the stream and return the ADC to standby"""
+        self._driver.stop_stream(self.cs_pin)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
 
 class MCP3564Driver(BaseDriver):
     """Driver for MCP3564 ADC"""
@@ -17,11 +168,49 @@ class MCP3564Driver(BaseDriver):
         'CRCCFG': 0x0f
     }
     
+    # Register widths in bytes
+    REGISTER_SIZES = {
+        0x00: 4, 0x01: 1, 0x02: 1, 0x03: 1, 0x04: 1, 0x05: 1, 0x06: 1, 0x07: 3,
+        0x08: 3, 0x09: 3, 0x0a: 3, 0x0b: 3, 0x0c: 3, 0x0d: 1, 0x0e: 2, 0x0f: 2
+    }
+    
+    # Configuration registers read back in one incremental read (CONFIG0..GAINCAL)
+    SHADOW_RANGE = range(0x01, 0x0b)
+    
+    # Writable bits of registers that also report status
+    WRITABLE_MASKS = {0x05: 0x0f}
+    
+    # Fast commands: start conversion (bits [5:2] = 0b1010), standby (0b1011)
+    CONVERSION_START = (1 << 6) | (0b1010 << 2)
+    STANDBY = (1 << 6) | (0b1011 << 2)
+    
+    # Status byte returned while the command byte is clocked out; DR_STATUS is active low
+    STATUS_DR = 1 << 2
+    
+    # SCAN register bit and CH_ID of the first differential pair (CH0-CH1)
+    SCAN_DIFF_BASE = 8
+    
+    # Bounds for the fallback data-ready poll interval (s)
+    MIN_POLL_INTERVAL = 0.00005
+    MAX_POLL_INTERVAL = 0.001
+    
     def __init__(self, config):
         super().__init__(config)
-        self._spi = None
-        self._current_cs = None
-        self._initialized = False
+        self._devices: Dict[Tuple[int, int], _SpiDevice] = {}
+        self._pool_lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.profile_name = config.mcp3564_profile
+    
+    def set_profile(self, name: str):
+        """Select the acquisition profile used when a read gives no override"""
+        self.config.get_profile(name)
+        self.profile_name = name
+    
+    def resolve_profile(self, profile: Union[str, AcquisitionProfile, None] = None) -> AcquisitionProfile:
+        """Turn a profile name, profile or None (current default) into a profile"""
+        if isinstance(profile, AcquisitionProfile):
+            return profile
+        return self.config.get_profile(profile or self.profile_name)
     
     def _make_command(self, addr: int, rw: str) -> int:
         """Create SPI command byte"""
@@ -29,84 +218,384 @@ class MCP3564Driver(BaseDriver):
         rw_bits = {'r': 3, 'w': 2}.get(rw, 1)
         return ((chip_addr << 6) | (addr & 0x0f) << 2) | rw_bits
     
+    def _open_device(self, cs_pin: int) -> _SpiDevice:
+        """Return the pooled device for a chip-select, opening it on first use"""
+        key = (self.config.spi_bus, cs_pin)
+        with self._pool_lock:
+            device = self._devices.get(key)
+            if device is None:
+                if spidev is None:
+                    raise HardwareDriverError("spidev is not installed")
+                try:
+                    spi = spidev.SpiDev()
+                    spi.open(self.config.spi_bus, cs_pin)
+                    spi.max_speed_hz = self.config.spi_max_speed
+                    spi.mode = 0
+                except Exception as e:
+                    raise HardwareDriverError(f"SPI open error on bus {key[0]} CS {cs_pin}: {e}")
+                
+                device = _SpiDevice(spi=spi, irq=create_irq_waiter(self.config, cs_pin))
+                self._devices[key] = device
+            return device
+    
+    @contextmanager
+    def _get_device(self, cs_pin: int):
+        """Context manager for exclusive access to an initialized device"""
+        device = self._open_device(cs_pin)
+        
+        with device.lock:
+            try:
+                if device.stream is not None:
+                    raise HardwareDriverError(f"ADC on CS {cs_pin} is streaming")
+                
+                if not device.initialized:
+                    self._initialize_adc(device)
+                    device.initialized = True
+                elif (self.config.mcp3564_verify_interval and
+                      time.monotonic() - device.last_verify >= self.config.mcp3564_verify_interval):
+                    self._verify(device)
+                
+                yield device
+            except HardwareDriverError:
+                device.initialized = False
+                raise
+            except Exception as e:
+                # Register state is unknown after a failed transfer, re-init next time
+                device.initialized = False
+                raise HardwareDriverError(f"SPI communication error: {e}")
+    
     @contextmanager
     def _get_spi(self, cs_pin: int):
         """Context manager for SPI access"""
-        if self._spi is None or self._current_cs != cs_pin:
-            if self._spi:
-                self._spi.close()
-            
-            self._spi = spidev.SpiDev()
-            self._spi.open(self.config.spi_bus, cs_pin)
-            self._spi.max_speed_hz = self.config.spi_max_speed
-            self._spi.mode = 0
-            self._current_cs = cs_pin
-            self._initialized = False
-        
-        if not self._initialized:
-            self._initialize_adc()
-            self._initialized = True
-        
-        try:
-            yield self._spi
-        except Exception as e:
-            raise HardwareDriverError(f"SPI communication error: {e}")
-    
-    def _initialize_adc(self):
-        """Initialize the MCP3564 ADC"""
-        if not self._spi:
+        with self._get_device(cs_pin) as device:
+            yield device.spi
+    
+    def _read_registers(self, device: _SpiDevice) -> Dict[int, bytes]:
+        """Read CONFIG0..GAINCAL from the chip in one incremental read"""
+        length = sum(self.REGISTER_SIZES[addr] for addr in self.SHADOW_RANGE)
+        result = device.spi.xfer([self._make_command(self.SHADOW_RANGE[0], 'r')] + [0] * length)
+        device.stats['transactions'] += 1
+        
+        registers = {}
+        offset = 1
+        for addr in self.SHADOW_RANGE:
+            size = self.REGISTER_SIZES[addr]
+            data = bytes(result[offset:offset + size])
+            if addr in self.WRITABLE_MASKS:
+                data = bytes([data[0] & self.WRITABLE_MASKS[addr]])
+            registers[addr] = data
+            offset += size
+        return registers
+    
+    def _write_raw(self, device: _SpiDevice, dirty: Dict[int, bytes]):
+        """Send register values, batching consecutive addresses into incremental writes
+        
+        A gap between dirty registers is bridged with cached values when every register
+        in it is known, so one transaction can cover e.g. CONFIG3 through TIMER.
+        """
+        if not dirty:
             return
         
+        addresses = sorted(dirty)
+        runs = [[addresses[0]]]
+        for addr in addresses[1:]:
+            gap = range(runs[-1][-1] + 1, addr)
+            if all(a in device.shadow for a in gap):
+                runs[-1].extend(gap)
+                runs[-1].append(addr)
+            else:
+                runs.append([addr])
+        
+        for run in runs:
+            payload = []
+            for addr in run:
+                payload.extend(dirty.get(addr, device.shadow[addr]))
+            device.spi.xfer([self._make_command(run[0], 'w')] + payload)
+            device.stats['transactions'] += 1
+            
+            for addr in run:
+                device.shadow[addr] = dirty.get(addr, device.shadow[addr])
+    
+    def _write_registers(self, device: _SpiDevice, values: Dict[str, int]):
+        """Write registers by name through the shadow cache, skipping unchanged values"""
+        dirty = {}
+        for name, value in values.items():
+            addr = self.REGISTERS[name]
+            data = value.to_bytes(self.REGISTER_SIZES[addr], byteorder='big')
+            if device.shadow.get(addr) == data:
+                device.stats['writes_skipped'] += 1
+            else:
+                dirty[addr] = data
+                device.stats['writes'] += 1
+        
+        self._write_raw(device, dirty)
+    
+    def _verify(self, device: _SpiDevice) -> bool:
+        """Compare the chip against the shadow and restore any register that changed"""
+        expected = dict(device.shadow)
+        actual = self._read_registers(device)
+        device.last_verify = time.monotonic()
+        device.stats['verifies'] += 1
+        
+        mismatched = {addr: data for addr, data in expected.items() if actual.get(addr, data) != data}
+        device.shadow.update(actual)
+        if not mismatched:
+            return True
+        
+        device.stats['resets_detected'] += 1
+        names = {addr: name for name, addr in self.REGISTERS.items()}
+        changed = ', '.join(names[addr] for addr in sorted(mismatched))
+        self.logger.warning(f"MCP3564 registers changed behind the driver ({changed}), restoring")
+        self._write_raw(device, mismatched)
+        return False
+    
+    def verify_registers(self, cs_pin: int) -> bool:
+        """Read back the configuration registers, restoring them if the ADC was reset"""
+        with self._get_device(cs_pin) as device:
+            return self._verify(device)
+    
+    def register_stats(self, cs_pin: int) -> Dict[str, int]:
+        """Register write/verify counters for one chip-select"""
+        device = self._devices.get((self.config.spi_bus, cs_pin))
+        return dict(device.stats) if device else {}
+    
+    def _profile_registers(self, profile: AcquisitionProfile) -> Dict[str, int]:
+        """CONFIG1/CONFIG2 values for a profile"""
+        return {
+            # CONFIG1: AMCLK prescaler and oversampling ratio
+            'CONFIG1': (profile.prescaler_code << 6) | (profile.osr_code << 2),
+            # CONFIG2: BOOST x1, PGA gain, no auto-zero, reserved bits set
+            'CONFIG2': (0b10 << 6) | (profile.gain_code << 3) | 0b11
+        }
+    
+    def _initialize_adc(self, device: _SpiDevice):
+        """Initialize the MCP3564 ADC"""
+        spi = device.spi
+        
         # Read LOCK register for sanity check
-        self._spi.xfer([self._make_command(self.REGISTERS['LOCK'], 'r'), 0])
+        spi.xfer([self._make_command(self.REGISTERS['LOCK'], 'r'), 0])
+        
+        # Start from what the chip actually holds so only differences are written
+        device.shadow = self._read_registers(device)
+        device.last_verify = time.monotonic()
         
         # Configure ADC
-        configs = [
+        configs = {
             # CONFIG0: internal oscillator, no current bias, ADC in standby
-            (self.REGISTERS['CONFIG0'], (0b10 << 4) | (0b10 << 0)),
-            # CONFIG1: AMCLK = MCLK/2, oversample = 1024
-            (self.REGISTERS['CONFIG1'], (0b01 << 6) | (0b0101 << 2)),
+            'CONFIG0': (0b10 << 4) | (0b10 << 0),
             # CONFIG3: one-shot mode, 24-bit format, offset/gaincal enabled
-            (self.REGISTERS['CONFIG3'], (0b10 << 6) | (0b00 << 4) | (1 << 0)),
+            'CONFIG3': (0b10 << 6) | (0b00 << 4) | (1 << 0),
             # IRQ: enable IRQ pin
-            (self.REGISTERS['IRQ'], (0b01 << 2) | (1 << 1) | (1 << 0))
-        ]
+            'IRQ': (0b01 << 2) | (1 << 1) | (1 << 0),
+            # Set gain calibration
+            'GAINCAL': 0x7cabd8
+        }
+        configs.update(self._profile_registers(self.resolve_profile()))
+        self._write_registers(device, configs)
+    
+    def _apply_profile(self, device: _SpiDevice, profile: AcquisitionProfile):
+        """Program CONFIG1/CONFIG2 for a profile"""
+        self._write_registers(device, self._profile_registers(profile))
+    
+    def _scan_mask(self, channels: List[int]) -> int:
+        """SCAN register bits for a list of differential channels"""
+        scan_mask = 0
+        for channel in channels:
+            if not (0 <= channel <= 3):
+                raise ValueError(f"Channel must be between 0 and 3, got {channel}")
+            scan_mask |= 1 << (self.SCAN_DIFF_BASE + channel)
+        return scan_mask
+    
+    def _scan_registers(self, scan_mask: int, conv_mode: int) -> Dict[str, int]:
+        """CONFIG3/SCAN/TIMER values for a scan mask and conversion mode"""
+        # CONFIG3: conversion mode, 32-bit format with CH_ID when scanning, 24-bit otherwise
+        data_format = 0b11 if scan_mask else 0b00
+        return {
+            'CONFIG3': (conv_mode << 6) | (data_format << 4) | (1 << 0),
+            # SCAN: no inter-channel delay, selected channels
+            'SCAN': scan_mask,
+            # TIMER: no delay between scan cycles
+            'TIMER': 0
+        }
+    
+    def _configure_scan(self, device: _SpiDevice, scan_mask: int, conv_mode: int):
+        """Program conversion mode, SCAN/TIMER and the matching data format"""
+        self._write_registers(device, self._scan_registers(scan_mask, conv_mode))
+    
+    def _one_shot_mode(self, profile: AcquisitionProfile) -> int:
+        """CONV_MODE for one-shot reads; continuous profiles idle in standby between reads"""
+        if profile.conversion_mode == 'continuous':
+            return 0b10
+        return profile.conversion_mode_code
+    
+    def conversion_time(self, profile: Union[str, AcquisitionProfile, None] = None) -> float:
+        """Expected duration of one one-shot conversion (s) for a profile"""
+        return self.resolve_profile(profile).conversion_time(self.config.mcp3564_mclk)
+    
+    def _start_conversion(self, device: _SpiDevice):
+        """Arm the IRQ waiter and fire a conversion"""
+        if device.irq is not None:
+            device.irq.arm()
+        device.spi.xfer([self.CONVERSION_START])
+    
+    def _await_data(self, device: _SpiDevice, n_bytes: int, deadline: float, expected: float) -> Optional[List[int]]:
+        """Wait for the next conversion and return the ADCDATA transfer, or None on timeout
         
-        for reg, value in configs:
-            self._spi.xfer([self._make_command(reg, 'w'), value])
+        With an IRQ waiter the data-ready edge wakes us directly. Otherwise the first
+        sleep covers the expected conversion time and the status byte returned with each
+        ADCDATA read is polled at a fraction of it, so polling and reading share one
+        SPI transaction.
+        """
+        remaining = max(0.0, deadline - time.monotonic())
+        if device.irq is not None:
+            device.irq.wait(remaining)
+        else:
+            time.sleep(min(expected, remaining))
         
-        # Set gain calibration
-        self._spi.xfer([self._make_command(self.REGISTERS['GAINCAL'], 'w'), 0x7c, 0xab, 0xd8])
+        result, _ = self._poll_data(device, n_bytes, deadline, self.poll_interval(expected))
+        return result
+    
+    def poll_interval(self, expected: float) -> float:
+        """Data-ready poll interval (s) for a conversion time"""
+        return min(max(expected / 8, self.MIN_POLL_INTERVAL), self.MAX_POLL_INTERVAL)
     
-    def read_channel_raw(self, cs_pin: int, channel: int) -> Optional[bytes]:
+    def _poll_data(self, device: _SpiDevice, n_bytes: int, deadline: float,
+                   interval: float) -> Tuple[Optional[List[int]], int]:
+        """Read ADCDATA until its status byte shows new data; returns (transfer or None, reads made)"""
+        read_command = self._make_command(self.REGISTERS['ADCDATA'], 'r')
+        polls = 0
+        while True:
+            result = device.spi.xfer([read_command] + [0] * n_bytes)
+            polls += 1
+            if not (result[0] & self.STATUS_DR):
+                # Reading ADCDATA releases the IRQ line, so the next edge is a new sample
+                if device.irq is not None:
+                    device.irq.arm()
+                return result, polls
+            
+            if time.monotonic() > deadline:
+                return None, polls
+            
+            time.sleep(interval)
+    
+    def read_channel_raw(self, cs_pin: int, channel: int,
+                         profile: Union[str, AcquisitionProfile, None] = None) -> Optional[bytes]:
         """Read raw ADC data from specified channel"""
-        with self._get_spi(cs_pin) as spi:
-            # Setup MUX
+        profile = self.resolve_profile(profile)
+        
+        with self._get_device(cs_pin) as device:
+            self._apply_profile(device, profile)
+            
+            # Setup MUX; it is ignored while SCAN is active, so SCAN is cleared in the same batch
             chan_p = (2 * channel) & 0x0f
             chan_n = (chan_p + 1) & 0x0f
-            spi.xfer([self._make_command(self.REGISTERS['MUX'], 'w'), (chan_p << 4) | chan_n])
+            registers = self._scan_registers(0, self._one_shot_mode(profile))
+            registers['MUX'] = (chan_p << 4) | chan_n
+            self._write_registers(device, registers)
             
             # Start conversion
-            spi.xfer([(1 << 6) | (0b1010 << 2)])
+            self._start_conversion(device)
+            
+            # Wait for completion and read data
+            expected = self.conversion_time(profile)
+            deadline = time.monotonic() + max(self.config.mcp3564_timeout, 2 * expected)
+            result = self._await_data(device, 3, deadline, expected)
+            if result is None:
+                return None
+            
+            return bytes(result[1:])
+    
+    def read_channels_raw(self, cs_pin: int, channels: List[int],
+                          profile: Union[str, AcquisitionProfile, None] = None) -> Dict[int, Optional[bytes]]:
+        """Read several differential channels in one hardware SCAN cycle
+        
+        The ADC converts every channel in the list after a single conversion start.
+        Each sample is matched to its channel through the CH_ID field of the 32-bit
+        data format, so MUX never has to be rewritten. Channels that did not complete
+        before the timeout map to None.
+        """
+        results: Dict[int, Optional[bytes]] = {channel: None for channel in channels}
+        if not channels:
+            return results
+        
+        scan_mask = self._scan_mask(channels)
+        profile = self.resolve_profile(profile)
+        
+        with self._get_device(cs_pin) as device:
+            self._apply_profile(device, profile)
+            self._configure_scan(device, scan_mask, self._one_shot_mode(profile))
+            
+            # One conversion start runs the whole scan sequence
+            self._start_conversion(device)
             
-            # Poll for completion
-            start_time = time.monotonic()
-            while True:
-                result = spi.xfer([self._make_command(self.REGISTERS['IRQ'], 'r'), 0])
-                if not (result[1] & (1 << 6)):
+            pending = set(channels)
+            expected = self.conversion_time(profile)
+            deadline = time.monotonic() + max(self.config.mcp3564_timeout, 2 * expected) * len(pending)
+            
+            while pending:
+                result = self._await_data(device, 4, deadline, expected)
+                if result is None:
                     break
                 
-                if (time.monotonic() - start_time) > self.config.mcp3564_timeout:
-                    return None
-                
-                time.sleep(0.001)
+                channel = ((result[1] >> 4) & 0x0f) - self.SCAN_DIFF_BASE
+                if channel in pending:
+                    results[channel] = bytes(result[2:5])
+                    pending.discard(channel)
+        
+        return results
+    
+    def start_stream(self, cs_pin: int, channels: List[int], capacity: Optional[int] = None,
+                     profile: Union[str, AcquisitionProfile, None] = None) -> MCP3564Stream:
+        """Put the ADC in continuous conversion and stream samples into a ring buffer
+        
+        The channel list is cycled by the SCAN sequencer with no delay between
+        cycles. One-shot reads on this chip-select are refused until the stream
+        is stopped.
+        """
+        if not channels:
+            raise ValueError("At least one channel is required")
+        
+        scan_mask = self._scan_mask(channels)
+        capacity = capacity or self.config.mcp3564_stream_capacity
+        profile = self.resolve_profile(profile)
+        
+        with self._get_device(cs_pin) as device:
+            self._apply_profile(device, profile)
             
-            # Read data
-            result = spi.xfer([self._make_command(self.REGISTERS['ADCDATA'], 'r'), 0, 0, 0])
-            return bytes(result[1:])
+            # Continuous mode always scans so every sample carries its CH_ID
+            self._configure_scan(device, scan_mask, 0b11)
+            
+            stream = MCP3564Stream(self, device, cs_pin, channels, capacity, profile)
+            device.stream = stream
+            self._start_conversion(device)
+            stream._thread.start()
+        
+        return stream
+    
+    def stop_stream(self, cs_pin: int):
+        """Stop a running stream and put the ADC back in standby"""
+        device = self._devices.get((self.config.spi_bus, cs_pin))
+        if device is None or device.stream is None:
+            return
+        
+        stream = device.stream
+        stream._stop_event.set()
+        stream._thread.join(timeout=5.0)
+        
+        with device.lock:
+            try:
+                device.spi.xfer([self.STANDBY])
+            except Exception as e:
+                self.logger.warning(f"Failed to stop conversions on CS {cs_pin}: {e}")
+            
+            # Re-init reads the registers back, so only what the stream changed is rewritten
+            device.stream = None
+            device.initialized = False
     
-    def raw_to_voltage(self, raw_data: bytes, gain: float = 1.0, vref: Optional[float] = None) -> float:
+    def raw_to_voltage(self, raw_data: bytes, gain: Optional[float] = None, vref: Optional[float] = None) -> float:
         """Convert raw ADC data to voltage"""
+        if gain is None:
+            gain = self.resolve_profile().gain
         if vref is None:
             vref = self.config.mcp3564_vref
         
@@ -117,9 +606,11 @@ class MCP3564Driver(BaseDriver):
         
         return vref * (value / 8388608) / gain
 
-    def raw_to_current(self, raw_data: bytes, gain: float = 1.0, full_scale_current: float = 1.0, vref: Optional[float] = None) -> float:
+    def raw_to_current(self, raw_data: bytes, gain: Optional[float] = None, full_scale_current: float = 1.0, vref: Optional[float] = None) -> float:
         
         #Convert raw ADC data to current, scaled to full-scale current
+        if gain is None:
+            gain = self.resolve_profile().gain
         if vref is None:
            vref = self.config.mcp3564_vref
         
@@ -137,8 +628,68 @@ class MCP3564Driver(BaseDriver):
         
         return current
     
+    def raw_block_to_codes(self, buffer: SampleBuffer) -> np.ndarray:
+        """Decode a buffer of packed 24-bit samples (or an array of codes) into signed ints"""
+        return decode_24bit(buffer)
+    
+    def raw_block_to_voltage(self, buffer: SampleBuffer, gain: Optional[float] = None,
+                             vref: Optional[float] = None) -> np.ndarray:
+        """Vectorized raw_to_voltage for a block of samples"""
+        if gain is None:
+            gain = self.resolve_profile().gain
+        if vref is None:
+            vref = self.config.mcp3564_vref
+        return codes_to_voltage(decode_24bit(buffer), gain, vref)
+    
+    def raw_block_to_current(self, buffer: SampleBuffer, gain: Optional[float] = None,
+                             full_scale_current: float = 1.0) -> np.ndarray:
+        """Vectorized raw_to_current for a block of samples"""
+        if gain is None:
+            gain = self.resolve_profile().gain
+        return codes_to_current(decode_24bit(buffer), gain, full_scale_current)
+    
+    def convert_samples(self, channels: np.ndarray, buffer: SampleBuffer,
+                        profile: Union[str, AcquisitionProfile, None] = None) -> np.ndarray:
+        """Scale samples from mixed channels using config.pcb_channel_scaling
+        
+        Voltage channels come out in volts and current channels in mA, in one pass
+        over the block; channels without an entry use the ChannelScaling() defaults.
+        A stream block converts with convert_samples(block['channel'], block['value']).
+        """
+        codes = decode_24bit(buffer)
+        channels = np.asarray(channels, dtype=np.intp)
+        if channels.size and channels.min() < 0:
+            raise ValueError("Sample channel numbers must not be negative")
+        pga_gain = self.resolve_profile(profile).gain
+        
+        # Per-channel lookup tables indexed by channel number
+        size = max(max(self.config.pcb_channel_scaling, default=-1), channels.max(initial=-1)) + 1
+        gain = np.empty(size)
+        scale = np.empty(size)
+        for channel in range(size):
+            scaling = self.config.pcb_channel_scaling.get(channel) or ChannelScaling()
+            gain[channel] = scaling.gain * pga_gain
+            if scaling.kind == 'current':
+                scale[channel] = scaling.full_scale_current * 1000
+            else:
+                scale[channel] = scaling.vref if scaling.vref is not None else self.config.mcp3564_vref
+        
+        # Both units reduce to code / 2^23 * scale / gain
+        return codes_to_voltage(codes, gain[channels], scale[channels])
+    
     def close(self):
         """Clean up resources"""
-        if self._spi:
-            self._spi.close()
-            self._spi = None
+        for device in list(self._devices.values()):
+            if device.stream is not None:
+                device.stream.stop()
+        
+        with self._pool_lock:
+            devices = list(self._devices.values())
+            self._devices.clear()
+        
+        for device in devices:
+            with device.lock:
+                if device.irq is not None:
+                    device.irq.close()
+                device.spi.close()
+                device.initialized = False
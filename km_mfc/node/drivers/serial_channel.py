@@ -0,0 +1,337 @@
+"""Non-blocking serial I/O with pipelined, individually timed requests.
+
+A SerialChannel takes over an open port's file descriptor and serves it
+from one I/O thread driven by selectors: commands are written as the port
+accepts them and received bytes go through an incremental parser
+(LineParser for text, FrameDecoder for binary frames). submit() never
+blocks; it returns a concurrent.futures.Future that resolves to the reply,
+so several commands can be outstanding at once, each with its own
+deadline, and any of them can be cancelled. request_async() awaits the
+same from an asyncio event loop.
+
+Replies complete requests in the order the commands were sent, which is
+how the Arduino answers. The protocol carries no request ids, so a request
+that was sent and then timed out or was cancelled keeps its place for a
+grace period: its late reply is discarded instead of being handed to the
+next request.
+
+Order alone cannot tell whose reply a message is when a command goes
+unanswered. Such a request still holds its place, takes the next reply
+(another command's) and that other request times out. Requests whose
+replies can be told apart should pass an accept predicate: a message goes
+to the oldest sent request that accepts it, and a request without one
+accepts anything. Binary replies can be matched on their frame sequence.
+"""
+
+import asyncio
+import logging
+import os
+import selectors
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Optional
+from .base_driver import HardwareDriverError
+from .serial_framing import FrameDecoder
+
+class SerialTimeoutError(HardwareDriverError):
+    """A request got no reply before its deadline"""
+    pass
+
+class LineParser:
+    """Incremental line parser with FrameDecoder's feed() interface
+
+    Lines are decoded and stripped; empty lines are skipped. Bytes piling up
+    past max_line without a line ending are dropped and counted in discarded.
+    """
+
+    def __init__(self, max_line: int = 4096):
+        self.max_line = max_line
+        self.discarded = 0
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[str]:
+        """Add received bytes and return the lines now complete"""
+        buffer = self._buffer
+        buffer += data
+        lines = []
+        end = buffer.rfind(b'\n')
+        if end >= 0:
+            for raw in bytes(buffer[:end]).split(b'\n'):
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line:
+                    lines.append(line)
+            del buffer[:end + 1]
+        if len(buffer) > self.max_line:
+            self.discarded += len(buffer)
+            buffer.clear()
+        return lines
+
+@dataclass
+class _Request:
+    """One submitted command and the state of its reply"""
+    command: bytes
+    deadline: float
+    future: Future
+    accept: Optional[Callable[[Any], bool]] = None
+    sent: bool = False
+    abandoned_at: Optional[float] = None  # When it finished without a reply
+
+class SerialChannel:
+    """Pipelined non-blocking requests over an open SerialDriver port
+
+    Start one with SerialDriver.start_channel(). Messages that arrive while
+    no sent request is waiting, or that every waiting request's accept
+    predicate turns down (pushed samples, say), go to on_unsolicited.
+    Requests that time out fail with SerialTimeoutError; when the port fails
+    or the channel stops, everything still queued fails with
+    HardwareDriverError.
+    """
+
+    def __init__(self, driver, framed: bool = False, on_unsolicited: Optional[Callable[[Any], None]] = None,
+                 grace: Optional[float] = None):
+        self.framed = framed
+        self.parser = FrameDecoder() if framed else LineParser()
+        self.on_unsolicited = on_unsolicited
+        self.grace = driver.config.serial_timeout if grace is None else grace
+        self.error: Optional[Exception] = None
+        self.timeouts = 0
+        self.late_replies = 0
+        self.unsolicited = 0
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._driver = driver
+        self._fd = driver._connection.fileno()
+        self._lock = threading.Lock()
+        self._queue: Deque[_Request] = deque()
+        self._write_buffer = bytearray()
+        self._stop_event = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._thread = threading.Thread(target=self._loop, name=f"SerialChannel-{driver.port}", daemon=True)
+
+    @property
+    def running(self) -> bool:
+        """Whether the I/O thread is alive"""
+        return self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Requests queued or awaiting a reply"""
+        with self._lock:
+            return sum(1 for request in self._queue if not request.future.done())
+
+    def submit(self, command: bytes, timeout: Optional[float] = None,
+               accept: Optional[Callable[[Any], bool]] = None) -> Future:
+        """Queue a command; the Future resolves to its reply line (or Frame)
+
+        timeout defaults to serial_timeout and counts from submission.
+        accept, when given, decides whether a message is this request's reply;
+        messages it turns down can still answer later requests.
+        """
+        if self._stop_event.is_set() or not self.running:
+            raise HardwareDriverError("Serial channel not running")
+        timeout = self._driver.config.serial_timeout if timeout is None else timeout
+        future = Future()
+        with self._lock:
+            self._queue.append(_Request(command, time.monotonic() + timeout, future, accept))
+        # Wake the loop to send it, and again on cancellation so the slot is released promptly
+        future.add_done_callback(lambda _: self._wake())
+        self._wake()
+        return future
+
+    def request(self, command: bytes, timeout: Optional[float] = None,
+                accept: Optional[Callable[[Any], bool]] = None):
+        """Send a command and block until its reply or deadline"""
+        return self.submit(command, timeout, accept).result()
+
+    async def request_async(self, command: bytes, timeout: Optional[float] = None,
+                            accept: Optional[Callable[[Any], bool]] = None):
+        """Awaitable request(); cancelling the await cancels the request"""
+        return await asyncio.wrap_future(self.submit(command, timeout, accept))
+
+    def cancel_all(self):
+        """Cancel every queued and outstanding request"""
+        with self._lock:
+            futures = [request.future for request in self._queue]
+        for future in futures:
+            future.cancel()
+
+    def stop(self):
+        """Stop the channel, failing anything still outstanding"""
+        self._driver.stop_reader()
+
+    def _halt(self):
+        """Ask the I/O thread to exit"""
+        self._stop_event.set()
+        self._wake()
+
+    def _wake(self):
+        """Interrupt the selector wait"""
+        with self._lock:
+            if self._wake_w is None:
+                return
+            try:
+                os.write(self._wake_w, b'\0')
+            except BlockingIOError:
+                pass  # Pipe full, so the loop is awake anyway
+
+    def _loop(self):
+        """Serve the port until stopped or it fails"""
+        was_blocking = os.get_blocking(self._fd)
+        os.set_blocking(self._fd, False)
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        selector.register(self._fd, selectors.EVENT_READ)
+        events = selectors.EVENT_READ
+        try:
+            while not self._stop_event.is_set():
+                wanted = selectors.EVENT_READ | (selectors.EVENT_WRITE if self._has_output() else 0)
+                if wanted != events:
+                    selector.modify(self._fd, wanted)
+                    events = wanted
+                for key, mask in selector.select(self._next_timeout()):
+                    if key.fd == self._wake_r:
+                        self._drain_wake()
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._receive()
+                    if mask & selectors.EVENT_WRITE:
+                        self._send()
+                self._expire(time.monotonic())
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Serial channel error on {self._driver.port}: {e}")
+        finally:
+            selector.close()
+            os.set_blocking(self._fd, was_blocking)
+            with self._lock:
+                requests = list(self._queue)
+                self._queue.clear()
+            for request in requests:
+                self._finish(request, exception=HardwareDriverError(
+                    f"Serial channel stopped: {self.error}" if self.error else "Serial channel stopped"))
+            with self._lock:
+                wake_w, self._wake_w = self._wake_w, None
+            os.close(wake_w)
+            os.close(self._wake_r)
+
+    def _drain_wake(self):
+        """Empty the wake pipe"""
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _has_output(self) -> bool:
+        """Whether bytes are waiting to be written"""
+        if self._write_buffer:
+            return True
+        with self._lock:
+            return any(not request.sent and not request.future.done() for request in self._queue)
+
+    def _next_timeout(self) -> Optional[float]:
+        """Seconds until the next deadline or grace expiry, None if there is none"""
+        with self._lock:
+            times = [
+                request.deadline if request.abandoned_at is None else request.abandoned_at + self.grace
+                for request in self._queue
+            ]
+        if not times:
+            return None
+        return max(min(times) - time.monotonic(), 0.0)
+
+    def _send(self):
+        """Write as much of the queued commands as the port accepts"""
+        if not self._write_buffer:
+            with self._lock:
+                for request in self._queue:
+                    if not request.sent and not request.future.done():
+                        request.sent = True
+                        self._write_buffer += request.command
+                        break
+        if self._write_buffer:
+            try:
+                written = os.write(self._fd, self._write_buffer)
+            except BlockingIOError:
+                return
+            del self._write_buffer[:written]
+
+    def _receive(self):
+        """Read available bytes and dispatch the messages they complete"""
+        try:
+            data = os.read(self._fd, 4096)
+        except BlockingIOError:
+            return
+        if not data:
+            raise HardwareDriverError("Serial port closed")
+        for message in self.parser.feed(data):
+            self._dispatch(message)
+
+    def _dispatch(self, message):
+        """Complete the oldest sent request that accepts a message, or pass it on as unsolicited"""
+        now = time.monotonic()
+        self._expire(now)
+        with self._lock:
+            request = None
+            for candidate in self._queue:
+                if not candidate.sent:
+                    break
+                if self._accepts(candidate, message):
+                    request = candidate
+                    break
+            if request is not None:
+                self._queue.remove(request)
+
+        if request is None:
+            self.unsolicited += 1
+            if self.on_unsolicited is not None:
+                try:
+                    self.on_unsolicited(message)
+                except Exception as e:
+                    self.logger.error(f"Serial unsolicited handler error: {e}")
+        elif not self._finish(request, result=message):
+            self.late_replies += 1
+
+    def _accepts(self, request: _Request, message) -> bool:
+        """Whether a message is the request's reply; any message is without an accept predicate"""
+        if request.accept is None:
+            return True
+        try:
+            return bool(request.accept(message))
+        except Exception as e:
+            self.logger.error(f"Serial reply predicate error: {e}")
+            return False
+
+    def _expire(self, now: float):
+        """Fail requests past their deadline and release abandoned slots past the grace period"""
+        expired = []
+        with self._lock:
+            for request in self._queue:
+                if request.abandoned_at is None and (request.future.done() or now >= request.deadline):
+                    request.abandoned_at = now
+                    if not request.future.done():
+                        expired.append(request)
+            # Unsent abandoned requests never get a reply; sent ones may, until the grace period ends
+            self._queue = deque(
+                request for request in self._queue
+                if request.abandoned_at is None or (request.sent and now < request.abandoned_at + self.grace)
+            )
+        for request in expired:
+            if self._finish(request, exception=SerialTimeoutError(f"No reply to {request.command!r} in time")):
+                self.timeouts += 1
+
+    @staticmethod
+    def _finish(request: _Request, result=None, exception: Optional[Exception] = None) -> bool:
+        """Resolve a request's Future unless it is already done"""
+        try:
+            if exception is not None:
+                request.future.set_exception(exception)
+            else:
+                request.future.set_result(result)
+            return True
+        except InvalidStateError:
+            return False
@@ -1,8 +1,75 @@
 """Serial communication driver."""
 
+import logging
 import serial
+import threading
 import time
+from typing import Any, Callable, List, Optional, Union
 from .base_driver import BaseDriver, HardwareDriverError
+from .serial_channel import SerialChannel, SerialTimeoutError
+from .serial_framing import Frame, FrameDecoder
+
+class SerialReader:
+    """Background thread handing every line or frame received on a serial port to a callback
+    
+    In line mode lines are decoded and stripped; empty lines (read timeouts)
+    are skipped. In frame mode received bytes go through a FrameDecoder and
+    only frames that pass the CRC reach the callback. The thread exits on
+    stop() or on a serial error, after which running is False.
+    """
+    
+    def __init__(self, driver: 'SerialDriver', on_line: Optional[Callable[[str], None]] = None,
+                 on_frame: Optional[Callable[[Frame], None]] = None):
+        if (on_line is None) == (on_frame is None):
+            raise ValueError("Exactly one of on_line and on_frame is required")
+        self.on_line = on_line
+        self.on_frame = on_frame
+        self.decoder = FrameDecoder() if on_frame is not None else None
+        self.error: Optional[Exception] = None
+        self._driver = driver
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._reader_loop, name=f"SerialReader-{driver.port}", daemon=True)
+    
+    def _reader_loop(self):
+        """Read lines or frames until stopped or the port fails"""
+        connection = self._driver._connection
+        while not self._stop_event.is_set():
+            try:
+                if self.decoder is None:
+                    data = connection.readline()
+                else:
+                    # Block for one byte, then take whatever else has arrived
+                    data = connection.read(1)
+                    if data and connection.in_waiting:
+                        data += connection.read(connection.in_waiting)
+            except Exception as e:
+                self.error = e
+                self._driver.logger.error(f"Serial read error on {self._driver.port}: {e}")
+                break
+            
+            try:
+                if self.decoder is not None:
+                    for frame in self.decoder.feed(data):
+                        self.on_frame(frame)
+                    continue
+                line = data.decode('utf-8', errors='replace').strip()
+                if line:
+                    self.on_line(line)
+            except Exception as e:
+                self._driver.logger.error(f"Serial {'frame' if self.decoder else 'line'} handler error: {e}")
+    
+    @property
+    def running(self) -> bool:
+        """Whether the reader thread is alive"""
+        return self._thread.is_alive()
+    
+    def stop(self):
+        """Stop the reader thread"""
+        self._driver.stop_reader()
+    
+    def _halt(self):
+        """Ask the reader thread to exit"""
+        self._stop_event.set()
 
 class SerialDriver(BaseDriver):
     """Driver for serial communication"""
@@ -11,10 +78,21 @@ class SerialDriver(BaseDriver):
         super().__init__(config)
         self._connection = None
         self._port = None
+        self._reader: Optional[Union[SerialReader, SerialChannel]] = None
+        self._decoder = FrameDecoder()  # Blocking read_frame() state, kept between calls
+        self._frames: List[Frame] = []  # Frames decoded past the last one returned
+        self.logger = logging.getLogger(self.__class__.__name__)
     
-    def connect(self, port: str):
-        """Connect to serial port"""
-        if self._port == port and self._connection and self._connection.is_open:
+    def connect(self, port: str, probe: Optional[bytes] = None, expect: Optional[str] = None):
+        """Connect to serial port
+        
+        With a probe, the device counts as ready once it answers the probe
+        with the expect line; the probe is resent every serial_ready_retry
+        seconds (an Arduino ignores input while its bootloader runs after
+        the open resets it) until serial_ready_timeout. Without one, the
+        driver waits serial_settle_time seconds instead.
+        """
+        if self._port == port and self._connection and self._connection.is_open and not self._reader_failed():
             return
         
         self.disconnect()
@@ -25,33 +103,184 @@ class SerialDriver(BaseDriver):
                 self.config.serial_baudrate, 
                 timeout=self.config.serial_timeout
             )
-            time.sleep(2)  # Allow time for connection
-            self._connection.reset_input_buffer()
-            self._connection.reset_output_buffer()
             self._port = port
+            if probe is None:
+                time.sleep(self.config.serial_settle_time)  # Allow time for connection
+                self._connection.reset_input_buffer()
+                self._connection.reset_output_buffer()
+            elif not self.handshake(probe, expect):
+                raise HardwareDriverError(f"No ready reply within {self.config.serial_ready_timeout} s")
         except Exception as e:
+            self.disconnect()
+            if isinstance(e, HardwareDriverError):
+                raise
             raise HardwareDriverError(f"Serial connection error: {e}")
     
-    def send_command(self, command: bytes) -> str:
-        """Send command and read response"""
+    def handshake(self, probe: bytes, expect: Optional[str]) -> bool:
+        """Send probe until the device replies with expect or serial_ready_timeout expires"""
+        self._require_connection()
+        deadline = time.monotonic() + self.config.serial_ready_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._connection.reset_input_buffer()
+            self._connection.write(probe)
+            if self.await_line(expect, min(self.config.serial_ready_retry, remaining)):
+                return True
+    
+    def _require_connection(self):
+        """Raise unless the port is open"""
         if not self._connection or not self._connection.is_open:
             raise HardwareDriverError("Serial connection not established")
+    
+    def _reader_failed(self) -> bool:
+        """Whether a reader thread stopped on a serial error"""
+        return self._reader is not None and not self._reader.running and self._reader.error is not None
+    
+    def send_command(self, command: bytes, timeout: Optional[float] = None) -> str:
+        """Send command and read response, "" if none arrives within timeout (serial_timeout by default)
+        
+        With a channel running the command is queued behind any others in
+        flight instead of blocking the port.
+        """
+        self._require_connection()
+        if isinstance(self._reader, SerialChannel) and not self._reader.framed:
+            try:
+                return self._reader.request(command, timeout)
+            except SerialTimeoutError:
+                return ""
+        if self._reader is not None:
+            raise HardwareDriverError("Serial reader active; responses go to its callback")
         
-        self._connection.write(command)
-        response = self._connection.readline().decode('utf-8').strip()
+        connection = self._connection
+        read_timeout = connection.timeout
+        if timeout is not None:
+            connection.timeout = timeout
+        try:
+            connection.write(command)
+            response = connection.readline().decode('utf-8').strip()
+        finally:
+            connection.timeout = read_timeout
         return response
     
+    def write(self, data: bytes):
+        """Send bytes without waiting for a response"""
+        self._require_connection()
+        if isinstance(self._reader, SerialChannel):
+            raise HardwareDriverError("Serial channel active; submit commands through it")
+        self._connection.write(data)
+    
+    def await_line(self, expected: Optional[str], timeout: float) -> bool:
+        """Read lines until one equals expected (any line if None) or the timeout expires
+        
+        Other lines are discarded. The read timeout is narrowed to the time
+        left, so this returns within timeout.
+        """
+        self._require_connection()
+        connection = self._connection
+        read_timeout = connection.timeout
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                connection.timeout = min(read_timeout, remaining) if read_timeout is not None else remaining
+                line = connection.readline().decode('utf-8', errors='replace').strip()
+                if line and (expected is None or line == expected):
+                    return True
+        finally:
+            connection.timeout = read_timeout
+    
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Read until one complete, CRC-valid frame arrives; None on timeout
+        
+        Frames that arrive together with the one returned are kept for the
+        next call.
+        """
+        self._require_connection()
+        connection = self._connection
+        read_timeout = connection.timeout
+        deadline = time.monotonic() + (self.config.serial_timeout if timeout is None else timeout)
+        try:
+            while not self._frames:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                connection.timeout = remaining
+                data = connection.read(1)
+                if data and connection.in_waiting:
+                    data += connection.read(connection.in_waiting)
+                self._frames.extend(self._decoder.feed(data))
+            return self._frames.pop(0)
+        finally:
+            connection.timeout = read_timeout
+    
+    def set_baudrate(self, baudrate: int):
+        """Change the baud rate of the open port"""
+        self._require_connection()
+        self._connection.baudrate = baudrate
+    
+    def start_reader(self, on_line: Optional[Callable[[str], None]] = None,
+                     on_frame: Optional[Callable[[Frame], None]] = None) -> SerialReader:
+        """Hand every received line to on_line, or every frame to on_frame, from a background thread
+        
+        send_command() is refused until the reader is stopped; write() still
+        works for commands whose replies the callback handles.
+        """
+        self._require_connection()
+        if self._reader is not None and self._reader.running:
+            raise HardwareDriverError("Serial reader already running")
+        
+        self._reader = SerialReader(self, on_line, on_frame)
+        self._reader._thread.start()
+        return self._reader
+    
+    def start_channel(self, framed: bool = False,
+                      on_unsolicited: Optional[Callable[[Any], None]] = None) -> SerialChannel:
+        """Serve the port from a non-blocking SerialChannel for pipelined requests
+        
+        Replies are lines, or Frames when framed. Like a reader, the channel
+        owns the port until stop_reader(); send_command() goes through it.
+        """
+        self._require_connection()
+        if self._reader is not None and self._reader.running:
+            raise HardwareDriverError("Serial reader already running")
+        
+        self._reader = SerialChannel(self, framed, on_unsolicited)
+        self._reader._thread.start()
+        return self._reader
+    
+    def stop_reader(self):
+        """Stop the background reader or channel, if any"""
+        reader = self._reader
+        if reader is None:
+            return
+        reader._halt()
+        if reader._thread is not threading.current_thread():
+            reader._thread.join(timeout=2 * self.config.serial_timeout + 1.0)
+        self._reader = None
+    
+    @property
+    def port(self) -> Optional[str]:
+        """Connected port, None when disconnected"""
+        return self._port
+    
     def disconnect(self):
         """Disconnect from serial port"""
+        self.stop_reader()
         if self._connection and self._connection.is_open:
             self._connection.close()
         self._connection = None
         self._port = None
+        self._decoder = FrameDecoder()
+        self._frames = []
     
     @property
     def is_connected(self) -> bool:
         """Check if serial connection is active"""
-        return self._connection and self._connection.is_open
+        return bool(self._connection and self._connection.is_open) and not self._reader_failed()
     
     def close(self):
         """Clean up resources"""
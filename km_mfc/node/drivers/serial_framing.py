@@ -0,0 +1,102 @@
+"""Binary frames for serial links.
+
+A frame is a 2-byte sync marker, a payload length byte, a little-endian
+uint16 sequence number, the payload and a little-endian CRC16-CCITT
+(polynomial 0x1021, initial value 0xFFFF) over the length, sequence and
+payload bytes. The sync marker lets a decoder find the next frame after
+noise or a corrupted frame; the CRC turns corruption into a counted error
+instead of a silently wrong value.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import List
+
+SYNC = b"\xa5\x5a"
+HEADER = struct.Struct('<2sBH')  # sync, payload length, sequence
+CRC = struct.Struct('<H')
+MAX_PAYLOAD = 255
+SEQUENCE_MODULUS = 1 << 16
+
+def _crc_table() -> List[int]:
+    """Byte-wise lookup table for CRC16-CCITT"""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xffff)
+    return table
+
+_CRC_TABLE = _crc_table()
+
+def crc16_ccitt(data: bytes, crc: int = 0xffff) -> int:
+    """CRC16-CCITT (0x1021) of data"""
+    for byte in data:
+        crc = ((crc << 8) & 0xffff) ^ _CRC_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+@dataclass
+class Frame:
+    """One decoded frame"""
+    sequence: int
+    payload: bytes
+
+def encode_frame(sequence: int, payload: bytes) -> bytes:
+    """Build the bytes of a frame"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload of {len(payload)} bytes exceeds {MAX_PAYLOAD}")
+    header = HEADER.pack(SYNC, len(payload), sequence % SEQUENCE_MODULUS)
+    return header + payload + CRC.pack(crc16_ccitt(header[len(SYNC):] + payload))
+
+class FrameDecoder:
+    """Incremental frame parser for a byte stream
+
+    feed() accepts bytes in arbitrary pieces and returns the frames they
+    complete. Bytes outside frames are skipped and counted in discarded;
+    frames failing the CRC are counted in crc_errors and the search for the
+    next sync marker resumes just after the bad one.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.crc_errors = 0
+        self.discarded = 0
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Frame]:
+        """Add received bytes and return the frames now complete"""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        while True:
+            start = buffer.find(SYNC)
+            if start < 0:
+                # Keep a trailing first sync byte that may pair with the next read
+                keep = 1 if buffer[-1:] == SYNC[:1] else 0
+                self.discarded += len(buffer) - keep
+                del buffer[:len(buffer) - keep]
+                break
+            if start:
+                self.discarded += start
+                del buffer[:start]
+            if len(buffer) < HEADER.size:
+                break
+
+            _, length, sequence = HEADER.unpack_from(buffer)
+            end = HEADER.size + length + CRC.size
+            if len(buffer) < end:
+                break
+
+            body = bytes(buffer[len(SYNC):HEADER.size + length])
+            (crc,) = CRC.unpack_from(buffer, HEADER.size + length)
+            if crc != crc16_ccitt(body):
+                self.crc_errors += 1
+                self.discarded += 1
+                del buffer[:1]  # The marker may have been noise; rescan from the next byte
+                continue
+
+            frames.append(Frame(sequence, body[HEADER.size - len(SYNC):]))
+            self.frames += 1
+            del buffer[:end]
+        return frames
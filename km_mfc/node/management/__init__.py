@@ -1,5 +1,9 @@
 """Management module."""
 
 from .sensor_management import SensorManager
+from .async_sensor_management import AsyncSensorManager
+from .scheduler import DeadlineScheduler, MissedDeadlinePolicy, ScheduledJob
+from .board_registry import BoardRegistry, Board, BoardSensor
 
-__all__ = ['SensorManager']
+__all__ = ['SensorManager', 'AsyncSensorManager', 'DeadlineScheduler', 'MissedDeadlinePolicy', 'ScheduledJob',
+           'BoardRegistry', 'Board', 'BoardSensor']
@@ -0,0 +1,153 @@
+"""Asyncio sensor management system."""
+
+import asyncio
+from concurrent.futures import Executor
+import logging
+from typing import Dict, List, Optional, Union
+from .scheduler import MissedDeadlinePolicy, next_tick
+from ..sensors import BaseSensor
+from ..sensors.async_sensor import AsyncBaseSensor, ThreadedSensor
+from ..adapters import SensorDataAdapter
+from ..adapters.async_adapter import AsyncSensorDataAdapter, ThreadedAdapter
+
+class AsyncSensorManager:
+    """Manages many sensors from one asyncio event loop
+
+    Each sensor gets a task that fires on the fixed deadline grid used by
+    DeadlineScheduler, measured on the loop's monotonic clock. A semaphore bounds
+    how many reads are in flight at once, and a per-sensor read timeout cancels
+    reads that hang. Blocking sensors and adapters are wrapped in thread-offload
+    shims automatically.
+    """
+
+    def __init__(self, max_concurrency: int = 8, executor: Optional[Executor] = None):
+        self.sensors: Dict[str, AsyncBaseSensor] = {}
+        self.adapters: Dict[str, List[AsyncSensorDataAdapter]] = {}
+        self.intervals: Dict[str, float] = {}
+        self.policies: Dict[str, MissedDeadlinePolicy] = {}
+        self.read_timeouts: Dict[str, Optional[float]] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def add_sensor(self, sensor: Union[BaseSensor, AsyncBaseSensor], interval: float,
+                   adapters: List[Union[SensorDataAdapter, AsyncSensorDataAdapter]],
+                   policy: MissedDeadlinePolicy = MissedDeadlinePolicy.SKIP,
+                   read_timeout: Optional[float] = None):
+        """Add a sensor with reading interval, data adapters, missed-deadline policy and read timeout"""
+        if isinstance(sensor, BaseSensor):
+            sensor = ThreadedSensor(sensor, self.executor)
+        adapters = [
+            adapter if isinstance(adapter, AsyncSensorDataAdapter) else ThreadedAdapter(adapter, self.executor)
+            for adapter in adapters
+        ]
+
+        self.sensors[sensor.name] = sensor
+        self.adapters[sensor.name] = adapters
+        self.intervals[sensor.name] = interval
+        self.policies[sensor.name] = policy
+        self.read_timeouts[sensor.name] = read_timeout
+        self.logger.info(f"Added sensor '{sensor.name}' with {interval}s interval")
+
+    def start_sensor(self, sensor_name: str):
+        """Start reading from a specific sensor; must be called from the event loop"""
+        if sensor_name not in self.sensors:
+            raise ValueError(f"Sensor '{sensor_name}' not found")
+
+        if sensor_name in self.tasks and not self.tasks[sensor_name].done():
+            self.logger.warning(f"Sensor '{sensor_name}' already running")
+            return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.stats[sensor_name] = {'runs': 0, 'missed': 0, 'timeouts': 0, 'max_lateness': 0.0}
+        self.tasks[sensor_name] = asyncio.get_running_loop().create_task(
+            self._sensor_loop(sensor_name), name=f"sensor-{sensor_name}")
+        self.logger.info(f"Started reading from sensor '{sensor_name}'")
+
+    async def stop_sensor(self, sensor_name: str):
+        """Stop reading from a specific sensor, cancelling a read in progress"""
+        task = self.tasks.pop(sensor_name, None)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.logger.info(f"Stopped sensor '{sensor_name}'")
+
+    def start_all(self):
+        """Start all registered sensors"""
+        for sensor_name in self.sensors:
+            self.start_sensor(sensor_name)
+
+    async def stop_all(self):
+        """Stop all running sensors"""
+        await asyncio.gather(*(self.stop_sensor(name) for name in list(self.tasks)))
+
+    async def run(self, duration: Optional[float] = None):
+        """Start all sensors and run until cancelled or for duration seconds"""
+        self.start_all()
+        try:
+            if duration is None:
+                await asyncio.gather(*self.tasks.values())
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            await self.cleanup()
+
+    async def _sensor_loop(self, sensor_name: str):
+        """Fire reads on absolute deadlines until cancelled"""
+        loop = asyncio.get_running_loop()
+        interval = self.intervals[sensor_name]
+        policy = self.policies[sensor_name]
+        stats = self.stats[sensor_name]
+        origin = loop.time() + interval
+        tick = 0
+
+        while True:
+            delay = origin + tick * interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            stats['max_lateness'] = max(stats['max_lateness'], loop.time() - (origin + tick * interval))
+
+            await self._read_sensor(sensor_name)
+            stats['runs'] += 1
+
+            new_tick = next_tick(policy, tick, (loop.time() - origin) / interval)
+            stats['missed'] += new_tick - tick - 1
+            tick = new_tick
+
+    async def _read_sensor(self, sensor_name: str):
+        """Read one sample under the concurrency bound and fan it out to the adapters"""
+        sensor = self.sensors[sensor_name]
+
+        try:
+            async with self._semaphore:
+                reading = await asyncio.wait_for(sensor.read(), self.read_timeouts[sensor_name])
+        except asyncio.TimeoutError:
+            self.stats[sensor_name]['timeouts'] += 1
+            self.logger.error(f"Sensor reading timed out for {sensor_name}")
+            return
+        except Exception as e:
+            self.logger.error(f"Sensor reading error for {sensor_name}: {e}")
+            return
+
+        results = await asyncio.gather(
+            *(adapter.process_reading(reading) for adapter in self.adapters[sensor_name]),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Adapter error for {sensor_name}: {result}")
+
+    async def cleanup(self):
+        """Clean up all resources"""
+        await self.stop_all()
+        for sensor in self.sensors.values():
+            await sensor.close()
+        self.sensors.clear()
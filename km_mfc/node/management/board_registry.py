@@ -0,0 +1,153 @@
+"""Registry of the boards driven by one node process."""
+
+from dataclasses import dataclass, fields
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from .scheduler import MissedDeadlinePolicy
+from ..config import BoardConfig, HardwareConfig, SensorReading
+from ..drivers import I2CBus, MCP3564Driver, AD5272Driver
+from ..sensors import BaseSensor, PCBSensor, TerosArduinoSensor
+from ..utils.serial_utils import SerialPortRegistry
+
+class BoardSensor(BaseSensor):
+    """Wraps a board's sensor so its readings carry the board_id"""
+
+    def __init__(self, sensor: BaseSensor, board_id: str):
+        super().__init__(sensor.name, sensor.config)
+        self.sensor = sensor
+        self.board_id = board_id
+
+    def read(self) -> SensorReading:
+        reading = self.sensor.read()
+        reading.board_id = self.board_id
+        return reading
+
+    def close(self):
+        self.sensor.close()
+
+@dataclass
+class Board:
+    """Sensors built for one board"""
+    board_id: str
+    config: HardwareConfig
+    interval: Optional[float] = None
+    pcb: Optional[PCBSensor] = None
+    teros: Optional[TerosArduinoSensor] = None
+
+    @property
+    def sensors(self) -> List[BaseSensor]:
+        """The board's sensors, PCB first"""
+        return [sensor for sensor in (self.pcb, self.teros) if sensor is not None]
+
+def _settings_key(config: HardwareConfig, prefixes: Tuple[str, ...]) -> Tuple:
+    """Hashable snapshot of the config fields starting with any of prefixes"""
+    return tuple((f.name, repr(getattr(config, f.name))) for f in fields(config) if f.name.startswith(prefixes))
+
+class BoardRegistry:
+    """Builds and owns the sensors of every board in config.boards
+
+    Each board gets a PCBSensor named pcb_<board_id> and/or a
+    TerosArduinoSensor named teros_<board_id>, configured from the shared
+    config with the board's overrides applied. Hardware handles are shared:
+    boards on the same SPI bus with the same ADC settings use one
+    MCP3564Driver and its device pool, and boards on the same I2C bus use
+    one I2CBus handle. Overlapping chip-selects, TCA addresses or Arduino
+    identities are rejected up front.
+
+    add_to() puts every sensor on one SensorManager or AsyncSensorManager,
+    wrapped so readings are tagged with their board_id. The manager's
+    cleanup() closes the sensors; close the registry after it to release the
+    shared handles.
+    """
+
+    def __init__(self, config: HardwareConfig,
+                 port_detectors: Optional[Dict[str, Callable[[], Optional[str]]]] = None):
+        self.config = config
+        self.boards: Dict[str, Board] = {}
+        self.i2c_buses: Dict[int, I2CBus] = {}
+        self.adc_drivers: Dict[Tuple, MCP3564Driver] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        port_detectors = port_detectors or {}
+
+        configs = {board.board_id: config.for_board(board) for board in config.boards}
+        if len(configs) != len(config.boards):
+            raise ValueError("Board ids must be unique")
+        self._validate(config.boards, configs)
+
+        for board in config.boards:
+            self.boards[board.board_id] = self._build(board, configs[board.board_id],
+                                                      port_detectors.get(board.board_id))
+            self.logger.info(f"Board '{board.board_id}': {[s.name for s in self.boards[board.board_id].sensors]}")
+
+    def _validate(self, boards: List[BoardConfig], configs: Dict[str, HardwareConfig]):
+        """Reject boards that would fight over a chip-select, mux or Arduino"""
+        claimed: Dict[Tuple, str] = {}
+
+        def claim(resource: Tuple, board_id: str, what: str):
+            if resource in claimed:
+                raise ValueError(f"Boards '{claimed[resource]}' and '{board_id}' share {what}")
+            claimed[resource] = board_id
+
+        teros_boards = [board for board in boards if board.teros]
+        for board in boards:
+            board_config = configs[board.board_id]
+            if board.pcb:
+                for cs in board.adc_cs:
+                    claim(('spi', board_config.spi_bus, cs), board.board_id,
+                          f"SPI bus {board_config.spi_bus} CS {cs}")
+                claim(('tca', board_config.i2c_bus, board_config.tca_address), board.board_id,
+                      f"TCA mux 0x{board_config.tca_address:02x} on I2C bus {board_config.i2c_bus}")
+            if board.teros and len(teros_boards) > 1:
+                identity = (board_config.serial_vid, board_config.serial_pid, board_config.serial_number)
+                if all(value is None for value in identity):
+                    raise ValueError(f"Board '{board.board_id}' needs a serial_vid/pid/number override "
+                                     f"to tell its Arduino apart")
+                claim(('serial',) + identity, board.board_id, "an Arduino USB identity")
+
+    def _build(self, board: BoardConfig, config: HardwareConfig,
+               port_detector: Optional[Callable[[], Optional[str]]]) -> Board:
+        """Create one board's sensors on the shared handles"""
+        result = Board(board.board_id, config, board.interval)
+        if board.pcb:
+            key = _settings_key(config, ('spi_', 'mcp3564_'))
+            if key not in self.adc_drivers:
+                self.adc_drivers[key] = MCP3564Driver(config)
+            if config.i2c_bus not in self.i2c_buses:
+                self.i2c_buses[config.i2c_bus] = I2CBus(config.i2c_bus)
+            result.pcb = PCBSensor(
+                f"pcb_{board.board_id}", config, adc_cs=board.adc_cs,
+                adc_driver=self.adc_drivers[key], pot_driver=AD5272Driver(config, self.i2c_buses[config.i2c_bus])
+            )
+        if board.teros:
+            result.teros = TerosArduinoSensor(
+                f"teros_{board.board_id}", config, port_detector or SerialPortRegistry.from_config(config)
+            )
+        return result
+
+    def __getitem__(self, board_id: str) -> Board:
+        return self.boards[board_id]
+
+    @property
+    def sensors(self) -> List[BoardSensor]:
+        """Every board's sensors, tagged with their board_id"""
+        return [BoardSensor(sensor, board.board_id) for board in self.boards.values() for sensor in board.sensors]
+
+    def add_to(self, manager, adapters: List, interval: Optional[float] = None,
+               policy: MissedDeadlinePolicy = MissedDeadlinePolicy.SKIP):
+        """Register every sensor with one SensorManager or AsyncSensorManager
+
+        A board's own interval takes precedence over interval.
+        """
+        for board in self.boards.values():
+            board_interval = board.interval or interval
+            if not board_interval:
+                raise ValueError(f"No read interval for board '{board.board_id}'")
+            for sensor in board.sensors:
+                manager.add_sensor(BoardSensor(sensor, board.board_id), board_interval, adapters, policy)
+
+    def close(self):
+        """Close the shared SPI and I2C handles; the sensors are closed by the manager's cleanup()"""
+        for driver in self.adc_drivers.values():
+            driver.close()
+        for bus in self.i2c_buses.values():
+            bus.close()
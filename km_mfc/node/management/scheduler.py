@@ -0,0 +1,219 @@
+"""Deadline-based periodic job scheduler."""
+
+import heapq
+import itertools
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from threading import Thread, Condition, Event
+from typing import Callable, Dict, List, Optional, Tuple
+
+class MissedDeadlinePolicy(Enum):
+    """What to do with grid points that passed while a job was still running"""
+    SKIP = "skip"  # Drop them and resume on the next future grid point
+    CATCH_UP = "catch_up"  # Run every one of them back to back
+    COALESCE = "coalesce"  # Run once immediately for all of them, then resume on the grid
+
+def next_tick(policy: MissedDeadlinePolicy, tick: int, elapsed_ticks: float) -> int:
+    """Grid index of the next run after run number tick finished elapsed_ticks intervals past the origin"""
+    if policy is MissedDeadlinePolicy.CATCH_UP:
+        return tick + 1
+    if policy is MissedDeadlinePolicy.COALESCE:
+        # Latest grid point already passed, fired once for everything missed
+        return max(tick + 1, math.floor(elapsed_ticks))
+    return max(tick + 1, math.ceil(elapsed_ticks))
+
+@dataclass
+class ScheduledJob:
+    """A periodic job fired on the grid origin + k * interval"""
+    name: str
+    func: Callable[[], None]
+    interval: float
+    policy: MissedDeadlinePolicy
+    origin: float = 0.0
+    tick: int = 0
+    active: bool = True
+    idle: Event = field(default_factory=Event)
+    runs: int = 0
+    missed: int = 0
+    max_lateness: float = 0.0
+
+    @property
+    def deadline(self) -> float:
+        """Monotonic time of the next firing"""
+        return self.origin + self.tick * self.interval
+
+    def stats(self) -> Dict[str, float]:
+        """Run counters for this job"""
+        return {
+            'runs': self.runs,
+            'missed': self.missed,
+            'max_lateness': self.max_lateness,
+            'interval': self.interval
+        }
+
+class DeadlineScheduler:
+    """Runs periodic jobs from one scheduler thread on absolute monotonic deadlines
+
+    Deadlines come from a fixed grid, so the period does not stretch by the job's
+    run time and there is no cumulative drift. Due jobs run on a small worker pool,
+    or inline on the scheduler thread when max_workers is 0. A job never overlaps
+    itself: its next deadline is picked when a run finishes, following its
+    MissedDeadlinePolicy.
+
+    A job still running when the scheduler is restarted is not queued again by
+    start(); it queues itself when the run finishes, so it keeps one deadline.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = False
+        self._generation = 0  # Bumped by start() so a thread left over from a timed-out stop() exits
+
+    def start(self):
+        """Start the scheduler thread and worker pool"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._generation += 1
+
+            # Jobs kept across a stop resume on their next future grid point; one still
+            # running is rescheduled by its own run
+            now = time.monotonic()
+            self._heap = []
+            for job in self.jobs.values():
+                if job.idle.is_set():
+                    job.tick = max(job.tick, math.ceil((now - job.origin) / job.interval))
+                    self._push(job)
+
+            if self.max_workers > 0:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="SchedulerWorker")
+            self._thread = Thread(target=self._run, args=(self._generation,), name="DeadlineScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the scheduler thread after in-flight jobs finish"""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+
+        self._thread.join(timeout=timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler thread is active"""
+        return self._running
+
+    def add_job(self, name: str, func: Callable[[], None], interval: float,
+                policy: MissedDeadlinePolicy = MissedDeadlinePolicy.SKIP,
+                first_run: Optional[float] = None) -> ScheduledJob:
+        """Schedule func every interval seconds
+
+        The first run happens at first_run (a time.monotonic() value), or one
+        interval from now by default.
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+
+        with self._cond:
+            if name in self.jobs and self.jobs[name].active:
+                raise ValueError(f"Job '{name}' already scheduled")
+
+            if first_run is None:
+                first_run = time.monotonic() + interval
+            job = ScheduledJob(name=name, func=func, interval=interval, policy=policy, origin=first_run)
+            job.idle.set()
+            self.jobs[name] = job
+            self._push(job)
+            return job
+
+    def remove_job(self, name: str, timeout: Optional[float] = 5.0):
+        """Unschedule a job, waiting up to timeout for a run in progress"""
+        with self._cond:
+            job = self.jobs.pop(name, None)
+            if job is None:
+                return
+            job.active = False
+            self._cond.notify_all()
+
+        if not job.idle.wait(timeout):
+            self.logger.warning(f"Job '{name}' still running after removal")
+
+    def _push(self, job: ScheduledJob):
+        """Queue a job's next deadline; caller holds the condition"""
+        heapq.heappush(self._heap, (job.deadline, next(self._counter), job))
+        self._cond.notify_all()
+
+    def _next_due(self, generation: int) -> Optional[ScheduledJob]:
+        """Block until the earliest job is due; None once stopped or restarted. Caller holds the condition"""
+        while self._running and self._generation == generation:
+            if not self._heap:
+                self._cond.wait()
+                continue
+
+            deadline, _, job = self._heap[0]
+            if not job.active:
+                heapq.heappop(self._heap)
+                continue
+
+            delay = deadline - time.monotonic()
+            if delay <= 0:
+                heapq.heappop(self._heap)
+                return job
+            self._cond.wait(delay)
+        return None
+
+    def _run(self, generation: int):
+        """Scheduler loop: sleep until the earliest deadline and dispatch it"""
+        while True:
+            with self._cond:
+                job = self._next_due(generation)
+                if job is None:
+                    return
+                job.idle.clear()
+
+            if self._executor is not None:
+                self._executor.submit(self._execute, job)
+            else:
+                self._execute(job)
+
+    def _execute(self, job: ScheduledJob):
+        """Run a job once and schedule its next deadline"""
+        job.max_lateness = max(job.max_lateness, time.monotonic() - job.deadline)
+        try:
+            job.func()
+        except Exception as e:
+            self.logger.error(f"Job '{job.name}' failed: {e}")
+        finally:
+            job.runs += 1
+            self._reschedule(job)
+
+    def _reschedule(self, job: ScheduledJob):
+        """Pick the next grid point according to the job's policy"""
+        elapsed_ticks = (time.monotonic() - job.origin) / job.interval
+        tick = next_tick(job.policy, job.tick, elapsed_ticks)
+        job.missed += tick - job.tick - 1
+        job.tick = tick
+
+        with self._cond:
+            if job.active and self._running:
+                self._push(job)
+            # Under the condition, so start() sees either a queued job or an idle one
+            job.idle.set()
@@ -1,56 +1,84 @@
 """Sensor management system."""
 
-from threading import Thread, Event
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
+from .scheduler import DeadlineScheduler, MissedDeadlinePolicy
 from ..sensors import BaseSensor
-from ..adapters import SensorDataAdapter
+from ..adapters import SensorDataAdapter, BufferedAdapter, OverflowPolicy
 
 class SensorManager:
-    """Manages multiple sensors with scheduled reading"""
+    """Manages multiple sensors with scheduled reading
     
-    def __init__(self):
+    All sensors share one DeadlineScheduler: reads fire on a fixed grid of
+    monotonic deadlines from a single scheduler thread and run on a small
+    worker pool, so the sampling period does not drift with read time.
+    
+    Each distinct adapter is wrapped in a BufferedAdapter with its own bounded
+    queue and worker thread, so a slow adapter cannot delay reads. Pass an
+    adapter_queue_size of 0 to run adapters inline on the read thread instead.
+    """
+    
+    def __init__(self, max_workers: int = 4, adapter_queue_size: int = 1000,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
         self.sensors: Dict[str, BaseSensor] = {}
         self.adapters: Dict[str, List[SensorDataAdapter]] = {}
+        self.adapter_queue_size = adapter_queue_size
+        self.overflow = overflow
+        self.buffered: Dict[int, BufferedAdapter] = {}
         self.intervals: Dict[str, float] = {}
-        self.threads: Dict[str, Thread] = {}
-        self.stop_events: Dict[str, Event] = {}
+        self.policies: Dict[str, MissedDeadlinePolicy] = {}
+        self.scheduler = DeadlineScheduler(max_workers=max_workers)
         self.logger = logging.getLogger(self.__class__.__name__)
     
-    def add_sensor(self, sensor: BaseSensor, interval: float, adapters: List[SensorDataAdapter]):
-        """Add a sensor with reading interval and data adapters"""
+    def add_sensor(self, sensor: BaseSensor, interval: float, adapters: List[SensorDataAdapter],
+                   policy: MissedDeadlinePolicy = MissedDeadlinePolicy.SKIP,
+                   overflow: Optional[OverflowPolicy] = None):
+        """Add a sensor with reading interval, data adapters and missed-deadline policy
+        
+        overflow overrides the manager's default queue policy for adapters first
+        seen here; adapters already wrapped in a BufferedAdapter keep their own.
+        """
         self.sensors[sensor.name] = sensor
-        self.adapters[sensor.name] = adapters
+        self.adapters[sensor.name] = [self._buffer_adapter(adapter, overflow) for adapter in adapters]
         self.intervals[sensor.name] = interval
+        self.policies[sensor.name] = policy
         self.logger.info(f"Added sensor '{sensor.name}' with {interval}s interval")
     
+    def _buffer_adapter(self, adapter: SensorDataAdapter,
+                        overflow: Optional[OverflowPolicy]) -> SensorDataAdapter:
+        """Wrap an adapter in a queue, sharing one worker when it serves several sensors"""
+        if self.adapter_queue_size <= 0 and not isinstance(adapter, BufferedAdapter):
+            return adapter
+        
+        key = id(adapter)
+        if key not in self.buffered:
+            if not isinstance(adapter, BufferedAdapter):
+                adapter = BufferedAdapter(adapter, self.adapter_queue_size, overflow or self.overflow)
+            self.buffered[key] = adapter
+        return self.buffered[key]
+    
     def start_sensor(self, sensor_name: str):
         """Start reading from a specific sensor"""
         if sensor_name not in self.sensors:
             raise ValueError(f"Sensor '{sensor_name}' not found")
         
-        if sensor_name in self.threads and self.threads[sensor_name].is_alive():
+        if sensor_name in self.scheduler.jobs:
             self.logger.warning(f"Sensor '{sensor_name}' already running")
             return
         
-        stop_event = Event()
-        thread = Thread(target=self._sensor_loop, args=(sensor_name, stop_event))
-        
-        self.stop_events[sensor_name] = stop_event
-        self.threads[sensor_name] = thread
-        thread.start()
+        self.scheduler.add_job(
+            sensor_name,
+            lambda: self._read_sensor(sensor_name),
+            self.intervals[sensor_name],
+            self.policies[sensor_name]
+        )
+        self.scheduler.start()
         
         self.logger.info(f"Started reading from sensor '{sensor_name}'")
     
     def stop_sensor(self, sensor_name: str):
         """Stop reading from a specific sensor"""
-        if sensor_name in self.stop_events:
-            self.stop_events[sensor_name].set()
-        
-        if sensor_name in self.threads:
-            self.threads[sensor_name].join(timeout=5.0)
-            del self.threads[sensor_name]
-        
+        self.scheduler.remove_job(sensor_name, timeout=5.0)
         self.logger.info(f"Stopped sensor '{sensor_name}'")
     
     def start_all(self):
@@ -60,27 +88,38 @@ class SensorManager:
     
     def stop_all(self):
         """Stop all running sensors"""
-        for sensor_name in list(self.threads.keys()):
+        for sensor_name in list(self.scheduler.jobs.keys()):
             self.stop_sensor(sensor_name)
+        self.scheduler.stop()
+    
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-sensor run, missed-deadline and lateness counters"""
+        return {name: job.stats() for name, job in self.scheduler.jobs.items()}
     
-    def _sensor_loop(self, sensor_name: str, stop_event: Event):
-        """Main sensor reading loop"""
+    def get_adapter_stats(self) -> Dict[str, Dict[str, int]]:
+        """Queue depth, processed and dropped counters for each buffered adapter"""
+        return {f"{a.adapter.__class__.__name__}@{key:x}": a.stats() for key, a in self.buffered.items()}
+    
+    def flush_adapters(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every buffered adapter has drained its queue"""
+        return all(adapter.flush(timeout) for adapter in self.buffered.values())
+    
+    def _read_sensor(self, sensor_name: str):
+        """Read one sample and hand it to the sensor's adapters without waiting on them"""
         sensor = self.sensors[sensor_name]
-        interval = self.intervals[sensor_name]
         adapters = self.adapters[sensor_name]
         
-        while not stop_event.wait(interval):
-            try:
-                reading = sensor.read()
-                
-                for adapter in adapters:
-                    try:
-                        adapter.process_reading(reading)
-                    except Exception as e:
-                        self.logger.error(f"Adapter error for {sensor_name}: {e}")
-                        
-            except Exception as e:
-                self.logger.error(f"Sensor reading error for {sensor_name}: {e}")
+        try:
+            reading = sensor.read()
+            
+            for adapter in adapters:
+                try:
+                    adapter.process_reading(reading)
+                except Exception as e:
+                    self.logger.error(f"Adapter error for {sensor_name}: {e}")
+                    
+        except Exception as e:
+            self.logger.error(f"Sensor reading error for {sensor_name}: {e}")
     
     def cleanup(self):
         """Clean up all resources"""
@@ -88,3 +127,7 @@ class SensorManager:
         for sensor in self.sensors.values():
             sensor.close()
         self.sensors.clear()
+        
+        for adapter in self.buffered.values():
+            adapter.close()
+        self.buffered.clear()
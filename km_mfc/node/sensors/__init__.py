@@ -2,6 +2,10 @@
 
 from .base_sensor import BaseSensor
 from .pcb_sensor import PCBSensor
-from .teros_arduino_sensor import TerosArduinoSensor
+from .teros_arduino_sensor import TerosArduinoSensor, TerosStream, decode_teros_records
+from .async_sensor import AsyncBaseSensor, ThreadedSensor
 
-__all__ = ['BaseSensor', 'PCBSensor', 'TerosArduinoSensor']
+__all__ = [
+    'BaseSensor', 'PCBSensor', 'TerosArduinoSensor', 'TerosStream', 'decode_teros_records',
+    'AsyncBaseSensor', 'ThreadedSensor'
+]
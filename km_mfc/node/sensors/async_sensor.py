@@ -0,0 +1,54 @@
+"""Asyncio sensor interface and thread-offload shim."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+import logging
+from typing import Optional
+from .base_sensor import BaseSensor
+from ..config import HardwareConfig, SensorReading
+
+class AsyncBaseSensor(ABC):
+    """Abstract base class for sensors read from an asyncio event loop"""
+
+    def __init__(self, name: str, config: HardwareConfig):
+        self.name = name
+        self.config = config
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{name}")
+
+    @abstractmethod
+    async def read(self) -> SensorReading:
+        """Read sensor data"""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Clean up resources"""
+        pass
+
+class ThreadedSensor(AsyncBaseSensor):
+    """Runs a blocking BaseSensor in a worker thread so it never stalls the event loop
+
+    Cancelling read() stops the caller from waiting, but the blocking driver call
+    still runs to completion in its thread. Until it does, further read() calls
+    await that call instead of starting another alongside it.
+    """
+
+    def __init__(self, sensor: BaseSensor, executor: Optional[Executor] = None):
+        super().__init__(sensor.name, sensor.config)
+        self.sensor = sensor
+        self.executor = executor
+        self._in_flight: Optional[asyncio.Future] = None
+
+    async def read(self) -> SensorReading:
+        if self._in_flight is None or self._in_flight.done():
+            loop = asyncio.get_running_loop()
+            self._in_flight = loop.run_in_executor(self.executor, self.sensor.read)
+        # Shielded so a timed-out caller leaves the call for the next read() to collect
+        return await asyncio.shield(self._in_flight)
+
+    async def close(self):
+        if self._in_flight is not None:
+            await asyncio.wait([self._in_flight])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.sensor.close)
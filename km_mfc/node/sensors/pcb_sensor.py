@@ -1,92 +1,138 @@
 """PCB sensor implementation."""
 
 import time
-from typing import Dict, Any, Optional
+from dataclasses import replace
+from typing import Dict, Any, List, Optional
 from .base_sensor import BaseSensor
-from ..config import SensorReading, ADCChannel, DigitalPotChannel
+from ..config import SensorReading, ADCChannel, DigitalPotChannel, ChannelScaling
 from ..drivers import MCP3564Driver, AD5272Driver
 
 class PCBSensor(BaseSensor):
-    """PCB sensor with ADC and digital potentiometer control"""
+    """PCB sensor with ADC and digital potentiometer control
     
-    def __init__(self, name: str, config):
+    adc_cs gives the SPI chip-select of ADC0 and ADC1 (0 and 1 by default).
+    An adc_driver passed in may serve other boards and is left open by
+    close(); a pot_driver on a shared I2CBus only releases the bus.
+    """
+    
+    def __init__(self, name: str, config, profile: Optional[str] = None, adc_cs: Optional[List[int]] = None,
+                 adc_driver: Optional[MCP3564Driver] = None, pot_driver: Optional[AD5272Driver] = None):
         super().__init__(name, config)
-        self.adc_driver = MCP3564Driver(config)
-        self.pot_driver = AD5272Driver(config)
+        self._owns_adc = adc_driver is None
+        self.adc_driver = adc_driver or MCP3564Driver(config)
+        self.pot_driver = pot_driver or AD5272Driver(config)
+        self.adc_cs = {adc_channel: adc_channel.value for adc_channel in ADCChannel}
+        if adc_cs is not None:
+            self.adc_cs = dict(zip(ADCChannel, adc_cs))
         self._last_adc_channel = None
+        
+        # Acquisition profile used by read(); None follows config.mcp3564_profile
+        self.profile = profile
     
-    def set_resistance(self, channel: DigitalPotChannel, resistance: float):
-        """Set digital potentiometer resistance"""
+    def set_resistance(self, channel: DigitalPotChannel, resistance: float, force: bool = False):
+        """Set digital potentiometer resistance, skipping bus writes that would be no-ops unless forced"""
         try:
-            self.pot_driver.select_channel(channel)
+            self.pot_driver.select_channel(channel, force=force)
             position = self.pot_driver.resistance_to_position(resistance)
-            self.pot_driver.set_wiper_position(position)
+            self.pot_driver.set_wiper_position(position, force=force)
             self.logger.info(f"Set channel {channel.name} to {resistance}Ω (position {position})")
         except Exception as e:
             self.logger.error(f"Failed to set resistance: {e}")
             raise
     
-    def read_adc_channel(self, adc_channel: ADCChannel, channel_num: int, isCurrent: bool) -> Optional[Dict[str, Any]]:
-        """Read specific ADC channel"""
+    def get_resistances(self) -> Dict[DigitalPotChannel, float]:
+        """Read back every digital potentiometer channel's resistance"""
+        positions = self.pot_driver.read_all_wipers()
+        return {channel: self.pot_driver.position_to_resistance(position) for channel, position in positions.items()}
+    
+    # Channel layout per ADC: result key -> channel number; whether a channel reads
+    # voltage or current comes from its config.pcb_channel_scaling kind
+    CHANNEL_MAP = {
+        'voltage 1': 1,
+        'current 1': 0,
+        'voltage 2': 3,
+        'current 2': 2,
+    }
+    
+    def expected_read_time(self, profile: Optional[str] = None) -> float:
+        """Expected ADC conversion time (s) of one read() under a profile"""
+        acquisition = self.adc_driver.resolve_profile(profile or self.profile)
+        channels = len(set(self.CHANNEL_MAP.values()))
+        return acquisition.scan_time(self.config.mcp3564_mclk, channels) * len(ADCChannel)
+    
+    def _channel_scaling(self, channel_num: int) -> ChannelScaling:
+        """Configured scaling of a channel, or the ChannelScaling() default"""
+        return self.config.pcb_channel_scaling.get(channel_num) or ChannelScaling()
+    
+    def _format_adc_data(self, adc_channel: ADCChannel, channel_num: int, raw_data: bytes,
+                         scaling: ChannelScaling, gain: float = 1.0) -> Dict[str, Any]:
+        """Convert raw ADC bytes into a channel result dictionary"""
+        raw_int = int.from_bytes(raw_data, byteorder='big')
+        gain *= scaling.gain
+        
+        if scaling.kind == 'voltage':
+            return {
+                'voltage': self.adc_driver.raw_to_voltage(raw_data, gain=gain, vref=scaling.vref),
+                'raw_value': raw_int,
+                'channel': channel_num,
+                'adc': adc_channel.name
+            }
+        
+        return {
+            'current': self.adc_driver.raw_to_current(raw_data, gain=gain,
+                                                      full_scale_current=scaling.full_scale_current),
+            'raw_value': raw_int,
+            'channel': channel_num,
+            'adc': adc_channel.name
+        }
+    
+    def read_adc_channel(self, adc_channel: ADCChannel, channel_num: int, isCurrent: Optional[bool] = None,
+                         profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Read specific ADC channel, as current or voltage per its scaling unless isCurrent is given"""
         try:
-            cs_pin = adc_channel.value
-            raw_data = self.adc_driver.read_channel_raw(cs_pin, channel_num)
+            scaling = self._channel_scaling(channel_num)
+            if isCurrent is not None:
+                scaling = replace(scaling, kind='current' if isCurrent else 'voltage')
+            
+            cs_pin = self.adc_cs[adc_channel]
+            acquisition = self.adc_driver.resolve_profile(profile or self.profile)
+            raw_data = self.adc_driver.read_channel_raw(cs_pin, channel_num, profile=acquisition)
             
             if raw_data is None:
                 return None
-
-            if not isCurrent:
-                voltage = self.adc_driver.raw_to_voltage(raw_data, vref=5.0)  # Custom VREF
-                raw_int = int.from_bytes(raw_data, byteorder='big')
-                
-                return {
-                    'voltage': voltage,
-                    'raw_value': raw_int,
-                    'channel': channel_num,
-                    'adc': adc_channel.name
-                }
-            else:
-                current = self.adc_driver.raw_to_current(raw_data)  # Custom VREF
-                raw_int = int.from_bytes(raw_data, byteorder='big')
-                
-                return {
-                    'current': current,
-                    'raw_value': raw_int,
-                    'channel': channel_num,
-                    'adc': adc_channel.name
-                }
+            
+            return self._format_adc_data(adc_channel, channel_num, raw_data, scaling, acquisition.gain)
         except Exception as e:
             self.logger.error(f"ADC read error: {e}")
             return None
     
-    def read(self) -> SensorReading:
-        """Read all sensor data"""
+    def read_adc_scan(self, adc_channel: ADCChannel, profile: Optional[str] = None) -> Dict[str, Any]:
+        """Read every mapped channel of one ADC in a single scan sequence"""
+        adc_data = {}
+        try:
+            acquisition = self.adc_driver.resolve_profile(profile or self.profile)
+            channels = sorted(set(self.CHANNEL_MAP.values()))
+            raw = self.adc_driver.read_channels_raw(self.adc_cs[adc_channel], channels, profile=acquisition)
+            
+            for key, channel_num in self.CHANNEL_MAP.items():
+                raw_data = raw.get(channel_num)
+                if raw_data is not None:
+                    adc_data[key] = self._format_adc_data(adc_channel, channel_num, raw_data,
+                                                          self._channel_scaling(channel_num), acquisition.gain)
+        except Exception as e:
+            self.logger.error(f"ADC scan error: {e}")
+        
+        return adc_data
+    
+    def read(self, profile: Optional[str] = None) -> SensorReading:
+        """Read all sensor data, optionally under a different acquisition profile"""
         timestamp = time.time()
         data = {}
         
         try:
             # Read voltage and current from both ADC channels
             for adc_channel in ADCChannel:
-                adc_data = {}
-                
-                # Read voltage (channel 1) and current (channel 0)
-                voltage_data = self.read_adc_channel(adc_channel, 1, isCurrent=False)
-                current_data = self.read_adc_channel(adc_channel, 0, isCurrent=True)
-                
-                voltage_data2 = self.read_adc_channel(adc_channel, 3, isCurrent=False)
-                current_data2 = self.read_adc_channel(adc_channel, 2, isCurrent=True)
-                
-                if voltage_data:
-                    adc_data['voltage 1'] = voltage_data
-                if current_data:
-                    adc_data['current 1'] = current_data
-                    
-                if voltage_data2:
-                    adc_data['voltage 2'] = voltage_data2
-                if current_data2:
-                    adc_data['current 2'] = current_data2
-                
-                data[adc_channel.name] = adc_data
+                data[adc_channel.name] = self.read_adc_scan(adc_channel, profile)
             
             return SensorReading(
                 sensor_name=self.name,
@@ -105,5 +151,6 @@ class PCBSensor(BaseSensor):
     
     def close(self):
         """Clean up resources"""
-        self.adc_driver.close()
+        if self._owns_adc:
+            self.adc_driver.close()
         self.pot_driver.close()
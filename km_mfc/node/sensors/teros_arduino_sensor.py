@@ -1,29 +1,240 @@
 """Teros Arduino sensor implementation."""
 
+import logging
 import time
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
 from .base_sensor import BaseSensor
 from ..config import SensorReading
-from ..drivers import SerialDriver, HardwareDriverError
+from ..drivers import SerialDriver, SerialReader, SerialChannel, SerialTimeoutError, HardwareDriverError
+from ..drivers.serial_framing import Frame, SEQUENCE_MODULUS
+from ..utils.ring_buffer import RingBuffer
+from ..utils.serial_utils import SerialPortRegistry
+
+def parse_teros_fields(parts: List[str]) -> Optional[Dict[str, Any]]:
+    """Parse elapsed_time,volumetric_water_content,temperature,electric_conductivity fields"""
+    if len(parts) < 4:
+        return None
+    try:
+        return {
+            'elapsed_time': int(parts[0]),
+            'volumetric_water_content': float(parts[1]),
+            'temperature': float(parts[2]),
+            'electric_conductivity': float(parts[3]),
+        }
+    except ValueError:
+        return None
+
+# One reading in a binary frame payload, as the sketch's packed TerosRecord
+TEROS_RECORD_DTYPE = np.dtype([
+    ('elapsed_time', '<i4'), ('volumetric_water_content', '<f4'), ('temperature', '<f4'),
+    ('electric_conductivity', '<f4')
+])
+
+def decode_teros_records(payload: bytes) -> np.ndarray:
+    """Readings carried by one binary frame"""
+    if len(payload) % TEROS_RECORD_DTYPE.itemsize:
+        raise ValueError(f"Payload of {len(payload)} bytes is not a whole number of records")
+    return np.frombuffer(payload, dtype=TEROS_RECORD_DTYPE)
+
+def send_acknowledged(driver: SerialDriver, command: str, timeout: float, description: str):
+    """Send a command line and wait for the Arduino's K acknowledgement, skipping anything before it"""
+    driver.write(f"{command}\n".encode())
+    if not driver.await_line(TerosStream.ACK, timeout):
+        raise HardwareDriverError(f"Arduino did not acknowledge {description}")
+
+class TerosStream:
+    """Push-mode sample stream from the Teros Arduino
+    
+    The Arduino is told once to measure every interval seconds and pushes
+    D<sequence>,<fields> lines on its own, or with frame_records set, binary
+    frames of that many readings each. A SerialReader parses them into a
+    ring buffer of SAMPLE_DTYPE records, stamped with time.time() on receipt
+    (the earlier readings of a batched frame one interval apart before it).
+    Jumps in the sequence are counted in missed; a sequence that goes
+    backwards means the Arduino restarted its stream.
+    """
+    
+    SAMPLE_DTYPE = np.dtype([
+        ('timestamp', 'f8'), ('sequence', 'u4'), ('elapsed_time', 'i4'),
+        ('volumetric_water_content', 'f8'), ('temperature', 'f8'), ('electric_conductivity', 'f8')
+    ])
+    ACK = "K"
+    ACK_TIMEOUT = 5.0  # Covers a measurement already in progress on the Arduino
+    
+    def __init__(self, driver: SerialDriver, interval: float, capacity: int, frame_records: int = 0):
+        self.interval = interval
+        self.frame_records = frame_records
+        self.buffer = RingBuffer(capacity, self.SAMPLE_DTYPE)
+        self.missed = 0
+        self.parse_errors = 0
+        self.restarts = 0
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._driver = driver
+        self._next_sequence: Optional[int] = None
+        self._reader: Optional[SerialReader] = None
+    
+    def start(self):
+        """Switch the Arduino to push mode and start parsing its lines"""
+        driver = self._driver
+        # Stop any stream left running so the acknowledgement is not buried in samples
+        send_acknowledged(driver, "X", self.ACK_TIMEOUT, "stream stop; firmware without push mode?")
+        if self.frame_records:
+            send_acknowledged(driver, f"F{self.frame_records}", self.ACK_TIMEOUT, "binary framing")
+        send_acknowledged(driver, f"P{int(round(self.interval * 1000))}", self.ACK_TIMEOUT, "stream start")
+        if self.frame_records:
+            self._reader = driver.start_reader(on_frame=self._on_frame)
+        else:
+            self._reader = driver.start_reader(self._on_line)
+    
+    def _track(self, sequence: int, modulus: Optional[int] = None):
+        """Count gaps and restarts in the sample sequence"""
+        if self._next_sequence is not None:
+            gap = sequence - self._next_sequence
+            if modulus is not None:
+                gap %= modulus
+                if gap >= modulus // 2:
+                    gap -= modulus
+            if gap > 0:
+                self.missed += gap
+            elif gap < 0:
+                self.restarts += 1
+                self.logger.warning(f"Stream restarted at sequence {sequence}")
+        self._next_sequence = sequence + 1 if modulus is None else (sequence + 1) % modulus
+    
+    def _on_line(self, line: str):
+        """Parse one pushed line into the ring buffer"""
+        if not line.startswith('D'):
+            return
+        head, _, rest = line[1:].partition(',')
+        try:
+            sequence = int(head)
+        except ValueError:
+            self.parse_errors += 1
+            return
+        
+        self._track(sequence)
+        
+        fields = parse_teros_fields(rest.split(','))
+        if fields is None:
+            self.parse_errors += 1
+            return
+        self.buffer.append((
+            time.time(), sequence, fields['elapsed_time'], fields['volumetric_water_content'],
+            fields['temperature'], fields['electric_conductivity']
+        ))
+    
+    def _on_frame(self, frame: Frame):
+        """Store the readings of one pushed frame; its sequence is that of the first reading"""
+        try:
+            records = decode_teros_records(frame.payload)
+        except ValueError:
+            self.parse_errors += 1
+            return
+        received = time.time()
+        for index, record in enumerate(records):
+            sequence = (frame.sequence + index) % SEQUENCE_MODULUS
+            self._track(sequence, SEQUENCE_MODULUS)
+            # The Arduino measured the batch one interval apart and sent it after the last one
+            measured = received - self.interval * (len(records) - 1 - index)
+            self.buffer.append((
+                measured, sequence, record['elapsed_time'], record['volumetric_water_content'],
+                record['temperature'], record['electric_conductivity']
+            ))
+    
+    @property
+    def crc_errors(self) -> int:
+        """Frames dropped for a bad CRC"""
+        reader = self._reader
+        return reader.decoder.crc_errors if reader is not None and reader.decoder is not None else 0
+    
+    @property
+    def running(self) -> bool:
+        """Whether lines are still being read"""
+        return self._reader is not None and self._reader.running
+    
+    def latest(self) -> Optional[np.void]:
+        """Newest sample, None before the first one arrives"""
+        samples = self.buffer.latest(1)
+        return samples[0] if len(samples) else None
+    
+    def stop(self):
+        """Stop reading and take the Arduino out of push mode"""
+        self._driver.stop_reader()
+        self._reader = None
+        try:
+            self._driver.write(b"X\n")
+            # Consume the acknowledgement and samples in flight so polled replies line up again
+            self._driver.await_line(self.ACK, self.ACK_TIMEOUT)
+        except Exception as e:
+            self.logger.debug(f"Could not stop Arduino stream: {e}")
 
 class TerosArduinoSensor(BaseSensor):
-    """Teros Arduino sensor via serial communication"""
+    """Teros Arduino sensor via serial communication
+    
+    With a stream interval (argument or config.teros_stream_interval) the
+    Arduino pushes samples on its own and read() returns the newest one
+    immediately, with its age and sequence number; otherwise every read()
+    polls with R and waits for the measurement. If the stream cannot be
+    started, reads poll instead until STREAM_RETRY_INTERVAL has passed.
+    
+    Polls go through a SerialChannel, each with a deadline of serial_timeout.
+    A reply that arrives after its poll gave up is discarded rather than
+    answering the next poll: text replies must look like a measurement, and
+    framed replies must carry the sequence the poll expects.
+    
+    After the handshake the link can be moved to config.teros_baudrate and,
+    with config.teros_frame_records set, to CRC-checked binary frames carrying
+    that many readings each in push mode (one per polled reading).
     
-    def __init__(self, name: str, config, port_detector_func=None):
+    Without a port_detector_func, ports are found through a
+    SerialPortRegistry when the config names the Arduino's USB identity.
+    """
+    
+    STALE_INTERVALS = 3  # Pushed samples older than this many intervals are flagged
+    STREAM_RETRY_INTERVAL = 60.0  # Seconds of polling after a failed stream start before it is tried again
+    
+    def __init__(self, name: str, config, port_detector_func=None, stream_interval: Optional[float] = None):
         super().__init__(name, config)
         self.serial_driver = SerialDriver(config)
+        if port_detector_func is None and any(
+                value is not None for value in (config.serial_vid, config.serial_pid, config.serial_number)):
+            port_detector_func = SerialPortRegistry.from_config(config)
         self.port_detector = port_detector_func
+        self.stream_interval = stream_interval if stream_interval is not None else config.teros_stream_interval
+        self.frame_records = config.teros_frame_records
+        self.stream: Optional[TerosStream] = None
+        self.channel: Optional[SerialChannel] = None
+        self.stale_frames = 0
         self._last_port = None
+        self._frame_sequence: Optional[int] = None  # Expected sequence of the next polled frame
+        self._stream_retry_at = 0.0  # Monotonic time before which reads poll instead of streaming
     
     def _verify_connection(self, port: str) -> bool:
         """Verify Arduino connection with handshake"""
         try:
-            self.serial_driver.connect(port)
-            response = self.serial_driver.send_command(b"S\n")
-            return response == "U"
+            self.serial_driver.stop_reader()
+            self._frame_sequence = None  # Opening the port resets the Arduino
+            # S doubles as the readiness probe, so no fixed boot delay is needed
+            self.serial_driver.connect(port, probe=b"S\n", expect="U")
+            self._configure_link()
+            return True
         except Exception as e:
             self.logger.warning(f"Connection verification failed: {e}")
             return False
     
+    def _configure_link(self):
+        """Apply the configured baud rate and framing to a freshly opened link"""
+        driver = self.serial_driver
+        baudrate = self.config.teros_baudrate
+        if baudrate and baudrate != self.config.serial_baudrate:
+            send_acknowledged(driver, f"B{baudrate}", self.config.serial_timeout, "baud rate change")
+            driver.set_baudrate(baudrate)
+            if not driver.handshake(b"S\n", "U"):
+                raise HardwareDriverError(f"No handshake at {baudrate} baud")
+        if self.frame_records:
+            send_acknowledged(driver, f"F{self.frame_records}", self.config.serial_timeout, "binary framing")
+    
     def _ensure_connection(self):
         """Ensure valid serial connection"""
         if self.port_detector:
@@ -34,6 +245,8 @@ class TerosArduinoSensor(BaseSensor):
                     self._last_port = current_port
                     self.logger.info(f"Connected to Arduino on {current_port}")
                 else:
+                    if isinstance(self.port_detector, SerialPortRegistry):
+                        self.port_detector.invalidate()
                     raise HardwareDriverError("Arduino handshake failed")
     
     def read(self) -> SensorReading:
@@ -52,43 +265,192 @@ class TerosArduinoSensor(BaseSensor):
                     error_message="Serial connection not available"
                 )
             
-            response = self.serial_driver.send_command(b"R\n")
-            
-            if not response:
-                return SensorReading(
-                    sensor_name=self.name,
-                    timestamp=timestamp,
-                    data={'status': 'no_response'}
-                )
-            
-            # Parse response: elapsed_time,volumetric_water_content,temperature,electric_conductivity
-            parts = response.split(',')
-            if len(parts) >= 4:
-                data = {
-                    'elapsed_time': int(parts[0]),
-                    'volumetric_water_content': float(parts[1]),
-                    'temperature': float(parts[2]),
-                    'electric_conductivity': float(parts[3]),
-                    'status': 'connected'
-                }
+            if self.stream_interval:
+                return self._read_stream(timestamp)
+            return self._read_poll(timestamp)
+        
+        except Exception as e:
+            return SensorReading(
+                sensor_name=self.name,
+                timestamp=timestamp,
+                data={'status': 'error'},
+                status="error",
+                error_message=str(e)
+            )
+    
+    def _read_poll(self, timestamp: float) -> SensorReading:
+        """Poll one reading with R"""
+        if self.frame_records:
+            return self._read_frame(timestamp)
+        
+        try:
+            response = self._channel().request(b"R\n", accept=self._is_measurement)
+        except SerialTimeoutError:
+            response = ""
+        
+        if not response:
+            return SensorReading(
+                sensor_name=self.name,
+                timestamp=timestamp,
+                data={'status': 'no_response'}
+            )
+        
+        # Parse response: elapsed_time,volumetric_water_content,temperature,electric_conductivity
+        data = parse_teros_fields(response.split(','))
+        if data is not None:
+            data['status'] = 'connected'
+        else:
+            data = {'raw_response': response, 'status': 'parse_error'}
+        
+        return SensorReading(
+            sensor_name=self.name,
+            timestamp=timestamp,
+            data=data
+        )
+    
+    def _channel(self) -> SerialChannel:
+        """Channel the polls go through, started on first use after connecting"""
+        if self.channel is None or not self.channel.running:
+            self.channel = self.serial_driver.start_channel(bool(self.frame_records), self._on_unsolicited)
+        return self.channel
+    
+    def _stop_channel(self):
+        """Give the port back to blocking I/O"""
+        channel, self.channel = self.channel, None
+        if channel is not None and channel.running:
+            channel.stop()
+    
+    @staticmethod
+    def _is_measurement(line: str) -> bool:
+        """Whether a line can answer R, rather than being an acknowledgement or a pushed sample"""
+        return line not in (TerosStream.ACK, "U") and not line.startswith('D')
+    
+    def _on_unsolicited(self, message):
+        """Count frames that answered no poll"""
+        if isinstance(message, Frame):
+            self.stale_frames += 1
+    
+    def _read_frame(self, timestamp: float) -> SensorReading:
+        """Poll one reading over binary framing"""
+        channel = self._channel()
+        stale_frames = self.stale_frames
+        try:
+            frame = channel.request(b"R\n", accept=self._frame_predicate())
+            self._frame_sequence = (frame.sequence + 1) % SEQUENCE_MODULUS
+        except SerialTimeoutError:
+            frame = None
+            # This poll's frame may still come and must not answer the next one; after frames
+            # out of step the Arduino missed an R, so take whatever comes next instead
+            if self.stale_frames != stale_frames or self._frame_sequence is None:
+                self._frame_sequence = None
             else:
-                data = {'raw_response': response, 'status': 'parse_error'}
-            
+                self._frame_sequence = (self._frame_sequence + 1) % SEQUENCE_MODULUS
             return SensorReading(
                 sensor_name=self.name,
                 timestamp=timestamp,
-                data=data
+                data={'status': 'no_response'}
             )
         
-        except Exception as e:
+        records = decode_teros_records(frame.payload)
+        if not len(records):
             return SensorReading(
                 sensor_name=self.name,
                 timestamp=timestamp,
-                data={'status': 'error'},
-                status="error",
-                error_message=str(e)
+                data={'status': 'parse_error'}
             )
+        record = records[-1]
+        return SensorReading(
+            sensor_name=self.name,
+            timestamp=timestamp,
+            data={
+                'elapsed_time': int(record['elapsed_time']),
+                'volumetric_water_content': float(record['volumetric_water_content']),
+                'temperature': float(record['temperature']),
+                'electric_conductivity': float(record['electric_conductivity']),
+                'status': 'connected'
+            }
+        )
+    
+    def _frame_predicate(self) -> Optional[Callable[[Frame], bool]]:
+        """Accept predicate for the next polled frame, None to take any after a resync"""
+        expected = self._frame_sequence
+        if expected is None:
+            return None
+        return lambda frame: frame.sequence == expected
+    
+    def _read_stream(self, timestamp: float) -> SensorReading:
+        """Newest pushed sample, starting the stream if it is not running"""
+        if self.stream is None or not self.stream.running:
+            if time.monotonic() < self._stream_retry_at:
+                return self._read_poll(timestamp)
+            try:
+                self.start_stream()
+            except HardwareDriverError as e:
+                # Each attempt can block for several acknowledgement timeouts, so not on every read
+                self._stream_retry_at = time.monotonic() + self.STREAM_RETRY_INTERVAL
+                self.logger.warning(f"Stream start failed, polling for {self.STREAM_RETRY_INTERVAL:.0f} s: {e}")
+                return self._read_poll(timestamp)
+        
+        sample = self.stream.latest()
+        if sample is None:
+            return SensorReading(
+                sensor_name=self.name,
+                timestamp=timestamp,
+                data={'status': 'no_response'}
+            )
+        
+        age = time.time() - float(sample['timestamp'])
+        data = {
+            'elapsed_time': int(sample['elapsed_time']),
+            'volumetric_water_content': float(sample['volumetric_water_content']),
+            'temperature': float(sample['temperature']),
+            'electric_conductivity': float(sample['electric_conductivity']),
+            'sequence': int(sample['sequence']),
+            'age': age,
+            'missed': self.stream.missed,
+            'status': 'connected'
+        }
+        # Batched frames deliver a frame's worth of readings at once
+        if age > self.STALE_INTERVALS * self.stream.interval * max(self.stream.frame_records, 1):
+            return SensorReading(
+                sensor_name=self.name,
+                timestamp=float(sample['timestamp']),
+                data=data,
+                status="warning",
+                error_message=f"Stale sample ({age:.1f} s old)"
+            )
+        return SensorReading(
+            sensor_name=self.name,
+            timestamp=float(sample['timestamp']),
+            data=data
+        )
+    
+    def start_stream(self, interval: Optional[float] = None) -> TerosStream:
+        """Put the Arduino in push mode; read() then returns the newest sample"""
+        interval = interval or self.stream_interval
+        if not interval:
+            raise ValueError("A stream interval is required")
+        self.stop_stream()
+        self._stop_channel()
+        self.stream_interval = interval
+        self._frame_sequence = None  # P restarts the Arduino's sequence
+        
+        stream = TerosStream(self.serial_driver, self.stream_interval, self.config.teros_stream_capacity,
+                             self.frame_records)
+        stream.start()
+        self.stream = stream
+        self.logger.info(f"Arduino streaming every {self.stream_interval} s")
+        return stream
+    
+    def stop_stream(self):
+        """Return the Arduino to polled mode"""
+        self.stream_interval = None
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
     
     def close(self):
         """Clean up resources"""
+        self.stop_stream()
+        self._stop_channel()
         self.serial_driver.close()
@@ -0,0 +1,19 @@
+"""On-disk storage formats and readers."""
+
+from .pcb_segment import (
+    PCBSegment, PCBSegmentWriter, RECORD_DTYPE, CIRCUIT_MODES, load_segments, records_to_columns,
+    segment_channels
+)
+from .ndjson_loader import (
+    PCB_COLUMNS, TEROS_COLUMNS, flatten_record, iter_columns, iter_frames, load_frame, load_by_sensor
+)
+from .time_index import TimeIndexWriter, build_index, read_index, seek_range
+from .parse_cache import ParseCache
+from .parquet_store import export_parquet, read_table, read_parquet, export_excel
+
+__all__ = [
+    'PCBSegment', 'PCBSegmentWriter', 'RECORD_DTYPE', 'CIRCUIT_MODES', 'load_segments', 'records_to_columns',
+    'segment_channels', 'PCB_COLUMNS', 'TEROS_COLUMNS', 'flatten_record', 'iter_columns', 'iter_frames',
+    'load_frame', 'load_by_sensor', 'TimeIndexWriter', 'build_index', 'read_index', 'seek_range',
+    'ParseCache', 'export_parquet', 'read_table', 'read_parquet', 'export_excel'
+]
@@ -0,0 +1,238 @@
+"""Chunked NDJSON log loader that flattens readings into typed columns.
+
+Each chunk is a dict of preallocated numpy arrays: float64 for timestamp and
+the value columns (NaN where a reading has no value) and object arrays for
+sensor, status and circuit_mode. Lines are parsed with orjson when it is
+installed. Peak memory stays at about one chunk no matter how large the log.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from .time_index import seek_range
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # Standard library parser, several times slower
+    _loads = json.loads
+
+# Flat column -> (ADC, result key, field) in a PCB reading
+PCB_COLUMNS = {
+    'v0': ('ADC0', 'voltage 1', 'voltage'),
+    'v1': ('ADC0', 'voltage 2', 'voltage'),
+    'v2': ('ADC1', 'voltage 1', 'voltage'),
+    'v3': ('ADC1', 'voltage 2', 'voltage'),
+    'i0': ('ADC0', 'current 1', 'current'),
+    'i1': ('ADC0', 'current 2', 'current'),
+    'i2': ('ADC1', 'current 1', 'current'),
+    'i3': ('ADC1', 'current 2', 'current'),
+}
+
+# Flat column -> key in a TEROS reading
+TEROS_COLUMNS = {
+    'vwc': 'volumetric_water_content',
+    'temp': 'temperature',
+    'ec': 'electric_conductivity',
+}
+
+META_COLUMNS = ['timestamp', 'sensor', 'status', 'circuit_mode']
+VALUE_COLUMNS = list(PCB_COLUMNS) + list(TEROS_COLUMNS)
+
+Paths = Union[str, Sequence[str]]
+Sensors = Union[str, Sequence[str], None]
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one logged reading into the loader's columns, None where missing"""
+    data = record.get('data') or {}
+    row = {
+        'timestamp': record.get('timestamp'),
+        'sensor': record.get('sensor_name'),
+        'status': record.get('status'),
+        'circuit_mode': record.get('circuit_mode'),
+    }
+    for name, (adc, key, field) in PCB_COLUMNS.items():
+        value = data.get(adc)
+        value = value.get(key) if isinstance(value, dict) else None
+        row[name] = value.get(field) if isinstance(value, dict) else None
+    for name, key in TEROS_COLUMNS.items():
+        row[name] = data.get(key)
+    return row
+
+def _allocate(size: int, value_columns: List[str]) -> Dict[str, np.ndarray]:
+    """Empty chunk arrays; value columns are views into one row-major block"""
+    chunk = {
+        'timestamp': np.full(size, np.nan),
+        'sensor': np.empty(size, dtype=object),
+        'status': np.empty(size, dtype=object),
+        'circuit_mode': np.empty(size, dtype=object),
+    }
+    block = np.full((size, len(value_columns)), np.nan)
+    for index, name in enumerate(value_columns):
+        chunk[name] = block[:, index]
+    chunk['_values'] = block
+    return chunk
+
+def _number(value) -> Optional[float]:
+    """A value as a float column entry; None (NaN) when it is not numeric"""
+    return value if isinstance(value, (int, float)) else None
+
+def _value_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    """Value columns to extract for a column selection"""
+    return VALUE_COLUMNS if columns is None else [name for name in columns if name in VALUE_COLUMNS]
+
+def _sensor_set(sensor: Sensors) -> Optional[set]:
+    """Normalize a sensor filter"""
+    if sensor is None:
+        return None
+    return {sensor} if isinstance(sensor, str) else set(sensor)
+
+def iter_lines(paths: Paths, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[bytes]:
+    """Raw lines of several NDJSON files in order
+
+    With a time window, files that have a sidecar time index are read only
+    over the byte range that can hold it; the lines still need filtering.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        lo, hi = seek_range(path, start, end)
+        with open(path, 'rb') as f:
+            f.seek(lo)
+            if hi is None:
+                yield from f
+                continue
+            position = lo
+            for line in f:
+                if position >= hi:
+                    break
+                yield line
+                position += len(line)
+
+def iter_columns(paths: Paths, sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+                 chunk_size: int = 100000, start: Optional[float] = None,
+                 end: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield chunks of at most chunk_size flattened readings as dicts of arrays
+
+    sensor keeps only the named sensor(s); columns limits which value
+    columns are extracted (all of them by default); start and end keep
+    readings with start <= timestamp < end. Blank, torn and unparseable
+    lines are skipped.
+    """
+    yield from parse_lines(iter_lines(paths, start, end), sensor, columns, chunk_size, start, end)
+
+def parse_lines(lines: Iterable[bytes], sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+                chunk_size: int = 100000, start: Optional[float] = None,
+                end: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """iter_columns() over raw NDJSON lines from any source"""
+    value_columns = _value_columns(columns)
+    sensors = _sensor_set(sensor)
+    # Cheap byte test before parsing: a line of another sensor never contains the quoted name
+    needles = None if sensors is None else [json.dumps(name).encode('utf-8') for name in sensors]
+
+    # Extraction plan in column order: (ADC, key, field) paths or TEROS keys
+    plan = [PCB_COLUMNS.get(name, TEROS_COLUMNS.get(name)) for name in value_columns]
+
+    def extract(data) -> List[Any]:
+        row = []
+        for path in plan:
+            try:
+                if isinstance(path, str):
+                    row.append(data.get(path))
+                else:
+                    adc, key, field = path
+                    row.append(data[adc][key][field])
+            except (KeyError, TypeError):
+                row.append(None)
+        return row
+
+    chunk = _allocate(chunk_size, value_columns)
+    n = 0
+
+    for line in lines:
+        if needles is not None and not any(needle in line for needle in needles):
+            continue
+        try:
+            record = _loads(line)
+            name = record['sensor_name']
+            timestamp = float(record['timestamp'])
+        except (ValueError, TypeError, KeyError):
+            continue
+        if sensors is not None and name not in sensors:
+            continue
+        if (start is not None and timestamp < start) or (end is not None and timestamp >= end):
+            continue
+
+        chunk['timestamp'][n] = timestamp
+        chunk['sensor'][n] = name
+        chunk['status'][n] = record.get('status')
+        chunk['circuit_mode'][n] = record.get('circuit_mode')
+
+        data = record.get('data')
+        if plan and isinstance(data, dict):
+            row = extract(data)
+            try:
+                chunk['_values'][n] = row
+            except (ValueError, TypeError):
+                chunk['_values'][n] = [_number(value) for value in row]
+
+        n += 1
+        if n == chunk_size:
+            yield _finish(chunk, n)
+            chunk = _allocate(chunk_size, value_columns)
+            n = 0
+
+    if n:
+        yield _finish(chunk, n)
+
+def _finish(chunk: Dict[str, np.ndarray], n: int) -> Dict[str, np.ndarray]:
+    """Trim a chunk to its first n rows as contiguous column arrays"""
+    del chunk['_values']
+    return {name: np.ascontiguousarray(array[:n]) for name, array in chunk.items()}
+
+def iter_frames(paths: Paths, sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+                chunk_size: int = 100000, start: Optional[float] = None, end: Optional[float] = None):
+    """iter_columns() as pandas DataFrame chunks"""
+    import pandas as pd
+    for chunk in iter_columns(paths, sensor, columns, chunk_size, start, end):
+        yield pd.DataFrame(chunk)
+
+def load_frame(paths: Paths, sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+               chunk_size: int = 100000, start: Optional[float] = None, end: Optional[float] = None,
+               cache_dir: Optional[str] = None):
+    """Load logs into a single DataFrame with META_COLUMNS followed by the value columns
+
+    With cache_dir, parsed logs are kept in a ParseCache there and only data
+    appended since the previous run is parsed.
+    """
+    import pandas as pd
+    if cache_dir is not None:
+        from .parse_cache import ParseCache
+        return pd.DataFrame(ParseCache(cache_dir, chunk_size).load(paths, sensor, columns, start, end))
+    frames = list(iter_frames(paths, sensor, columns, chunk_size, start, end))
+    if not frames:
+        return pd.DataFrame(_finish(_allocate(0, _value_columns(columns)), 0))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+def load_by_sensor(paths: Paths, sensors: Sequence[str], columns: Optional[Dict[str, Sequence[str]]] = None,
+                   chunk_size: int = 100000, start: Optional[float] = None, end: Optional[float] = None,
+                   cache_dir: Optional[str] = None):
+    """Load several sensors in one pass, returning a DataFrame per sensor
+
+    columns maps a sensor to the columns wanted for it, e.g.
+    {'pcb_main': ['timestamp', 'v0'], 'teros_main': ['timestamp', 'vwc']};
+    sensors without an entry get every column.
+    """
+    columns = columns or {}
+    wanted = None
+    if all(name in columns for name in sensors):
+        wanted = sorted({column for name in sensors for column in columns[name]})
+    frame = load_frame(paths, list(sensors), wanted, chunk_size, start, end, cache_dir)
+
+    result = {}
+    for name in sensors:
+        subset = frame[frame['sensor'] == name]
+        if name in columns:
+            subset = subset[list(columns[name])]
+        result[name] = subset.reset_index(drop=True)
+    return result
@@ -0,0 +1,217 @@
+"""Partitioned Parquet export and reader for logged sensor data.
+
+NDJSON logs are streamed through the chunked loader into a hive-partitioned
+dataset laid out as root/board=<board>/sensor=<sensor>/day=<YYYY-MM-DD>/.
+Exports through a ParseCache are incremental: how far each log has been
+exported is kept in root/_exported.json, which dataset reads skip.
+Rows have the loader's flat, typed columns: PCB channels as v0..v3 and
+i0..i3 in the same order as the analysis scripts, and TEROS readings as vwc,
+temp and ec. Columns a sensor does not produce are null.
+
+Requires pyarrow; pandas is needed for read_parquet.
+"""
+
+import json
+import os
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from .ndjson_loader import VALUE_COLUMNS, iter_columns
+from .parse_cache import ParseCache
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # Only needed for Parquet export and reads
+    pa = None
+    ds = None
+
+PARTITION_COLUMNS = ['board', 'sensor', 'day']
+EXPORT_STATE = "_exported.json"  # The leading underscore keeps it out of dataset discovery
+DAY_SECONDS = 86400
+
+EXCEL_MAX_ROWS = 1048575  # Sheet limit less the header row
+
+def _require_pyarrow():
+    """Raise a clear error when pyarrow is missing"""
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet export; install km-mfc[analysis]")
+
+def parquet_schema() -> 'pa.Schema':
+    """Schema of the exported dataset, partition columns included"""
+    _require_pyarrow()
+    return pa.schema(
+        [('timestamp', pa.float64()), ('status', pa.string()), ('circuit_mode', pa.string())]
+        + [(name, pa.float64()) for name in VALUE_COLUMNS]
+        + [(name, pa.string()) for name in PARTITION_COLUMNS]
+    )
+
+def _partitioning() -> 'ds.Partitioning':
+    """Hive partitioning on board, sensor and day, all as strings"""
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+
+def day_partition(timestamps: np.ndarray) -> np.ndarray:
+    """UTC calendar day (YYYY-MM-DD) of epoch-second timestamps"""
+    micros = (np.asarray(timestamps, dtype=np.float64) * 1e6).astype('datetime64[us]')
+    return micros.astype('datetime64[D]').astype(str)
+
+def _day_start(day: str) -> float:
+    """Epoch seconds at the start of a UTC day partition"""
+    return float(np.datetime64(day, 's').astype(np.int64))
+
+def _cached_chunks(cache: ParseCache, paths: Sequence[str], chunk_size: int,
+                   partitions: Optional[Set[Tuple[str, str]]] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """Cached columns of the logs in chunks, only rows in the given (sensor, day) partitions if any"""
+    start = end = None
+    if partitions is not None:
+        days = sorted(day for _, day in partitions)
+        start, end = _day_start(days[0]), _day_start(days[-1]) + DAY_SECONDS
+    for path in paths:
+        for columns in cache.iter_parts(path, start, end):
+            if partitions is not None:
+                days = day_partition(columns['timestamp'])
+                mask = np.zeros(len(days), dtype=bool)
+                for sensor, day in partitions:
+                    mask |= (columns['sensor'] == sensor) & (days == day)
+                columns = {name: array[mask] for name, array in columns.items()}
+            for offset in range(0, len(columns['timestamp']), chunk_size):
+                yield {name: array[offset:offset + chunk_size] for name, array in columns.items()}
+
+def _batches(chunks: Iterable[Dict[str, np.ndarray]], board: str) -> Iterator['pa.RecordBatch']:
+    """Turn parsed chunks into record batches of the export schema"""
+    schema = parquet_schema()
+    for chunk in chunks:
+        size = len(chunk['timestamp'])
+        chunk['board'] = np.full(size, board, dtype=object)
+        chunk['day'] = day_partition(chunk['timestamp']).astype(object)
+        # from_pandas maps NaN to null
+        arrays = [pa.array(chunk[field.name], type=field.type, from_pandas=True) for field in schema]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _write(root: str, batches: Iterator['pa.RecordBatch'], overwrite: bool) -> int:
+    """Write record batches into the dataset, returning the number of rows"""
+    rows = 0
+
+    def counted() -> Iterator['pa.RecordBatch']:
+        nonlocal rows
+        for batch in batches:
+            rows += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        counted(), root, schema=parquet_schema(), format='parquet', partitioning=_partitioning(),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='delete_matching' if overwrite else 'overwrite_or_ignore'
+    )
+    return rows
+
+def _read_state(root: str) -> dict:
+    """Export marks of the logs exported to root, keyed by board and log path"""
+    try:
+        with open(os.path.join(root, EXPORT_STATE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_state(root: str, state: dict):
+    """Replace the export marks atomically"""
+    os.makedirs(root, exist_ok=True)
+    target = os.path.join(root, EXPORT_STATE)
+    with open(target + ".tmp", 'w') as f:
+        json.dump(state, f)
+    os.replace(target + ".tmp", target)
+
+def export_parquet(paths: Union[str, Sequence[str]], root: str, board: str, chunk_size: int = 100000,
+                   overwrite: bool = True, cache_dir: Optional[str] = None) -> int:
+    """Stream NDJSON logs for one board into the partitioned dataset under root
+
+    With overwrite, partitions this export writes to are replaced, so
+    re-exporting a log is idempotent; otherwise new files are added next to
+    existing ones. With cache_dir, logs are parsed through a ParseCache and,
+    with overwrite, a re-export only rewrites the sensor/day partitions that
+    rows appended since the previous export fall in, filled from the cache.
+    A first export, or one after a log changed other than by growing, writes
+    everything. Returns the number of rows written.
+    """
+    _require_pyarrow()
+    if isinstance(paths, str):
+        paths = [paths]
+    if cache_dir is None:
+        return _write(root, _batches(iter_columns(paths, chunk_size=chunk_size), board), overwrite)
+    cache = ParseCache(cache_dir, chunk_size)
+    if not overwrite:
+        return _write(root, _batches(_cached_chunks(cache, paths, chunk_size), board), overwrite)
+
+    state = _read_state(root)
+    marks = {}
+    partitions: Set[Tuple[str, str]] = set()
+    complete = False
+    for path in paths:
+        key = f"{board}:{os.path.abspath(path)}"
+        appended, marks[key] = cache.appended(path, state.get(key))
+        if appended is None:
+            complete = True
+        else:
+            partitions.update(zip(appended['sensor'], day_partition(appended['timestamp'])))
+
+    # Rows without a usable timestamp have no day to narrow the rewrite to
+    if complete or any(day == 'NaT' for _, day in partitions):
+        rows = _write(root, _batches(_cached_chunks(cache, paths, chunk_size), board), overwrite)
+    elif partitions:
+        rows = _write(root, _batches(_cached_chunks(cache, paths, chunk_size, partitions), board), overwrite)
+    else:
+        rows = 0
+    state.update(marks)
+    _save_state(root, state)
+    return rows
+
+def _match(name: str, value: Union[str, Sequence[str]]) -> 'ds.Expression':
+    """Equality or membership filter on a partition column"""
+    if isinstance(value, str):
+        return ds.field(name) == value
+    return ds.field(name).isin(list(value))
+
+def read_table(root: str, columns: Optional[Sequence[str]] = None, start: Optional[float] = None,
+               end: Optional[float] = None, board: Union[str, Sequence[str], None] = None,
+               sensor: Union[str, Sequence[str], None] = None) -> 'pa.Table':
+    """Read rows with start <= timestamp < end, projecting only the requested columns
+
+    Board, sensor and the day implied by the time range prune whole
+    partitions; the timestamp bound is pushed down to Parquet row groups.
+    Rows come back sorted by timestamp when it is among the columns.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+
+    conditions = []
+    if board is not None:
+        conditions.append(_match('board', board))
+    if sensor is not None:
+        conditions.append(_match('sensor', sensor))
+    if start is not None:
+        conditions.append(ds.field('timestamp') >= start)
+        conditions.append(ds.field('day') >= str(day_partition([start])[0]))
+    if end is not None:
+        conditions.append(ds.field('timestamp') < end)
+        conditions.append(ds.field('day') <= str(day_partition([end])[0]))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    table = dataset.to_table(columns=list(columns) if columns is not None else None, filter=expression)
+    if 'timestamp' in table.column_names:
+        table = table.sort_by('timestamp')
+    return table
+
+def read_parquet(root: str, columns: Optional[Sequence[str]] = None, start: Optional[float] = None,
+                 end: Optional[float] = None, board: Union[str, Sequence[str], None] = None,
+                 sensor: Union[str, Sequence[str], None] = None):
+    """read_table() as a pandas DataFrame"""
+    return read_table(root, columns, start, end, board, sensor).to_pandas()
+
+def export_excel(frame, path: str, max_rows: int = EXCEL_MAX_ROWS):
+    """Write a filtered DataFrame to .xlsx, refusing frames larger than a sheet"""
+    if len(frame) > max_rows:
+        raise ValueError(f"{len(frame)} rows exceed the Excel limit of {max_rows}; filter the data first")
+    frame.to_excel(path, index=False)
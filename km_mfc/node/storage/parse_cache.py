@@ -0,0 +1,286 @@
+"""On-disk cache of parsed NDJSON logs for repeated analysis runs.
+
+Each log gets a directory under the cache root holding a manifest and one
+.npz part per parsed span of the log. The manifest records how many bytes
+of the log have been parsed together with the log's size, mtime and hashes
+of its first bytes and of the bytes just before the parsed boundary. Logs
+are only ever appended to, so when a log has grown and both hashes still
+match, only the new tail is parsed and stored as another part; any other
+change discards the entry and the log is parsed again from the start.
+
+Parts hold every column for every sensor; text columns are stored as
+integer codes plus a category table so no pickling is involved. The
+manifest keeps each part's row count and timestamp range, so a time window
+only loads the parts it overlaps. Beyond MAX_PARTS, runs of adjacent parts
+are merged into parts of at most PART_ROWS rows, which keeps them confined
+to a stretch of time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .ndjson_loader import (
+    META_COLUMNS, Paths, Sensors, _allocate, _finish, _sensor_set, _value_columns, parse_lines
+)
+
+CACHE_VERSION = 2
+HASH_BYTES = 4096
+MAX_PARTS = 32  # Adjacent parts are merged beyond this
+PART_ROWS = 1000000  # Merging stops growing a part at this many rows
+
+_CATEGORIES = "{}__categories"
+_TEXT_COLUMNS = ['sensor', 'status', 'circuit_mode']
+
+def _hash(path: str, offset: int, length: int) -> str:
+    """SHA-1 of length bytes of a file starting at offset"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+def _boundary_hash(path: str, parsed: int) -> str:
+    """Hash of the bytes just before the parsed boundary"""
+    length = min(HASH_BYTES, parsed)
+    return _hash(path, parsed - length, length)
+
+def _complete_end(path: str, offset: int, size: int) -> int:
+    """End of the last complete line between offset and size"""
+    with open(path, 'rb') as f:
+        pos = size
+        while pos > offset:
+            step = min(65536, pos - offset)
+            pos -= step
+            f.seek(pos)
+            index = f.read(step).rfind(b'\n')
+            if index >= 0:
+                return pos + index + 1
+    return offset
+
+def _read_range(path: str, lo: int, hi: int) -> Iterator[bytes]:
+    """Lines of a file between two line boundaries"""
+    with open(path, 'rb') as f:
+        f.seek(lo)
+        position = lo
+        for line in f:
+            if position >= hi:
+                break
+            yield line
+            position += len(line)
+
+def _overlaps(part: dict, start: Optional[float], end: Optional[float]) -> bool:
+    """Whether a part may hold rows with start <= timestamp < end"""
+    if start is None and end is None:
+        return True
+    if part['start'] is None:
+        return False
+    return (start is None or part['end'] >= start) and (end is None or part['start'] < end)
+
+def _encode_text(array: np.ndarray):
+    """Object column as (int32 codes, str categories), -1 for None"""
+    lookup: Dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if value is None else lookup.setdefault(str(value), len(lookup)) for value in array),
+        dtype=np.int32, count=len(array)
+    )
+    return codes, np.array(list(lookup), dtype=str)
+
+def _decode_text(codes: np.ndarray, categories: np.ndarray) -> np.ndarray:
+    """Inverse of _encode_text"""
+    array = np.empty(len(codes), dtype=object)
+    mask = codes >= 0
+    array[mask] = categories.astype(object)[codes[mask]]
+    return array
+
+def _concat(chunks: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Join column chunks, or an empty chunk when there are none"""
+    if not chunks:
+        return _finish(_allocate(0, _value_columns(None)), 0)
+    if len(chunks) == 1:
+        return chunks[0]
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+def select(chunk: Dict[str, np.ndarray], sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+           start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Apply iter_columns()'s sensor, column and time filters to parsed columns"""
+    mask = np.ones(len(chunk['timestamp']), dtype=bool)
+    sensors = _sensor_set(sensor)
+    if sensors is not None:
+        mask &= np.isin(chunk['sensor'], list(sensors))
+    if start is not None:
+        mask &= chunk['timestamp'] >= start
+    if end is not None:
+        mask &= chunk['timestamp'] < end
+    names = META_COLUMNS + _value_columns(columns)
+    if mask.all():
+        return {name: chunk[name] for name in names}
+    return {name: chunk[name][mask] for name in names}
+
+class ParseCache:
+    """Parsed columns of NDJSON logs cached under root, updated incrementally"""
+
+    def __init__(self, root: str = ".km_cache", chunk_size: int = 100000):
+        self.root = root
+        self.chunk_size = chunk_size
+
+    def entry_dir(self, path: str) -> str:
+        """Cache directory for a log"""
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, f"{os.path.basename(path)}-{key}")
+
+    def _manifest(self, directory: str) -> Optional[dict]:
+        """An entry's manifest, or None if it is missing or from another version"""
+        try:
+            with open(os.path.join(directory, "manifest.json"), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == CACHE_VERSION else None
+
+    def _save_manifest(self, directory: str, manifest: dict):
+        """Replace an entry's manifest atomically"""
+        target = os.path.join(directory, "manifest.json")
+        with open(target + ".tmp", 'w') as f:
+            json.dump(manifest, f)
+        os.replace(target + ".tmp", target)
+
+    def _save_part(self, directory: str, manifest: dict, chunk: Dict[str, np.ndarray]) -> dict:
+        """Write one part file under a fresh name and return its manifest record"""
+        name = f"part-{manifest['next_part']:05d}.npz"
+        manifest['next_part'] += 1
+        timestamps = chunk['timestamp'][np.isfinite(chunk['timestamp'])]
+        arrays = {}
+        for column, array in chunk.items():
+            if column in _TEXT_COLUMNS:
+                arrays[column], arrays[_CATEGORIES.format(column)] = _encode_text(array)
+            else:
+                arrays[column] = array
+        with open(os.path.join(directory, name), 'wb') as f:
+            np.savez(f, **arrays)
+        return {
+            'name': name, 'rows': len(chunk['timestamp']),
+            'start': float(timestamps.min()) if len(timestamps) else None,
+            'end': float(timestamps.max()) if len(timestamps) else None,
+        }
+
+    def _load_part(self, directory: str, name: str) -> Dict[str, np.ndarray]:
+        """Read one part file"""
+        with np.load(os.path.join(directory, name)) as data:
+            chunk = {}
+            for column in META_COLUMNS + _value_columns(None):
+                if column in _TEXT_COLUMNS:
+                    chunk[column] = _decode_text(data[column], data[_CATEGORIES.format(column)])
+                else:
+                    chunk[column] = data[column]
+            return chunk
+
+    def _parse(self, path: str, lo: int, hi: int) -> Dict[str, np.ndarray]:
+        """Parse every column of a byte range of a log"""
+        return _concat(list(parse_lines(_read_range(path, lo, hi), chunk_size=self.chunk_size)))
+
+    def update(self, path: str) -> dict:
+        """Bring a log's entry up to date, parsing only what it does not hold yet, and return its manifest"""
+        directory = self.entry_dir(path)
+        stat = os.stat(path)
+        manifest = self._manifest(directory)
+
+        if manifest is not None and (stat.st_size, stat.st_mtime_ns) == (manifest['size'], manifest['mtime_ns']):
+            return manifest
+
+        if manifest is not None and not self._extends(path, stat.st_size, manifest):
+            manifest = None
+        if manifest is None:
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory, exist_ok=True)
+            manifest = {'version': CACHE_VERSION, 'path': os.path.abspath(path), 'parsed': 0, 'parts': [],
+                        'next_part': 0}
+
+        obsolete = []
+        parsed = manifest['parsed']
+        end = _complete_end(path, parsed, stat.st_size)  # Leave a line still being written for next time
+        if end > parsed:
+            manifest['parts'].append(self._save_part(directory, manifest, self._parse(path, parsed, end)))
+            if len(manifest['parts']) > MAX_PARTS:
+                manifest['parts'], obsolete = self._merge(directory, manifest)
+            parsed = end
+
+        manifest.update(
+            parsed=parsed, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+            head=_hash(path, 0, min(HASH_BYTES, parsed)), boundary=_boundary_hash(path, parsed)
+        )
+        self._save_manifest(directory, manifest)
+        for name in obsolete:
+            os.remove(os.path.join(directory, name))
+        return manifest
+
+    def _merge(self, directory: str, manifest: dict):
+        """Merge runs of adjacent parts up to PART_ROWS rows; returns the new part list and the files it replaces"""
+        groups: List[List[dict]] = [[]]
+        for part in manifest['parts']:
+            if groups[-1] and sum(member['rows'] for member in groups[-1]) + part['rows'] > PART_ROWS:
+                groups.append([])
+            groups[-1].append(part)
+
+        parts, obsolete = [], []
+        for group in groups:
+            if len(group) == 1:
+                parts.append(group[0])
+                continue
+            merged = _concat([self._load_part(directory, member['name']) for member in group])
+            parts.append(self._save_part(directory, manifest, merged))
+            obsolete += [member['name'] for member in group]
+        return parts, obsolete
+
+    def iter_parts(self, path: str, start: Optional[float] = None,
+                   end: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Parsed columns of a log part by part, skipping parts outside [start, end)
+
+        Rows of the parts that are loaded are not filtered.
+        """
+        directory = self.entry_dir(path)
+        for part in self.update(path)['parts']:
+            if _overlaps(part, start, end):
+                yield self._load_part(directory, part['name'])
+
+    def columns(self, path: str, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Parsed columns of a log's parts overlapping [start, end), parsing only what the cache does not hold yet"""
+        return _concat(list(self.iter_parts(path, start, end)))
+
+    def _extends(self, path: str, size: int, manifest: dict) -> bool:
+        """Whether the log is the cached one with only data appended"""
+        parsed = manifest['parsed']
+        if size < parsed:
+            return False
+        return (manifest['head'] == _hash(path, 0, min(HASH_BYTES, parsed))
+                and manifest['boundary'] == _boundary_hash(path, parsed))
+
+    def appended(self, path: str, mark: Optional[dict]) -> Tuple[Optional[Dict[str, np.ndarray]], dict]:
+        """Rows parsed since an earlier mark of a log, and a mark of what is parsed now
+
+        The rows come from parsing only the bytes past the mark again; they
+        are None without a mark or when the log changed other than by growing.
+        """
+        manifest = self.update(path)
+        current = {key: manifest[key] for key in ('parsed', 'head', 'boundary')}
+        if mark is None or mark['parsed'] > current['parsed'] or not self._extends(path, manifest['size'], mark):
+            return None, current
+        return self._parse(path, mark['parsed'], current['parsed']), current
+
+    def load(self, paths: Paths, sensor: Sensors = None, columns: Optional[Sequence[str]] = None,
+             start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Cached equivalent of concatenating iter_columns() over paths
+
+        Only parts overlapping [start, end) are read, one at a time.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        chunks = [
+            select(chunk, sensor, columns, start, end)
+            for path in paths for chunk in self.iter_parts(path, start, end)
+        ]
+        return _concat(chunks) if chunks else select(_concat([]), sensor, columns)
+
+    def invalidate(self, path: str):
+        """Drop a log's cache entry"""
+        shutil.rmtree(self.entry_dir(path), ignore_errors=True)
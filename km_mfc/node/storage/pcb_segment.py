@@ -0,0 +1,235 @@
+"""Fixed-schema binary segment format for PCB readings.
+
+A segment file is a short header followed by packed fixed-size records:
+
+    magic      8 bytes   b"KMPCBSEG"
+    version    uint16    little-endian
+    length     uint32    little-endian, total header size in bytes
+    metadata   JSON      channel mapping, scaling and record layout
+    padding    to an 8-byte boundary
+
+Each record holds the timestamp, the eight signed 24-bit ADC codes of both
+ADCs as int32, a bitmask of which channels were read, the reading status
+and the circuit mode. Records start at the header length, so a segment can
+be mapped straight into a numpy structured array with np.memmap.
+"""
+
+import glob
+import json
+import os
+import struct
+import time
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from ..config import HardwareConfig, SensorReading, ADCChannel, ChannelScaling
+from ..utils.conversions import decode_24bit, codes_to_voltage, codes_to_current
+
+SEGMENT_MAGIC = b"KMPCBSEG"
+SEGMENT_VERSION = 1
+SEGMENT_EXTENSION = ".pcbseg"
+SEGMENT_CHANNELS = 8
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('raw', '<i4', (SEGMENT_CHANNELS,)),
+    ('valid', 'u1'),  # Bit n set when raw[n] was read
+    ('status', 'u1'),  # 0 success, 1 error
+    ('circuit_mode', 'u1'),
+    ('reserved', 'u1'),
+])
+
+STATUS_CODES = {'success': 0, 'error': 1}
+CIRCUIT_MODES = {'unknown': 0, 'open': 1, 'closed': 2}
+
+_PREAMBLE = struct.Struct('<8sHI')
+
+def segment_channels(channel_map: Dict[str, int], config: HardwareConfig,
+                     profile: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Describe the record slots for a PCB channel map: ADC, result key, ADC channel and scaling"""
+    pga_gain = config.get_profile(profile).gain
+    slots = []
+    for adc_channel in ADCChannel:
+        for key, channel_num in channel_map.items():
+            scaling = config.pcb_channel_scaling.get(channel_num) or ChannelScaling()
+            slots.append({
+                'slot': len(slots),
+                'adc': adc_channel.name,
+                'key': key,
+                'channel': channel_num,
+                'kind': scaling.kind,
+                'gain': scaling.gain * pga_gain,
+                'vref': scaling.vref if scaling.vref is not None else config.mcp3564_vref,
+                'full_scale_current': scaling.full_scale_current,
+            })
+    if len(slots) > SEGMENT_CHANNELS:
+        raise ValueError(f"Channel map needs {len(slots)} slots, segment records hold {SEGMENT_CHANNELS}")
+    return slots
+
+def encode_header(metadata: Dict[str, Any]) -> bytes:
+    """Build a segment header around JSON metadata"""
+    body = json.dumps(metadata, separators=(',', ':')).encode('utf-8')
+    length = _PREAMBLE.size + len(body)
+    length += -length % 8
+    return _PREAMBLE.pack(SEGMENT_MAGIC, SEGMENT_VERSION, length) + body.ljust(length - _PREAMBLE.size, b' ')
+
+def read_header(f: BinaryIO) -> Tuple[Dict[str, Any], int]:
+    """Parse a segment header, returning the metadata and the offset of the first record"""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError("Truncated segment header")
+    magic, version, length = _PREAMBLE.unpack(preamble)
+    if magic != SEGMENT_MAGIC:
+        raise ValueError("Not a PCB segment file")
+    if version != SEGMENT_VERSION:
+        raise ValueError(f"Unsupported segment version {version}")
+    return json.loads(f.read(length - _PREAMBLE.size)), length
+
+class PCBSegmentWriter:
+    """Encodes PCB readings into records and appends them to one segment file"""
+
+    def __init__(self, path: str, slots: List[Dict[str, Any]], sensor_name: str = "",
+                 buffer_size: int = 65536):
+        self.path = path
+        self.slots = slots
+        self.created = time.time()
+        self.records = 0
+        self._index = {(slot['adc'], slot['key']): slot['slot'] for slot in slots}
+
+        metadata = {
+            'sensor_name': sensor_name,
+            'created': self.created,
+            'channels': slots,
+            'record_dtype': RECORD_DTYPE.descr,
+            'record_size': RECORD_DTYPE.itemsize,
+            'status_codes': STATUS_CODES,
+            'circuit_modes': CIRCUIT_MODES,
+        }
+        self._file = open(path, 'xb', buffering=buffer_size)
+        self._file.write(encode_header(metadata))
+
+    def encode(self, readings: List[SensorReading], modes: Optional[List[Optional[str]]] = None) -> np.ndarray:
+        """Pack readings into records; modes gives each reading's circuit mode"""
+        records = np.zeros(len(readings), dtype=RECORD_DTYPE)
+        unsigned = np.zeros((len(readings), SEGMENT_CHANNELS), dtype=np.int64)
+
+        for row, reading in enumerate(readings):
+            record = records[row]
+            record['timestamp'] = reading.timestamp
+            record['status'] = STATUS_CODES.get(reading.status, STATUS_CODES['error'])
+            if modes is not None:
+                record['circuit_mode'] = CIRCUIT_MODES.get(modes[row], CIRCUIT_MODES['unknown'])
+
+            valid = 0
+            for adc, results in reading.data.items():
+                if not isinstance(results, dict):
+                    continue
+                for key, result in results.items():
+                    slot = self._index.get((adc, key))
+                    if slot is not None and isinstance(result, dict) and 'raw_value' in result:
+                        unsigned[row, slot] = result['raw_value']
+                        valid |= 1 << slot
+            record['valid'] = valid
+
+        records['raw'] = decode_24bit(unsigned.ravel()).reshape(unsigned.shape)
+        return records
+
+    def write(self, readings: List[SensorReading], modes: Optional[List[Optional[str]]] = None):
+        """Append readings to the segment"""
+        if readings:
+            self._file.write(self.encode(readings, modes).tobytes())
+            self.records += len(readings)
+
+    def flush(self, fsync: bool = False):
+        """Flush buffered records, optionally to stable storage"""
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush and close the segment"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+class PCBSegment:
+    """A segment file mapped read-only as a structured numpy array
+
+    A torn final record from an interrupted write is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.header, offset = read_header(f)
+            size = f.seek(0, os.SEEK_END)
+
+        if self.header.get('record_size') != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Record size {self.header.get('record_size')} does not match this reader")
+        count = (size - offset) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    @property
+    def channels(self) -> List[Dict[str, Any]]:
+        """Slot descriptions from the header"""
+        return self.header['channels']
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def time_slice(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Records with start <= timestamp < end, assuming timestamps increase"""
+        timestamps = self.records['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return self.records[lo:hi]
+
+def column_name(slot: Dict[str, Any]) -> str:
+    """Column name for a slot, e.g. 'ADC0 voltage 1'"""
+    return f"{slot['adc']} {slot['key']}"
+
+def records_to_columns(records: np.ndarray, channels: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Scale records into physical columns: volts for voltage slots, mA for current slots
+
+    Channels that were not read in a record come out as NaN.
+    """
+    columns = {
+        'timestamp': np.asarray(records['timestamp']),
+        'status': np.asarray(records['status']),
+        'circuit_mode': np.asarray(records['circuit_mode']),
+    }
+    raw = records['raw']
+    valid = records['valid']
+    for slot in channels:
+        codes = raw[:, slot['slot']]
+        if slot['kind'] == 'current':
+            values = codes_to_current(codes, slot['gain'], slot['full_scale_current'])
+        else:
+            values = codes_to_voltage(codes, slot['gain'], slot['vref'])
+        values[(valid & (1 << slot['slot'])) == 0] = np.nan
+        columns[column_name(slot)] = values
+    return columns
+
+def load_segments(paths: Union[str, Iterable[str]], start: Optional[float] = None,
+                  end: Optional[float] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """Concatenate the records of several segments in time order
+
+    paths may be a glob pattern. Returns the records and the channel slots of
+    the first segment; all segments must share the same channel layout.
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+    segments = [PCBSegment(path) for path in paths]
+    if not segments:
+        return np.zeros(0, dtype=RECORD_DTYPE), []
+
+    segments.sort(key=lambda segment: segment.header.get('created', 0))
+    channels = segments[0].channels
+    for segment in segments[1:]:
+        if segment.channels != channels:
+            raise ValueError(f"Segment {segment.path} has a different channel layout")
+
+    parts = [segment.time_slice(start, end) for segment in segments]
+    return np.concatenate(parts) if len(parts) > 1 else np.array(parts[0]), channels
@@ -0,0 +1,160 @@
+"""Sidecar time index for NDJSON logs.
+
+The index for a log lives next to it as <log>.idx: a 16-byte header (magic,
+records per entry) followed by little-endian (float64 timestamp, uint64
+byte offset) entries, one for the first record of every block. It only ever
+points into the log, so a stale or missing index is safe to ignore and can
+be rebuilt from the log at any time.
+"""
+
+import os
+import re
+import struct
+from typing import Optional, Tuple
+import numpy as np
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"KMTIDX01"
+ENTRY_DTYPE = np.dtype([('timestamp', '<f8'), ('offset', '<u8')])
+
+_HEADER = struct.Struct('<8sII')  # magic, records per entry, reserved
+_TIMESTAMP = re.compile(rb'"timestamp":\s*(-?[0-9][0-9.eE+-]*)')
+
+def index_path(path: str) -> str:
+    """Sidecar index path for a log"""
+    return path + INDEX_SUFFIX
+
+def line_timestamp(line: bytes) -> Optional[float]:
+    """Timestamp of a logged record without parsing the whole line"""
+    match = _TIMESTAMP.search(line)
+    if match is None:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+def read_index(path: str) -> Optional[np.ndarray]:
+    """Entries of a log's index, or None if it has no valid index
+
+    A torn final entry is ignored.
+    """
+    try:
+        with open(index_path(path), 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or _HEADER.unpack(header)[0] != INDEX_MAGIC:
+                return None
+            data = f.read()
+    except OSError:
+        return None
+    count = len(data) // ENTRY_DTYPE.itemsize
+    return np.frombuffer(data[:count * ENTRY_DTYPE.itemsize], dtype=ENTRY_DTYPE)
+
+def _write_index(path: str, entries: np.ndarray, every: int):
+    """Replace a log's index atomically"""
+    target = index_path(path)
+    temp = target + ".tmp"
+    with open(temp, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, every, 0))
+        f.write(entries.astype(ENTRY_DTYPE).tobytes())
+    os.replace(temp, target)
+
+def build_index(path: str, every: int = 1000) -> int:
+    """Rebuild a log's index offline by scanning it; returns the number of entries"""
+    entries = []
+    offset = 0
+    count = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            timestamp = line_timestamp(line)
+            if timestamp is not None:
+                if count % every == 0:
+                    entries.append((timestamp, offset))
+                count += 1
+            offset += len(line)
+    _write_index(path, np.array(entries, dtype=ENTRY_DTYPE), every)
+    return len(entries)
+
+class TimeIndexWriter:
+    """Appends index entries for a log as records are written to it
+
+    An existing index is trimmed to entries inside the log's current size, and
+    rebuilt from the log when it is missing or unreadable. The first record
+    written after opening always starts a new entry.
+    """
+
+    def __init__(self, path: str, every: int = 1000):
+        self.path = path
+        self.every = every
+
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        entries = read_index(path)
+        if entries is None:
+            if size:
+                build_index(path, every)
+            else:
+                _write_index(path, np.zeros(0, dtype=ENTRY_DTYPE), every)
+        else:
+            valid = entries[entries['offset'] < size]
+            if len(valid) != len(entries) or os.path.getsize(index_path(path)) != (
+                    _HEADER.size + len(entries) * ENTRY_DTYPE.itemsize):
+                _write_index(path, valid, every)
+
+        self._file = open(index_path(path), 'ab')
+        self._since = every
+
+    def add(self, timestamp: float, offset: int):
+        """Note a record written at offset; every Nth one becomes an entry"""
+        if self._since >= self.every:
+            self._file.write(struct.pack('<dQ', timestamp, offset))
+            self._since = 0
+        self._since += 1
+
+    def flush(self):
+        """Write out buffered entries"""
+        self._file.flush()
+
+    def close(self):
+        """Close the index file"""
+        if not self._file.closed:
+            self._file.close()
+
+def _entry_matches(f, entry) -> bool:
+    """Whether the log line at an entry's offset carries the entry's timestamp"""
+    f.seek(int(entry['offset']))
+    return line_timestamp(f.readline()) == float(entry['timestamp'])
+
+def seek_range(path: str, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[int, Optional[int]]:
+    """Byte range [lo, hi) of a log that holds every record with start <= timestamp < end
+
+    hi is None for end of file. Without a usable index the whole log is
+    returned. Records are assumed to be in time order to within one block;
+    the range is padded by a block on each side to allow for that.
+    """
+    entries = read_index(path)
+    if entries is None or (start is None and end is None):
+        return 0, None
+    size = os.path.getsize(path)
+    entries = entries[entries['offset'] < size]
+    if not len(entries):
+        return 0, None
+
+    timestamps = np.maximum.accumulate(entries['timestamp'])
+    lo_entry = hi_entry = None
+    if start is not None:
+        i = int(np.searchsorted(timestamps, start, side='right')) - 2
+        if i > 0:
+            lo_entry = entries[i]
+    if end is not None:
+        j = int(np.searchsorted(timestamps, end, side='right')) + 1
+        if j < len(entries):
+            hi_entry = entries[j]
+
+    with open(path, 'rb') as f:
+        for entry in (lo_entry, hi_entry):
+            if entry is not None and not _entry_matches(f, entry):
+                return 0, None  # Index belongs to an older version of the log
+
+    lo = int(lo_entry['offset']) if lo_entry is not None else 0
+    hi = int(hi_entry['offset']) if hi_entry is not None else None
+    return lo, hi
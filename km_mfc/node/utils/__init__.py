@@ -1,5 +1,12 @@
 """Utilities module."""
 
-from .serial_utils import find_arduino_port, get_current_serial_device
+from .serial_utils import find_arduino_port, get_current_serial_device, SerialPortRegistry
+from .ring_buffer import RingBuffer
+from .conversions import decode_24bit, codes_to_voltage, codes_to_current
+from .downsample import minmax_indices, lttb_indices, downsample, Pyramid, plot_downsampled
 
-__all__ = ['find_arduino_port', 'get_current_serial_device']
+__all__ = [
+    'find_arduino_port', 'get_current_serial_device', 'SerialPortRegistry', 'RingBuffer',
+    'decode_24bit', 'codes_to_voltage', 'codes_to_current',
+    'minmax_indices', 'lttb_indices', 'downsample', 'Pyramid', 'plot_downsampled'
+]
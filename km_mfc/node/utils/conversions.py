@@ -0,0 +1,37 @@
+"""Vectorized conversions for blocks of 24-bit ADC samples."""
+
+from typing import Union
+import numpy as np
+
+ADC_FULL_SCALE = 8388608  # 2^23
+
+SampleBuffer = Union[bytes, bytearray, memoryview, np.ndarray]
+
+def decode_24bit(buffer: SampleBuffer) -> np.ndarray:
+    """Turn 24-bit two's complement samples into signed int32 codes
+
+    Byte buffers and uint8 arrays hold packed big-endian 3-byte samples. Other
+    integer arrays hold one code per element, either unsigned (as logged in
+    raw_value) or already signed.
+    """
+    if isinstance(buffer, np.ndarray) and buffer.dtype != np.uint8:
+        codes = buffer.astype(np.int32, copy=True)
+        codes &= 0xffffff
+    else:
+        packed = np.frombuffer(buffer, dtype=np.uint8)
+        if packed.size % 3:
+            raise ValueError(f"Buffer length {packed.size} is not a multiple of 3")
+        packed = packed.reshape(-1, 3).astype(np.int32)
+        codes = (packed[:, 0] << 16) | (packed[:, 1] << 8) | packed[:, 2]
+
+    codes ^= 0x800000
+    codes -= 0x800000
+    return codes
+
+def codes_to_voltage(codes: np.ndarray, gain=1.0, vref=3.32) -> np.ndarray:
+    """Convert signed codes to volts; gain and vref may be scalars or per-sample arrays"""
+    return vref * (np.asarray(codes, dtype=np.float64) / ADC_FULL_SCALE) / gain
+
+def codes_to_current(codes: np.ndarray, gain=1.0, full_scale_current=1.0) -> np.ndarray:
+    """Convert signed codes to mA scaled to the full-scale current"""
+    return (np.asarray(codes, dtype=np.float64) / ADC_FULL_SCALE) * full_scale_current * 1000 / gain
@@ -0,0 +1,166 @@
+"""Downsampling of long time series for plotting.
+
+minmax_indices keeps the lowest and highest point of every bucket, so peaks
+and switch edges survive at any resolution; lttb_indices picks the points
+that best preserve the visual shape (Largest-Triangle-Three-Buckets).
+Pyramid precomputes min/max levels of a series so any x-range can be cut
+down to display resolution without touching every raw point, and
+plot_downsampled wires one into a matplotlib axis.
+
+x may be numeric or datetime64 and must be sorted for Pyramid; NaN values
+in y are treated as gaps.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+def _numeric(x) -> np.ndarray:
+    """x as float64 relative to its first value, so datetimes keep their precision"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    if not len(x):
+        return x.astype(np.float64)
+    return (x - x[0]).astype(np.float64)
+
+def _bucket_extremes(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise positions of the min and max of a 2D block, ignoring NaN"""
+    nan = np.isnan(block)
+    low = np.where(nan, np.inf, block).argmin(axis=1)
+    high = np.where(nan, -np.inf, block).argmax(axis=1)
+    return low, high
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """Sorted indices of at most about n_out points: each bucket's min and max
+
+    The first and last points are always kept.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    buckets = n_out // 2
+    if buckets < 1 or n <= n_out:
+        return np.arange(n)
+
+    size = n // buckets
+    low, high = _bucket_extremes(y[:buckets * size].reshape(buckets, size))
+    base = np.arange(buckets) * size
+    # Each bucket's pair in x order keeps the whole result sorted
+    pairs = np.column_stack([base + np.minimum(low, high), base + np.maximum(low, high)]).ravel()
+    parts = [[0], pairs]
+
+    if buckets * size < n:
+        low, high = _bucket_extremes(y[buckets * size:].reshape(1, -1))
+        parts.append(buckets * size + np.sort(np.concatenate([low, high])))
+
+    indices = np.concatenate(parts + [[n - 1]]).astype(np.int64)
+    return indices[np.concatenate([[True], np.diff(indices) > 0])]
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Indices of n_out points chosen by Largest-Triangle-Three-Buckets
+
+    Points where y is NaN are never selected.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.flatnonzero(~np.isnan(y))
+    if n_out < 3 or len(keep) <= n_out:
+        return keep
+    xs = _numeric(x)[keep]
+    ys = y[keep]
+    n = len(keep)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = xs[stop:edges[i + 2]].mean()
+            next_y = ys[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = xs[n - 1], ys[n - 1]
+        area = np.abs((xs[a] - next_x) * (ys[start:stop] - ys[a])
+                      - (xs[a] - xs[start:stop]) * (next_y - ys[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return keep[selected]
+
+def downsample(x, y, n_out: int = 2000, method: str = 'minmax') -> Tuple[np.ndarray, np.ndarray]:
+    """A series reduced to about n_out points by 'minmax' or 'lttb'"""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    elif method == 'lttb':
+        indices = lttb_indices(x, y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[indices], y[indices]
+
+class Pyramid:
+    """Precomputed min/max levels of a sorted series for fast zooming
+
+    Level 0 is the raw series; each further level keeps the min and max of
+    every factor points of the one below, until a level has at most
+    min_points points. Extra memory is about a third of the raw series
+    for the default factor.
+    """
+
+    def __init__(self, x, y, factor: int = 8, min_points: int = 4096):
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) != len(y):
+            raise ValueError(f"x and y lengths differ: {len(x)} != {len(y)}")
+        self.factor = factor
+        self.levels = [(x, y)]
+        while len(self.levels[-1][0]) > max(min_points, factor):
+            level_x, level_y = self.levels[-1]
+            indices = minmax_indices(level_y, 2 * (len(level_y) // factor))
+            self.levels.append((level_x[indices], level_y[indices]))
+
+    @property
+    def x(self) -> np.ndarray:
+        """Raw x values"""
+        return self.levels[0][0]
+
+    def view(self, start=None, end=None, n_out: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+        """About n_out points covering start <= x <= end (the whole series by default)
+
+        Uses the coarsest level that still has at least n_out points in the
+        range, plus one point either side so lines run to the axis edges.
+        """
+        for level_x, level_y in reversed(self.levels):
+            lo = 0 if start is None else max(int(np.searchsorted(level_x, start, 'left')) - 1, 0)
+            hi = len(level_x) if end is None else min(int(np.searchsorted(level_x, end, 'right')) + 1, len(level_x))
+            if hi - lo >= n_out:
+                break
+        indices = minmax_indices(level_y[lo:hi], n_out)
+        return level_x[lo:hi][indices], level_y[lo:hi][indices]
+
+def _axis_limit(value: float, dtype: np.dtype):
+    """A matplotlib axis limit in the units of the series' x values"""
+    if np.issubdtype(dtype, np.datetime64):
+        from matplotlib.dates import num2date
+        return np.datetime64(num2date(value).replace(tzinfo=None), 'ns')
+    return value
+
+def plot_downsampled(ax, x, y, n_out: int = 2000, pyramid: Optional[Pyramid] = None, **kwargs):
+    """Plot a series on a matplotlib axis at display resolution
+
+    The line is redrawn from a Pyramid whenever the x-range changes, so
+    zooming in shows full detail without ever plotting every raw point.
+    Remaining keyword arguments go to ax.plot. Returns the line.
+    """
+    if pyramid is None:
+        pyramid = Pyramid(x, y)
+    line, = ax.plot(*pyramid.view(n_out=n_out), **kwargs)
+    dtype = pyramid.x.dtype
+
+    def update(axes):
+        start, end = (_axis_limit(value, dtype) for value in axes.get_xlim())
+        line.set_data(*pyramid.view(start, end, n_out))
+
+    ax.callbacks.connect('xlim_changed', update)
+    return line
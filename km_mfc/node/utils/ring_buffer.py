@@ -0,0 +1,84 @@
+"""Preallocated ring buffer for sample streams."""
+
+import threading
+import time
+from typing import Optional
+import numpy as np
+
+class RingBuffer:
+    """Fixed-capacity ring of structured records shared by one producer and its consumers
+
+    Storage is a single preallocated NumPy structured array. When the producer
+    laps the consumer the oldest records are overwritten and counted in overruns.
+    """
+
+    def __init__(self, capacity: int, dtype):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._written = 0  # Total records appended
+        self._read = 0  # Total records consumed
+        self._cond = threading.Condition()
+        self.overruns = 0
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._written - self._read
+
+    @property
+    def total_written(self) -> int:
+        """Number of records appended since creation"""
+        return self._written
+
+    def append(self, record: tuple):
+        """Store one record, overwriting the oldest when full"""
+        with self._cond:
+            self._data[self._written % self.capacity] = record
+            self._written += 1
+            if self._written - self._read > self.capacity:
+                self.overruns += self._written - self._read - self.capacity
+                self._read = self._written - self.capacity
+            self._cond.notify_all()
+
+    def _slice(self, start: int, count: int) -> np.ndarray:
+        """Copy count records beginning at absolute index start"""
+        first = start % self.capacity
+        end = first + count
+        if end <= self.capacity:
+            return self._data[first:end].copy()
+        return np.concatenate((self._data[first:], self._data[:end - self.capacity]))
+
+    def read_block(self, n: int, timeout: Optional[float] = None) -> np.ndarray:
+        """Consume the next n records, blocking until they arrive
+
+        Returns fewer than n records if the timeout expires first.
+        """
+        n = min(n, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._written - self._read < n:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(n, self._written - self._read)
+            block = self._slice(self._read, count)
+            self._read += count
+            return block
+
+    def drain(self) -> np.ndarray:
+        """Consume every record currently buffered without blocking"""
+        with self._cond:
+            block = self._slice(self._read, self._written - self._read)
+            self._read = self._written
+            return block
+
+    def latest(self, n: int = 1) -> np.ndarray:
+        """Copy the newest n records without consuming them"""
+        with self._cond:
+            count = min(n, self._written, self.capacity)
+            return self._slice(self._written - count, count)
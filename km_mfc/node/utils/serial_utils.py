@@ -1,18 +1,107 @@
 """Serial port utilities."""
 
+import os
+import threading
+import time
 import serial.tools.list_ports
-from typing import Optional
+from typing import Optional, Sequence, Tuple
+
+def _is_arduino_like(port) -> bool:
+    """Description heuristic used when no USB identity is configured"""
+    return 'Arduino' in port.description or 'USB' in port.description or 'ACM' in port.description
 
 def find_arduino_port() -> Optional[str]:
     """Find Arduino port automatically"""
     ports = serial.tools.list_ports.comports()
     
     for port in ports:
-        if 'Arduino' in port.description or 'USB' in port.description or 'ACM' in port.description:
+        if _is_arduino_like(port):
             return port.device
     
     return None
 
+class SerialPortRegistry:
+    """Cached serial port discovery that rescans only after a hotplug
+
+    Ports are matched by USB vid, pid and serial_number where given, falling
+    back to find_arduino_port()'s description heuristic when none is. The
+    port list is rescanned only when the mtime of a watched directory changes
+    (udev adds and removes links in /dev/serial/by-id on every plug and
+    unplug), after invalidate(), or every refresh_interval seconds on
+    systems where no watched directory exists.
+    """
+
+    WATCH_PATHS = ("/dev/serial/by-id",)
+
+    def __init__(self, vid: Optional[int] = None, pid: Optional[int] = None, serial_number: Optional[str] = None,
+                 watch_paths: Sequence[str] = WATCH_PATHS, refresh_interval: float = 5.0):
+        self.vid = vid
+        self.pid = pid
+        self.serial_number = serial_number
+        self.watch_paths = tuple(watch_paths)
+        self.refresh_interval = refresh_interval
+        self.scans = 0
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self._scanned_at: Optional[float] = None
+        self._port: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config) -> 'SerialPortRegistry':
+        """Registry matching the USB identity in a HardwareConfig"""
+        return cls(config.serial_vid, config.serial_pid, config.serial_number)
+
+    def _hotplug_signature(self) -> Tuple:
+        """mtimes of the watched directories, None for missing ones"""
+        signature = []
+        for path in self.watch_paths:
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def matches(self, port) -> bool:
+        """Whether a list_ports entry is the wanted device"""
+        if self.vid is None and self.pid is None and self.serial_number is None:
+            return _is_arduino_like(port)
+        return ((self.vid is None or port.vid == self.vid)
+                and (self.pid is None or port.pid == self.pid)
+                and (self.serial_number is None or port.serial_number == self.serial_number))
+
+    def _scan(self) -> Optional[str]:
+        """Search the current port list"""
+        self.scans += 1
+        for port in serial.tools.list_ports.comports():
+            if self.matches(port):
+                return port.device
+        return None
+
+    def find(self) -> Optional[str]:
+        """Current port of the device, None if it is not plugged in"""
+        with self._lock:
+            signature = self._hotplug_signature()
+            watched = any(value is not None for value in signature)
+            stale = (
+                self._scanned_at is None
+                or signature != self._signature
+                or (not watched and time.monotonic() - self._scanned_at >= self.refresh_interval)
+            )
+            if stale:
+                self._port = self._scan()
+                self._signature = signature
+                self._scanned_at = time.monotonic()
+            return self._port
+
+    __call__ = find
+
+    def invalidate(self):
+        """Force a rescan on the next find()"""
+        with self._lock:
+            self._scanned_at = None
+
+_default_registry = SerialPortRegistry()
+
 def get_current_serial_device() -> Optional[str]:
-    """Get current serial device - placeholder implementation"""
-    return find_arduino_port()
+    """Current Arduino port, rescanned only after a hotplug"""
+    return _default_registry.find()
@@ -1,34 +1,13 @@
 """Advanced usage example with data processing."""
 
 import logging
-import queue
 import time
-import json
 from node.config import HardwareConfig, DigitalPotChannel
 from node.sensors import PCBSensor, TerosArduinoSensor
-from node.adapters import LoggingAdapter, QueueAdapter
+from node.adapters import LoggingAdapter, FileStorageAdapter
 from node.management import SensorManager
 from node.utils import get_current_serial_device
 
-def data_processor(data_queue: queue.Queue):
-    """Process sensor data from queue"""
-    while True:
-        try:
-            reading = data_queue.get(timeout=1.0)
-            
-            # Process the reading (e.g., save to database, send to cloud, etc.)
-            print(f"Processing: {reading.sensor_name} at {reading.timestamp}")
-            
-            # Example processing - save to file
-            with open(f"sensor_data_{reading.sensor_name}.json", "a") as f:
-                json.dump(reading.to_dict(), f)
-                f.write('\n')
-                
-        except queue.Empty:
-            continue
-        except Exception as e:
-            print(f"Data processing error: {e}")
-
 def main():
     # Configure logging
     logging.basicConfig(
@@ -39,12 +18,9 @@ def main():
     # Create configuration
     config = HardwareConfig()
     
-    # Create data queue
-    data_queue = queue.Queue(maxsize=1000)
-    
     # Create adapters
     logger_adapter = LoggingAdapter()
-    queue_adapter = QueueAdapter(data_queue)
+    storage_adapter = FileStorageAdapter(directory=".", filename="sensor_data_{sensor_name}.json")
     
     # Create sensors
     pcb_sensor = PCBSensor("pcb_main", config)
@@ -54,16 +30,10 @@ def main():
     manager = SensorManager()
     
     # Add sensors with multiple adapters
-    manager.add_sensor(pcb_sensor, interval=0.5, adapters=[logger_adapter, queue_adapter])
+    manager.add_sensor(pcb_sensor, interval=0.5, adapters=[logger_adapter, storage_adapter])
     manager.add_sensor(arduino_sensor, interval=1.0, adapters=[logger_adapter])
     
     try:
-        # Start data processor in separate thread
-        from threading import Thread
-        processor_thread = Thread(target=data_processor, args=(data_queue,))
-        processor_thread.daemon = True
-        processor_thread.start()
-        
         # Start all sensors
         manager.start_all()
 
@@ -26,7 +26,7 @@
 
 #include <SDI12.h>
 
-#define SERIAL_BAUD 9600 /*!< The baud rate for the output serial port */
+#define SERIAL_BAUD 9600 /*!< The baud rate for the output serial port at power-on; B<baud> changes it */
 #define DATA_PIN 8         /*!< The pin of the SDI-12 data bus */
 #define POWER_PIN -1       /*!< The sensor power pin (or -1 if not switching power) */
 #define WAKE_DELAY 0       /*!< Extra time needed for the sensor to wake (0-100ms) */
@@ -41,6 +41,37 @@ bool isActive[64] = {
 
 uint8_t numSensors = 0;
 
+// Push mode: P<ms> starts a measurement every <ms> milliseconds, each printed as
+// D<sequence>,<measurement>; X stops it. Both are acknowledged with K.
+unsigned long streamInterval = 0;  // 0 while polled with R
+unsigned long lastSample = 0;
+uint32_t sequence = 0;
+
+// Binary framing: F<n> (1..MAX_FRAME_RECORDS) sends pushed readings as frames of n
+// records and answers R with a one-record frame; F0 returns to text. A frame is
+// A5 5A, payload length, uint16 sequence of its first record, the records and a
+// CRC16-CCITT (0x1021, initial 0xFFFF) over length, sequence and records, all
+// little-endian. Must match node/drivers/serial_framing.py.
+#define MAX_FRAME_RECORDS 15
+
+struct __attribute__((packed)) TerosRecord {
+  int32_t elapsed;  // ms until the sensor signalled completion, -1 if it did not
+  float vwc;
+  float temperature;
+  float ec;
+};
+
+uint8_t frameRecords = 0;  // 0 while sending text
+TerosRecord batch[MAX_FRAME_RECORDS];
+uint8_t batchCount = 0;
+uint16_t batchSequence = 0;
+
+// While capturing, measurement results are stored here instead of printed
+bool capturing = false;
+float captured[3];
+uint8_t capturedValues = 0;
+int32_t capturedElapsed = -1;
+
 /**
  * @brief converts allowable address characters ('0'-'9', 'a'-'z', 'A'-'Z') to a
  * decimal number between 0 and 61 (inclusive) to cover the 62 possible
@@ -123,17 +154,21 @@ bool getResults(char i, int resultsExpected) {
       char c = mySDI12.peek();
       if (c == '-' || (c >= '0' && c <= '9') || c == '.') {
         float result = mySDI12.parseFloat(SKIP_NONE);
-        Serial.print(String(result, 10));
+        if (capturing) {
+          if (capturedValues < 3) captured[capturedValues++] = result;
+        } else {
+          Serial.print(String(result, 10));
+        }
         if (result != -9999) { resultsReceived++; }
       } else if (c == '+') {
         mySDI12.read();
-        Serial.print(", ");
+        if (!capturing) Serial.print(", ");
       } else {
         mySDI12.read();
       }
       delay(10);  // 1 character ~ 7.5ms
     }
-    if (resultsReceived < resultsExpected) { Serial.print(", "); }
+    if (resultsReceived < resultsExpected && !capturing) { Serial.print(", "); }
     cmd_number++;
   }
   mySDI12.clearBuffer();
@@ -177,8 +212,12 @@ bool takeMeasurement(char i, String meas_type = "") {
   while ((millis() - timerStart) < (1000UL * (wait + 1))) {
     if (mySDI12.available())  // sensor can interrupt us to let us know it is done early
     {
-      Serial.print(millis() - timerStart);
-      Serial.print(",");
+      if (capturing) {
+        capturedElapsed = millis() - timerStart;
+      } else {
+        Serial.print(millis() - timerStart);
+        Serial.print(",");
+      }
       mySDI12.clearBuffer();
       break;
     }
@@ -207,17 +246,83 @@ void setup_flexible() {
   Serial.println("U");
 }
 
-void loop() {
-  if (Serial.available() <= 0) {
-    return;
+uint16_t crc16(const uint8_t *data, size_t length, uint16_t crc) {
+  while (length--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
   }
-  String data = Serial.readStringUntil('\n');
-  if (data.length() <= 0) return;
+  return crc;
+}
+
+void sendFrame(uint16_t firstSequence, const TerosRecord *records, uint8_t count) {
+  uint8_t header[5] = {0xA5, 0x5A, (uint8_t)(count * sizeof(TerosRecord)),
+                       (uint8_t)(firstSequence & 0xFF), (uint8_t)(firstSequence >> 8)};
+  uint16_t crc = crc16(header + 2, 3, 0xFFFF);
+  crc = crc16((const uint8_t *)records, header[2], crc);
+  Serial.write(header, sizeof(header));
+  Serial.write((const uint8_t *)records, header[2]);
+  Serial.write((uint8_t)(crc & 0xFF));
+  Serial.write((uint8_t)(crc >> 8));
+}
+
+TerosRecord captureMeasurement(char addr) {
+  capturing = true;
+  capturedValues = 0;
+  capturedElapsed = -1;
+  takeMeasurement(addr);
+  capturing = false;
+
+  TerosRecord record = {capturedElapsed, NAN, NAN, NAN};
+  if (capturedValues > 0) record.vwc = captured[0];
+  if (capturedValues > 1) record.temperature = captured[1];
+  if (capturedValues > 2) record.ec = captured[2];
+  return record;
+}
+
+void acknowledge() {
+  // Frames carry no line ending, so put K on a line of its own after one
+  if (frameRecords > 0) Serial.println();
+  Serial.println("K");
+}
+
+void handleCommand(String data) {
   if (data[0] == 'S') {
     setup_flexible();
     return;
   }
+  if (data[0] == 'P') {
+    streamInterval = data.substring(1).toInt();
+    sequence = 0;
+    batchCount = 0;
+    lastSample = millis() - streamInterval;  // First sample right away
+    acknowledge();
+    return;
+  }
+  if (data[0] == 'X') {
+    streamInterval = 0;
+    batchCount = 0;
+    acknowledge();
+    return;
+  }
+  if (data[0] == 'F') {
+    frameRecords = constrain(data.substring(1).toInt(), 0, MAX_FRAME_RECORDS);
+    batchCount = 0;
+    acknowledge();
+    return;
+  }
+  if (data[0] == 'B') {
+    long baud = data.substring(1).toInt();
+    acknowledge();
+    Serial.flush();  // Acknowledge at the old rate
+    Serial.begin(baud);
+    return;
+  }
   if (data[0] != 'R') return;
+  if (frameRecords > 0) {
+    TerosRecord record = captureMeasurement(decToChar(0));
+    sendFrame((uint16_t)sequence++, &record, 1);
+    return;
+  }
   String commands[] = {"", "1", "2", "3", "4", "5", "6", "7", "8", "9"};
   for (uint8_t a = 0; a < 1; a++) {
     // measure one at a time
@@ -235,3 +340,29 @@ void loop() {
 
   // delay(500L);
 }
+
+void loop() {
+  if (Serial.available() > 0) {
+    String data = Serial.readStringUntil('\n');
+    if (data.length() > 0) handleCommand(data);
+  }
+
+  if (streamInterval > 0 && millis() - lastSample >= streamInterval) {
+    lastSample = millis();
+    if (frameRecords > 0) {
+      if (batchCount == 0) batchSequence = (uint16_t)sequence;
+      batch[batchCount++] = captureMeasurement(decToChar(0));
+      sequence++;
+      if (batchCount >= frameRecords) {
+        sendFrame(batchSequence, batch, batchCount);
+        batchCount = 0;
+      }
+    } else {
+      Serial.print('D');
+      Serial.print(sequence++);
+      Serial.print(',');
+      takeMeasurement(decToChar(0));
+      Serial.println();
+    }
+  }
+}
@@ -0,0 +1,6 @@
+"""Test configuration: the package is imported as `node`, like the scripts do."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "km_mfc"))
@@ -0,0 +1,103 @@
+"""Fake MCP3564 behind a spidev-like handle, converting SCAN channels on demand."""
+
+ADCDATA, CONFIG1, CONFIG2, CONFIG3, MUX, SCAN, TIMER, GAINCAL, LOCK = 0x00, 0x02, 0x03, 0x04, 0x06, 0x07, 0x08, 0x0a, 0x0d
+CONVERSION_START = (1 << 6) | (0b1010 << 2)
+SCAN_DIFF_BASE = 8
+
+# Register widths in bytes
+SIZES = [4, 1, 1, 1, 1, 1, 1, 3, 3, 3, 3, 3, 3, 1, 2, 2]
+
+class FakeMCP3564:
+    """Register file plus a one-shot SCAN sequencer
+
+    Register reads and writes are incremental: a transfer continues into the
+    following registers. A conversion start queues every differential channel
+    enabled in SCAN, in ascending order, or the MUX pair when SCAN is off.
+    Each ADCDATA read first reports DR_STATUS high once, then returns the
+    next queued sample, with its CH_ID when four data bytes are clocked.
+    codes maps a channel to its signed 24-bit code; channels without an entry
+    never finish. Every transfer is logged in xfers; setting fail makes the
+    next one raise.
+    """
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.registers = {address: [0] * size for address, size in enumerate(SIZES)}
+        self.xfers = []
+        self.opened = None
+        self.closed = False
+        self.fail = False
+        self._queue = []
+        self._busy = False
+
+    def open(self, bus, device):
+        self.opened = (bus, device)
+
+    def close(self):
+        self.closed = True
+
+    def writes(self, address):
+        """Values written to one register, in order, including those inside incremental writes"""
+        values = []
+        for data in self.xfers:
+            if data[0] & 0b11 == 0b10 and data[0] != CONVERSION_START:
+                values.extend(value for target, value in self._split(data) if target == address)
+        return values
+
+    def transactions(self, kind):
+        """Transfers of one kind: 0b10 writes, 0b11 reads"""
+        return [data for data in self.xfers if data[0] & 0b11 == kind and data[0] != CONVERSION_START]
+
+    def _split(self, data):
+        """Pair the payload of an incremental transfer with the registers it covers"""
+        address = (data[0] >> 2) & 0x0f
+        payload = data[1:]
+        while payload and address < len(SIZES):
+            yield address, payload[:SIZES[address]]
+            payload = payload[SIZES[address]:]
+            address += 1
+
+    def xfer(self, data):
+        if self.fail:
+            self.fail = False
+            raise OSError("transfer failed")
+        data = list(data)
+        self.xfers.append(data)
+        command = data[0]
+        address, kind = (command >> 2) & 0x0f, command & 0b11
+        if command == CONVERSION_START:
+            mask = int.from_bytes(bytes(self.registers[SCAN]), 'big')
+            self._queue = [channel for channel in range(4) if mask & (1 << (SCAN_DIFF_BASE + channel))]
+            if not mask:
+                self._queue = [self.registers[MUX][0] >> 5]
+        elif kind == 0b10:
+            for target, value in self._split(data):
+                self.registers[target] = value
+        elif kind == 0b11 and address == ADCDATA:
+            return self._read_data(len(data))
+        elif kind == 0b11:
+            contents = [byte for target in range(address, len(SIZES)) for byte in self.registers[target]]
+            return [0] + contents[:len(data) - 1]
+        return [0] * len(data)
+
+    def _read_data(self, length):
+        channel = self._queue[0] if self._queue else None
+        if channel not in self.codes or not self._busy:
+            self._busy = channel in self.codes
+            return [0x04] + [0] * (length - 1)  # DR_STATUS high: conversion running
+        self._busy = False
+        self._queue.pop(0)
+        code = self.codes[channel] & 0xffffff
+        sample = [code >> 16, (code >> 8) & 0xff, code & 0xff]
+        return [0x00] + ([(SCAN_DIFF_BASE + channel) << 4] if length == 5 else []) + sample
+
+def install(monkeypatch, module, adcs):
+    """Make module.spidev.SpiDev() hand out the given fakes in order"""
+    handles = iter(adcs)
+
+    class Factory:
+        @staticmethod
+        def SpiDev():
+            return next(handles)
+
+    monkeypatch.setattr(module, "spidev", Factory)
@@ -0,0 +1,82 @@
+"""Fake serial device on a pty, answering commands one at a time like the Arduino."""
+
+import os
+import queue
+import select
+import threading
+import time
+import tty
+
+class FakeDevice:
+    """Device end of a pty
+
+    replies maps a command line to (delay, reply): the reply is written delay
+    seconds after the command is taken up, str replies as a line and bytes as
+    they are. A reply may be a callable producing it. Commands without an
+    entry go unanswered. Commands and replies are logged with their times.
+    """
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.received = []  # (monotonic time, command)
+        self.sent = []  # (monotonic time, reply)
+        self.master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._commands = queue.Queue()
+        self._closed = threading.Event()
+        self._threads = [threading.Thread(target=self._read, daemon=True),
+                         threading.Thread(target=self._answer, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def push(self, line: str):
+        """Write a line nobody asked for"""
+        os.write(self.master, f"{line}\r\n".encode())
+
+    def _read(self):
+        buffer = b""
+        while not self._closed.is_set():
+            try:
+                ready, _, _ = select.select([self.master], [], [], 0.01)
+                data = os.read(self.master, 1024) if ready else b""
+            except OSError:
+                break
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                command = line.decode().strip()
+                self.received.append((time.monotonic(), command))
+                self._commands.put(command)
+
+    def _answer(self):
+        while not self._closed.is_set():
+            try:
+                command = self._commands.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            if command not in self.replies:
+                continue
+            delay, reply = self.replies[command]
+            if self._closed.wait(delay):
+                break
+            if callable(reply):
+                reply = reply()
+            try:
+                os.write(self.master, reply if isinstance(reply, bytes) else f"{reply}\r\n".encode())
+            except OSError:
+                break
+            self.sent.append((time.monotonic(), reply))
+
+    def hangup(self):
+        """Close the device end, as when the USB cable is pulled"""
+        if not self._closed.is_set():
+            self._closed.set()
+            # Stop using the descriptor before it can be reused by another pty
+            for thread in self._threads:
+                thread.join()
+            os.close(self.master)
+
+    def close(self):
+        self.hangup()
+        os.close(self._slave)
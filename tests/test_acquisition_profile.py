@@ -0,0 +1,53 @@
+"""MCP3564 acquisition profiles: validation, JSON round-trip and per-read overrides."""
+
+import pytest
+
+from fake_mcp3564 import CONFIG1, CONFIG2, FakeMCP3564, install
+from node.config import AcquisitionProfile, HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+
+def test_profiles_are_checked_against_the_register_tables():
+    assert AcquisitionProfile(gain=1 / 3).gain_code == 0b000
+    for settings in ({'osr': 1000}, {'prescaler': 3}, {'gain': 3}, {'conversion_mode': 'burst'}):
+        with pytest.raises(ValueError):
+            AcquisitionProfile(**settings)
+    with pytest.raises(ValueError):
+        HardwareConfig(mcp3564_profile='missing')
+
+def test_profiles_round_trip_through_json(tmp_path):
+    profiles = {'slow': AcquisitionProfile(osr=98304, prescaler=8, gain=4), 'fast': AcquisitionProfile(osr=32)}
+    config = HardwareConfig(mcp3564_profiles=profiles, mcp3564_profile='slow')
+    config.to_json(tmp_path / "hardware.json")
+
+    loaded = HardwareConfig.from_json(tmp_path / "hardware.json")
+    assert loaded.mcp3564_profiles == config.mcp3564_profiles
+    assert loaded.get_profile() == AcquisitionProfile(osr=98304, prescaler=8, gain=4)
+
+def test_timing_follows_the_profile():
+    config = HardwareConfig()
+    default = config.get_profile('default')
+    # OSR 1024 at AMCLK = MCLK/2: 512 * (2 + 2) / (4.9152 MHz / 8)
+    assert default.conversion_time(config.mcp3564_mclk) == pytest.approx(1 / 300)
+    assert default.scan_time(config.mcp3564_mclk, 4) == pytest.approx(4 / 300)
+    assert config.get_profile('fast').data_rate(config.mcp3564_mclk) == pytest.approx(19200)
+    assert config.get_profile('precise').conversion_time(config.mcp3564_mclk) > default.conversion_time(config.mcp3564_mclk)
+
+def test_override_reprograms_config1_only_on_change(monkeypatch):
+    adc = FakeMCP3564({0: 1})
+    install(monkeypatch, mcp3564_driver, [adc])
+    driver = MCP3564Driver(HardwareConfig())
+
+    driver.read_channels_raw(0, [0])
+    assert adc.registers[CONFIG1] == [0b01 << 6 | 0b0101 << 2]
+
+    driver.read_channels_raw(0, [0], profile='fast')
+    assert adc.registers[CONFIG1] == [0b00 << 6 | 0b0001 << 2]
+    writes = len(adc.transactions(0b10))
+    driver.read_channels_raw(0, [0], profile='fast')
+    assert len(adc.transactions(0b10)) == writes
+
+    driver.read_channels_raw(0, [0], profile=AcquisitionProfile(gain=8))
+    assert adc.registers[CONFIG1] == [0b01 << 6 | 0b0101 << 2]
+    assert adc.registers[CONFIG2][0] >> 3 & 0b111 == 0b100
+    assert driver.profile_name == 'default'
@@ -0,0 +1,86 @@
+"""AD5272Driver write-skip cache for the TCA mux, RDAC unlock and wiper positions."""
+
+import pytest
+
+from node.config import DigitalPotChannel, HardwareConfig
+from node.drivers import AD5272Driver, HardwareDriverError
+from node.drivers import ad5272_driver
+
+class FakeSMBus:
+    """Records every write as ('mux', channel bits) or ('pot', command, data)"""
+
+    def __init__(self, bus_number):
+        self.writes = []
+        self.fail = False
+
+    def write_byte_data(self, address, register, value):
+        self._check()
+        self.writes.append(('mux', value))
+
+    def write_i2c_block_data(self, address, command, data):
+        self._check()
+        self.writes.append(('pot', command, list(data)))
+
+    def _check(self):
+        if self.fail:
+            self.fail = False
+            raise OSError("NACK")
+
+    def close(self):
+        pass
+
+UNLOCK = ('pot', 0x1c, [0x02])
+
+def _wiper(position):
+    return ('pot', (1 << 2) | (position >> 8), [position & 0xff])
+
+@pytest.fixture
+def pot(monkeypatch):
+    class Factory:
+        @staticmethod
+        def SMBus(bus_number):
+            return FakeSMBus(bus_number)
+
+    monkeypatch.setattr(ad5272_driver, "smbus2", Factory)
+    driver = AD5272Driver(HardwareConfig())
+    driver.select_channel(DigitalPotChannel.AD0)
+    return driver
+
+def test_repeated_writes_are_skipped(pot):
+    pot.set_wiper_position(300)
+    pot.select_channel(DigitalPotChannel.AD0)
+    pot.set_wiper_position(300)
+    pot.set_wiper_position(301)
+
+    assert pot._bus.writes == [('mux', 1), UNLOCK, _wiper(300), _wiper(301)]
+    assert pot.stats == {'writes': 4, 'writes_skipped': 3}
+    assert pot.cached_wiper_position(DigitalPotChannel.AD0) == 301
+
+def test_unlock_and_wiper_are_tracked_per_chip(pot):
+    pot.set_wiper_position(10)
+    pot.select_channel(DigitalPotChannel.AD3)
+    pot.set_wiper_position(10)
+    pot.select_channel(DigitalPotChannel.AD0)
+    pot.set_wiper_position(10)
+
+    assert pot._bus.writes == [('mux', 1), UNLOCK, _wiper(10), ('mux', 8), UNLOCK, _wiper(10), ('mux', 1)]
+
+def test_force_bypasses_the_cache(pot):
+    pot.set_wiper_position(512)
+    del pot._bus.writes[:]
+    pot.select_channel(DigitalPotChannel.AD0, force=True)
+    pot.set_wiper_position(512, force=True)
+
+    assert pot._bus.writes == [('mux', 1), UNLOCK, _wiper(512)]
+
+def test_bus_error_clears_the_cache(pot):
+    pot.set_wiper_position(100)
+    pot._bus.fail = True
+    with pytest.raises(HardwareDriverError):
+        pot.set_wiper_position(200)
+    assert pot.selected_channel is None
+
+    del pot._bus.writes[:]
+    pot.select_channel(DigitalPotChannel.AD0)
+    pot.set_wiper_position(100)
+    assert pot._bus.writes == [('mux', 1), UNLOCK, _wiper(100)]
@@ -0,0 +1,88 @@
+"""AD5272 wiper readback in repeated-start transactions."""
+
+import pytest
+
+from node.config import DigitalPotChannel, HardwareConfig
+from node.drivers import AD5272Driver
+from node.drivers import ad5272_driver
+from node.sensors import PCBSensor
+
+class Message(list):
+    """i2c_msg stand-in: a read message is filled in by the bus"""
+
+    def __init__(self, kind, address, data):
+        super().__init__(data)
+        self.kind = kind
+        self.address = address
+
+class FakeBoard:
+    """TCA mux in front of one AD5272 per channel, holding its wiper position"""
+
+    def __init__(self, bus_number):
+        self.mux = 0
+        self.wipers = {1 << channel.value: 100 * (channel.value + 1) for channel in DigitalPotChannel}
+        self.transactions = []
+
+    def write_byte_data(self, address, register, value):
+        self.mux = value
+
+    def write_i2c_block_data(self, address, command, data):
+        if command >> 2 == 1:
+            self.wipers[self.mux] = ((command & 0x03) << 8) | data[0]
+
+    def i2c_rdwr(self, *messages):
+        self.transactions.append([message.kind for message in messages])
+        for message in messages:
+            if message.kind == 'r':
+                position = self.wipers[self.mux]
+                message[:] = [position >> 8, position & 0xff]
+
+    def close(self):
+        pass
+
+class FakeSMBusModule:
+    """smbus2 module stand-in"""
+
+    class i2c_msg:
+        @staticmethod
+        def write(address, data):
+            return Message('w', address, data)
+
+        @staticmethod
+        def read(address, length):
+            return Message('r', address, [0] * length)
+
+    @staticmethod
+    def SMBus(bus_number):
+        return FakeBoard(bus_number)
+
+@pytest.fixture(autouse=True)
+def board(monkeypatch):
+    monkeypatch.setattr(ad5272_driver, "smbus2", FakeSMBusModule)
+
+def test_readback_is_one_repeated_start_transaction():
+    pot = AD5272Driver(HardwareConfig())
+    pot.select_channel(DigitalPotChannel.AD1)
+
+    assert pot.read_wiper_position() == 200
+    assert pot._bus.transactions == [['w', 'r']]
+    assert pot.cached_wiper_position(DigitalPotChannel.AD1) == 200
+
+def test_read_all_wipers_restores_the_selected_channel():
+    pot = AD5272Driver(HardwareConfig())
+    pot.select_channel(DigitalPotChannel.AD2)
+    pot.set_wiper_position(1023)
+
+    positions = pot.read_all_wipers()
+
+    assert positions == {DigitalPotChannel.AD0: 100, DigitalPotChannel.AD1: 200,
+                         DigitalPotChannel.AD2: 1023, DigitalPotChannel.AD3: 400}
+    assert pot.selected_channel == DigitalPotChannel.AD2 and pot._bus.mux == 1 << 2
+    assert len(pot._bus.transactions) == len(DigitalPotChannel)
+
+def test_pcb_sensor_reports_resistances():
+    config = HardwareConfig()
+    sensor = PCBSensor("pcb", config)
+
+    resistances = sensor.get_resistances()
+    assert resistances[DigitalPotChannel.AD3] == pytest.approx(400 / config.ad5272_max_steps * config.ad5272_max_resistance)
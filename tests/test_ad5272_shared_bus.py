@@ -0,0 +1,71 @@
+"""Boards sharing one I2C bus through I2CBus."""
+
+import pytest
+
+from node.config import DigitalPotChannel, HardwareConfig
+from node.drivers import AD5272Driver, I2CBus
+from node.drivers import ad5272_driver
+
+class FakeSMBus:
+    """Two TCA muxes; records which muxes were switched on at every pot write"""
+
+    def __init__(self, bus_number):
+        self.muxes = {}
+        self.pot_writes = []
+
+    def write_byte_data(self, address, register, value):
+        self.muxes[address] = value
+
+    def write_i2c_block_data(self, address, command, data):
+        self.pot_writes.append((command, list(data), {a: v for a, v in self.muxes.items() if v}))
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def bus(monkeypatch):
+    handles = []
+
+    class Factory:
+        @staticmethod
+        def SMBus(bus_number):
+            handles.append(FakeSMBus(bus_number))
+            return handles[-1]
+
+    monkeypatch.setattr(ad5272_driver, "smbus2", Factory)
+    shared = I2CBus(1)
+    shared.handles = handles
+    return shared
+
+def _drivers(bus):
+    a = AD5272Driver(HardwareConfig(tca_address=0x70), bus)
+    b = AD5272Driver(HardwareConfig(tca_address=0x71), bus)
+    return a, b
+
+def test_claim_switches_previous_mux_off(bus):
+    a, b = _drivers(bus)
+    a.select_channel(DigitalPotChannel.AD0)
+    b.select_channel(DigitalPotChannel.AD2)
+    handle = bus.handles[0]
+    assert handle.muxes == {0x70: 0, 0x71: 1 << 2}
+
+def test_interleaved_select_and_write_reach_own_chip(bus):
+    a, b = _drivers(bus)
+    a.select_channel(DigitalPotChannel.AD0)
+    b.select_channel(DigitalPotChannel.AD1)  # Another board takes the bus between A's select and write
+    a.set_wiper_position(100)
+
+    handle = bus.handles[0]
+    command, data, muxes_on = handle.pot_writes[-1]
+    assert data == [100]
+    assert muxes_on == {0x70: 1 << 0}
+    assert a.selected_channel is DigitalPotChannel.AD0
+    assert a.cached_wiper_position(DigitalPotChannel.AD0) == 100
+    assert a.cached_wiper_position(None) is None
+
+def test_release_switches_mux_off(bus):
+    a, b = _drivers(bus)
+    a.select_channel(DigitalPotChannel.AD1)
+    a.close()
+    assert bus.handles[0].muxes[0x70] == 0
+    assert bus.owner is None
@@ -0,0 +1,43 @@
+"""ThreadedSensor under AsyncSensorManager's read timeout."""
+
+import asyncio
+import threading
+import time
+
+from node.config import HardwareConfig, SensorReading
+from node.management import AsyncSensorManager
+from node.sensors import BaseSensor
+
+class SlowSensor(BaseSensor):
+    """Blocking read that outlasts the manager's read timeout; tracks overlapping calls"""
+
+    def __init__(self):
+        super().__init__("slow", HardwareConfig())
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def read(self) -> SensorReading:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.25)
+        with self._lock:
+            self.active -= 1
+        return SensorReading(sensor_name=self.name, timestamp=time.time(), data={})
+
+    def close(self):
+        pass
+
+def test_timed_out_read_is_not_overlapped():
+    sensor = SlowSensor()
+    manager = AsyncSensorManager()
+    manager.add_sensor(sensor, 0.05, [], read_timeout=0.1)
+
+    asyncio.run(manager.run(duration=1.0))
+
+    assert manager.stats["slow"]["timeouts"] > 0
+    assert sensor.calls > 1
+    assert sensor.max_active == 1
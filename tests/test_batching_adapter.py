@@ -0,0 +1,112 @@
+"""BatchingAdapter emit triggers and the native process_batch paths."""
+
+import logging
+import queue
+import threading
+import time
+
+from node.adapters import BatchingAdapter, BufferedAdapter, LoggingAdapter, QueueAdapter, SensorDataAdapter
+from node.adapters import batching_adapter
+from node.config import SensorReading
+
+def _readings(*indices):
+    return [SensorReading(sensor_name="s", timestamp=float(i), data={'index': i}) for i in indices]
+
+class Sink(SensorDataAdapter):
+    """Records the index lists of the batches it receives; the gate holds each one"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.batches = []
+        self.closed = False
+
+    def process_reading(self, reading):
+        self.process_batch([reading])
+
+    def process_batch(self, readings):
+        self.entered.set()
+        self.gate.wait(5.0)
+        self.batches.append([reading.data['index'] for reading in readings])
+
+    def close(self):
+        self.closed = True
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+def test_emits_on_size_then_on_delay_then_on_close():
+    sink = Sink()
+    adapter = BatchingAdapter(sink, max_batch=3, max_delay=0.1)
+
+    adapter.process_batch(_readings(0, 1, 2, 3))
+    assert _wait_for(lambda: len(sink.batches) == 2)
+    assert sink.batches == [[0, 1, 2], [3]]
+
+    adapter.process_reading(_readings(4)[0])
+    adapter.close()
+    assert sink.batches[-1] == [4] and sink.closed
+    assert adapter.stats() == {'readings': 5, 'batches': 3, 'errors': 0, 'pending': 0}
+
+def test_leftovers_keep_their_arrival_time(monkeypatch):
+    class Clock:
+        now = 100.0
+
+        def monotonic(self):
+            return self.now
+
+    clock = Clock()
+    monkeypatch.setattr(batching_adapter, "time", clock)
+    sink = Sink()
+    sink.gate.clear()
+    adapter = BatchingAdapter(sink, max_batch=2, max_delay=5.0)
+
+    adapter.process_batch(_readings(0, 1))
+    assert sink.entered.wait(5.0)
+    clock.now = 101.0
+    adapter.process_batch(_readings(2, 3, 4))
+    clock.now = 110.0
+    sink.gate.set()
+
+    # 4 arrived at 101, so it is already overdue once [2, 3] has gone out
+    assert _wait_for(lambda: len(sink.batches) == 3)
+    assert sink.batches == [[0, 1], [2, 3], [4]]
+    adapter.close()
+
+def test_logging_batch_matches_single_reading_lines(caplog):
+    readings = _readings(0, 1)
+    adapter = LoggingAdapter(logging.getLogger("batch-format"))
+
+    with caplog.at_level(logging.INFO, logger="batch-format"):
+        for reading in readings:
+            adapter.process_reading(reading)
+        single = [record.getMessage() for record in caplog.records]
+        caplog.clear()
+        adapter.process_batch(readings)
+
+    assert [record.getMessage() for record in caplog.records] == ["\n".join(single)]
+
+def test_queue_adapter_puts_whole_batches():
+    items = queue.Queue()
+    QueueAdapter(items, batch_items=True).process_batch(_readings(0, 1))
+    QueueAdapter(items).process_batch(_readings(2, 3))
+
+    assert [[r.data['index'] for r in items.get_nowait()]] == [[0, 1]]
+    assert [items.get_nowait().data['index'] for _ in range(2)] == [2, 3]
+
+def test_buffered_adapter_drains_a_backlog_in_batches():
+    sink = Sink()
+    sink.gate.clear()
+    buffered = BufferedAdapter(sink, maxsize=100, max_batch=4)
+
+    buffered.process_reading(_readings(0)[0])
+    assert sink.entered.wait(5.0)
+    buffered.process_batch(_readings(*range(1, 7)))
+    sink.gate.set()
+    buffered.close()
+
+    assert sink.batches == [[0], [1, 2, 3, 4], [5, 6]]
@@ -0,0 +1,68 @@
+"""BoardRegistry handle sharing and shutdown."""
+
+from collections import Counter
+
+import pytest
+
+from node.config import BoardConfig, DigitalPotChannel, HardwareConfig
+from node.drivers import AD5272Driver, I2CBus, MCP3564Driver
+from node.drivers import ad5272_driver
+from node.management import BoardRegistry, SensorManager
+
+class FakeSMBus:
+    """Counts close() calls on the one bus handle"""
+
+    def __init__(self, bus_number):
+        self.closed = 0
+
+    def write_byte_data(self, address, register, value):
+        pass
+
+    def write_i2c_block_data(self, address, command, data):
+        pass
+
+    def close(self):
+        self.closed += 1
+
+@pytest.fixture
+def closes(monkeypatch):
+    """Count close() calls per driver instance"""
+    counts = Counter()
+    for cls in (MCP3564Driver, AD5272Driver, I2CBus):
+        def counted(self, _close=cls.close):
+            counts[self] += 1
+            _close(self)
+        monkeypatch.setattr(cls, "close", counted)
+
+    handles = []
+
+    class Factory:
+        @staticmethod
+        def SMBus(bus_number):
+            handles.append(FakeSMBus(bus_number))
+            return handles[-1]
+
+    monkeypatch.setattr(ad5272_driver, "smbus2", Factory)
+    counts.handles = handles
+    return counts
+
+def test_two_boards_close_each_driver_once(closes):
+    config = HardwareConfig(boards=[
+        BoardConfig("a"),
+        BoardConfig("b", adc_cs=[2, 3], overrides={'tca_address': 0x71}),
+    ])
+    registry = BoardRegistry(config)
+    a, b = registry["a"].pcb, registry["b"].pcb
+    assert a.adc_driver is b.adc_driver
+    assert a.pot_driver._shared_bus is b.pot_driver._shared_bus
+    a.set_resistance(DigitalPotChannel.AD0, 1000)
+    b.set_resistance(DigitalPotChannel.AD1, 1000)
+
+    manager = SensorManager()
+    registry.add_to(manager, [], interval=1.0)
+    manager.cleanup()
+    registry.close()
+
+    drivers = [a.adc_driver, a.pot_driver, b.pot_driver, a.pot_driver._shared_bus]
+    assert closes == Counter({driver: 1 for driver in drivers})
+    assert [handle.closed for handle in closes.handles] == [1]
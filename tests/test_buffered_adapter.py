@@ -0,0 +1,120 @@
+"""BufferedAdapter overflow policies and SensorManager adapter fan-out."""
+
+import threading
+import time
+
+import pytest
+
+from node.adapters import BufferedAdapter, OverflowPolicy, SensorDataAdapter
+from node.config import HardwareConfig, SensorReading
+from node.management import SensorManager
+from node.sensors import BaseSensor
+
+def _reading(index):
+    return SensorReading(sensor_name="s", timestamp=float(index), data={'index': index})
+
+class GatedAdapter(SensorDataAdapter):
+    """Holds every reading until the gate opens; records what it saw"""
+
+    def __init__(self, open_gate=True):
+        self.gate = threading.Event()
+        if open_gate:
+            self.gate.set()
+        self.started = threading.Event()
+        self.seen = []
+        self.closed = 0
+
+    def process_reading(self, reading):
+        self.started.set()
+        self.gate.wait(5.0)
+        self.seen.append(reading.data['index'])
+
+    def close(self):
+        self.closed += 1
+
+class CountingSensor(BaseSensor):
+    """Returns readings numbered from zero"""
+
+    def __init__(self, name):
+        super().__init__(name, HardwareConfig())
+        self.count = 0
+
+    def read(self) -> SensorReading:
+        reading = SensorReading(sensor_name=self.name, timestamp=time.time(), data={'index': self.count})
+        self.count += 1
+        return reading
+
+    def close(self):
+        pass
+
+def _fill(buffered, adapter, count):
+    """Park the worker on reading 0, then offer readings 1..count"""
+    buffered.process_reading(_reading(0))
+    assert adapter.started.wait(5.0)
+    for index in range(1, count + 1):
+        buffered.process_reading(_reading(index))
+
+@pytest.mark.parametrize("policy, kept", [
+    (OverflowPolicy.DROP_OLDEST, [0, 3, 4, 5, 6]),
+    (OverflowPolicy.DROP_NEWEST, [0, 1, 2, 3, 4]),
+])
+def test_full_queue_applies_the_overflow_policy(policy, kept):
+    adapter = GatedAdapter(open_gate=False)
+    buffered = BufferedAdapter(adapter, maxsize=4, overflow=policy)
+
+    _fill(buffered, adapter, 6)
+    assert buffered.stats()['dropped'] == 2
+    assert buffered.depth == 4
+
+    adapter.gate.set()
+    assert buffered.flush(5.0)
+    buffered.close()
+    assert adapter.seen == kept
+    assert buffered.stats()['processed'] == 5 and adapter.closed == 1
+
+def test_sample_keeps_every_nth_reading_past_half_full():
+    adapter = GatedAdapter(open_gate=False)
+    buffered = BufferedAdapter(adapter, maxsize=4, overflow=OverflowPolicy.SAMPLE, sample_every=3)
+
+    _fill(buffered, adapter, 8)
+    adapter.gate.set()
+    buffered.close()
+
+    # 1 and 2 fill half the queue; after that only every third offer gets in
+    assert adapter.seen == [0, 1, 2, 5, 8]
+
+def test_block_times_out_when_the_queue_stays_full():
+    adapter = GatedAdapter(open_gate=False)
+    buffered = BufferedAdapter(adapter, maxsize=1, overflow=OverflowPolicy.BLOCK, block_timeout=0.05)
+
+    _fill(buffered, adapter, 1)
+    started = time.monotonic()
+    buffered.process_reading(_reading(2))
+    assert time.monotonic() - started >= 0.05
+    assert buffered.stats()['dropped'] == 1
+
+    adapter.gate.set()
+    buffered.close()
+    assert adapter.seen == [0, 1]
+
+def test_slow_adapter_does_not_hold_up_the_others():
+    slow, fast = GatedAdapter(open_gate=False), GatedAdapter()
+    manager = SensorManager()
+    manager.add_sensor(CountingSensor("a"), 1.0, [slow, fast])
+    manager.add_sensor(CountingSensor("b"), 1.0, [fast])
+
+    # An adapter shared between sensors gets one queue and worker
+    assert manager.adapters["a"][1] is manager.adapters["b"][0]
+    assert len(manager.buffered) == 2
+
+    for _ in range(3):
+        manager._read_sensor("a")
+    assert manager.adapters["a"][1].flush(5.0)
+    assert fast.seen == [0, 1, 2] and slow.seen == []
+
+    slow.gate.set()
+    assert manager.flush_adapters(5.0)
+    assert slow.seen == [0, 1, 2]
+
+    manager.cleanup()
+    assert slow.closed == fast.closed == 1
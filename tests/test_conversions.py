@@ -0,0 +1,62 @@
+"""24-bit sample decoding and per-channel scaling."""
+
+import numpy as np
+import pytest
+
+from fake_mcp3564 import FakeMCP3564, install
+from node.config import ADCChannel, ChannelScaling, HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+from node.sensors import PCBSensor
+from node.utils.conversions import decode_24bit
+
+def test_decode_accepts_packed_bytes_and_logged_codes():
+    packed = bytes([0x00, 0x00, 0x01, 0xff, 0xff, 0xff, 0x80, 0x00, 0x00, 0x7f, 0xff, 0xff])
+    expected = [1, -1, -0x800000, 0x7fffff]
+
+    assert decode_24bit(packed).tolist() == expected
+    assert decode_24bit(np.frombuffer(packed, dtype=np.uint8)).tolist() == expected
+    assert decode_24bit(memoryview(packed)).tolist() == expected
+    assert decode_24bit(np.array([1, 0xffffff, 0x800000, 0x7fffff])).tolist() == expected
+    with pytest.raises(ValueError):
+        decode_24bit(packed[:-1])
+
+def test_convert_samples_scales_each_channel_by_its_kind():
+    config = HardwareConfig(pcb_channel_scaling={
+        0: ChannelScaling(kind='current', full_scale_current=2.0),
+        1: ChannelScaling(kind='voltage', vref=5.0, gain=2.0),
+    })
+    driver = MCP3564Driver(config)
+    half = np.full(4, 0x400000)
+
+    values = driver.convert_samples([0, 1, 0, 1], half)
+    assert values == pytest.approx([1000.0, 1.25, 1000.0, 1.25])
+
+def test_convert_samples_defaults_unconfigured_channels():
+    config = HardwareConfig(pcb_channel_scaling={0: ChannelScaling(kind='current')})
+    driver = MCP3564Driver(config)
+
+    values = driver.convert_samples([0, 3], np.full(2, 0x400000))
+    assert values == pytest.approx([500.0, config.mcp3564_vref / 2])
+    with pytest.raises(ValueError):
+        driver.convert_samples([-1], np.zeros(1))
+
+def test_scan_output_follows_the_configured_kind(monkeypatch):
+    install(monkeypatch, mcp3564_driver, [FakeMCP3564({0: 0x400000, 1: 0x400000, 2: 0x400000, 3: 0x400000})])
+    # Channel 1 re-wired as a current input; channel 3 left unconfigured
+    config = HardwareConfig(pcb_channel_scaling={
+        0: ChannelScaling(kind='current'),
+        1: ChannelScaling(kind='current', full_scale_current=4.0),
+        2: ChannelScaling(kind='current'),
+    })
+    sensor = PCBSensor("pcb", config)
+
+    data = sensor.read_adc_scan(ADCChannel.ADC0)
+    assert data['voltage 1']['current'] == pytest.approx(2000.0)
+    assert data['current 1']['current'] == pytest.approx(500.0)
+    assert data['voltage 2']['voltage'] == pytest.approx(config.mcp3564_vref / 2)
+
+    assert sensor.read_adc_channel(ADCChannel.ADC0, 1)['current'] == pytest.approx(2000.0)
+    # An explicit isCurrent still overrides the configured kind
+    reading = sensor.read_adc_channel(ADCChannel.ADC0, 1, isCurrent=False)
+    assert reading['voltage'] == pytest.approx(config.mcp3564_vref / 2)
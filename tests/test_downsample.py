@@ -0,0 +1,66 @@
+"""Min/max and LTTB downsampling and the zoom pyramid."""
+
+import numpy as np
+import pytest
+
+from node.utils.downsample import Pyramid, downsample, lttb_indices, minmax_indices
+
+@pytest.fixture
+def series():
+    x = np.arange(100000, dtype=np.float64)
+    y = np.sin(x / 5000)
+    y[12345] = 10.0  # A single-sample spike
+    y[54321] = -10.0
+    y[70000:70010] = np.nan
+    return x, y
+
+def test_minmax_keeps_extremes_and_endpoints(series):
+    x, y = series
+    indices = minmax_indices(y, 200)
+
+    assert len(indices) <= 204
+    assert np.all(np.diff(indices) > 0)
+    assert {0, len(y) - 1, 12345, 54321} <= set(indices.tolist())
+    assert not np.isnan(y[indices[1:-1]]).any()
+    assert minmax_indices(y[:100], 200).tolist() == list(range(100))
+
+def test_lttb_picks_the_spike_and_skips_gaps(series):
+    x, y = series
+    indices = lttb_indices(x, y, 500)
+
+    assert len(indices) == 500
+    assert np.all(np.diff(indices) > 0)
+    assert 12345 in indices and 54321 in indices
+    assert not np.isnan(y[indices]).any()
+
+def test_downsample_methods(series):
+    x, y = series
+    dx, dy = downsample(x, y, 100, method='lttb')
+    assert len(dx) == len(dy) == 100 and dy.max() == 10.0
+    with pytest.raises(ValueError):
+        downsample(x, y, 100, method='mean')
+
+def test_pyramid_levels_and_views(series):
+    x, y = series
+    pyramid = Pyramid(x, y, factor=8, min_points=1000)
+
+    sizes = [len(level_x) for level_x, _ in pyramid.levels]
+    assert sizes[0] == len(x) and sizes[-1] <= 1000
+    assert all(coarse <= fine // 4 + 2 for fine, coarse in zip(sizes, sizes[1:]))
+
+    vx, vy = pyramid.view(n_out=500)
+    assert len(vx) <= 504 and vy.max() == 10.0 and vy.min() == -10.0
+
+    # Zoomed far enough in, the view is the raw samples plus one either side
+    vx, vy = pyramid.view(20000.0, 20100.0, n_out=500)
+    assert vx.tolist() == x[19999:20102].tolist()
+    assert vy.tolist() == y[19999:20102].tolist()
+
+def test_datetime_x_is_supported():
+    x = np.datetime64('2025-01-01T00:00:00', 'ns') + np.arange(10000) * np.timedelta64(1, 's')
+    y = np.cos(np.arange(10000) / 100.0)
+
+    dx, _ = downsample(x, y, 50, method='lttb')
+    assert dx.dtype == x.dtype and dx[0] == x[0] and dx[-1] == x[-1]
+    vx, _ = Pyramid(x, y, min_points=500).view(x[100], x[200], n_out=50)
+    assert vx[0] <= x[100] and vx[-1] >= x[200]
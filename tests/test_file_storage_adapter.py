@@ -0,0 +1,77 @@
+"""FileStorageAdapter JSON lines, rotation, fsync policy and crash recovery."""
+
+import json
+import os
+
+import pytest
+
+from node.adapters import FileStorageAdapter, FsyncPolicy
+from node.config import SensorReading
+
+def _reading(index, sensor="pcb"):
+    return SensorReading(sensor_name=sensor, timestamp=float(index), data={'index': index})
+
+def _indices(path):
+    with open(path) as f:
+        return [json.loads(line)['data']['index'] for line in f]
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    real = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append(fd) or real(fd))
+    return calls
+
+def test_batches_go_to_one_file_per_sensor(tmp_path):
+    adapter = FileStorageAdapter(str(tmp_path), flush_interval=0,
+                                 annotate=lambda reading: {'circuit_mode': 'open'})
+    adapter.process_batch([_reading(0), _reading(1, "teros"), _reading(2)])
+    adapter.process_reading(_reading(3))
+
+    # Written through without waiting for close
+    assert _indices(adapter.path_for("pcb")) == [0, 2, 3]
+    assert _indices(adapter.path_for("teros")) == [1]
+    with open(adapter.path_for("teros")) as f:
+        assert json.loads(f.readline())['circuit_mode'] == 'open'
+
+    adapter.close()
+    assert adapter.stats()['records'] == 4 and adapter.stats()['open_files'] == 0
+
+def test_rotates_before_exceeding_max_bytes(tmp_path):
+    line = len(json.dumps(_reading(0).to_dict())) + 1
+    adapter = FileStorageAdapter(str(tmp_path), flush_interval=0, max_bytes=2 * line)
+    for index in range(5):
+        adapter.process_reading(_reading(index))
+    adapter.close()
+
+    active = adapter.path_for("pcb")
+    segments = [str(path) for path in tmp_path.glob("*.json") if str(path) != active]
+    assert sorted(_indices(path) for path in segments) == [[0, 1], [2, 3]]
+    assert _indices(active) == [4]
+    assert adapter.stats()['rotations'] == 2
+
+@pytest.mark.parametrize("policy, expected", [
+    (FsyncPolicy.NEVER, 0),
+    (FsyncPolicy.ON_ROTATE, 1),  # Only the close
+    (FsyncPolicy.ON_FLUSH, 4),  # Three flushes and the close
+])
+def test_fsync_policy(tmp_path, fsyncs, policy, expected):
+    adapter = FileStorageAdapter(str(tmp_path), flush_interval=60, fsync_policy=policy)
+    for index in range(3):
+        adapter.process_reading(_reading(index))
+        adapter.flush()
+    adapter.close()
+
+    assert len(fsyncs) == expected == adapter.stats()['fsyncs']
+
+def test_torn_final_line_is_truncated_on_open(tmp_path):
+    adapter = FileStorageAdapter(str(tmp_path), flush_interval=0)
+    path = adapter.path_for("pcb")
+    with open(path, 'w') as f:
+        f.write(json.dumps(_reading(0).to_dict()) + '\n' + '{"sensor_name": "pcb", "times')
+
+    adapter.process_reading(_reading(1))
+    adapter.close()
+
+    assert _indices(path) == [0, 1]
+    assert adapter.stats()['recovered_bytes'] == len('{"sensor_name": "pcb", "times')
@@ -0,0 +1,78 @@
+"""File-backed IRQ waiter and its selection through HardwareConfig."""
+
+import threading
+import time
+
+import pytest
+
+from fake_mcp3564 import CONVERSION_START, FakeMCP3564, install
+from node.config import HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+from node.drivers.irq_waiter import FileIRQWaiter, create_irq_waiter
+
+@pytest.fixture
+def irq_config(tmp_path):
+    (tmp_path / "gpio5").mkdir()
+    value = tmp_path / "gpio5" / "value"
+    value.write_text("1")
+    config = HardwareConfig(mcp3564_irq_backend='file', mcp3564_irq_pins=[5],
+                            mcp3564_irq_path=str(tmp_path / "gpio{pin}" / "value"))
+    return config, value
+
+def test_file_waiter_fires_when_line_goes_low(irq_config):
+    config, value = irq_config
+    waiter = create_irq_waiter(config, 0)
+    assert isinstance(waiter, FileIRQWaiter)
+
+    threading.Timer(0.05, value.write_text, ("0",)).start()
+    start = time.monotonic()
+    assert waiter.wait(2.0)
+    assert 0.04 < time.monotonic() - start < 1.0
+    waiter.close()
+
+def test_file_waiter_times_out_while_line_is_high(irq_config):
+    config, value = irq_config
+    waiter = create_irq_waiter(config, 0)
+
+    start = time.monotonic()
+    assert not waiter.wait(0.05)
+    assert time.monotonic() - start >= 0.05
+    waiter.close()
+
+def test_unusable_backends_fall_back_to_polling(irq_config):
+    config, value = irq_config
+    assert create_irq_waiter(config, 1) is None  # No pin for this chip-select
+    config.mcp3564_irq_pins = [6]
+    assert create_irq_waiter(config, 0) is None  # Value file missing
+    config.mcp3564_irq_backend = 'parport'
+    assert create_irq_waiter(config, 0) is None
+    config.mcp3564_irq_backend = None
+    assert create_irq_waiter(config, 0) is None
+
+class IRQFakeMCP3564(FakeMCP3564):
+    """Pulls the IRQ value file high at a conversion start and low when it completes"""
+
+    def __init__(self, codes, value, delay):
+        super().__init__(codes)
+        self.value = value
+        self.delay = delay
+
+    def xfer(self, data):
+        if data[0] == CONVERSION_START:
+            self.value.write_text("1")
+            threading.Timer(self.delay, self.value.write_text, ("0",)).start()
+        return super().xfer(data)
+
+def test_driver_wakes_on_the_edge_instead_of_the_conversion_time(irq_config, monkeypatch):
+    config, value = irq_config
+    config.mcp3564_mclk = 16384.0  # Nominal conversion time of one second
+    install(monkeypatch, mcp3564_driver, [IRQFakeMCP3564({0: 5}, value, 0.02)])
+    driver = MCP3564Driver(config)
+    assert driver.conversion_time() == pytest.approx(1.0)
+
+    start = time.monotonic()
+    assert driver.read_channels_raw(0, [0]) == {0: bytes([0, 0, 5])}
+    assert time.monotonic() - start < 0.5
+    assert isinstance(driver._devices[(config.spi_bus, 0)].irq, FileIRQWaiter)
+    driver.close()
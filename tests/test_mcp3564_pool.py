@@ -0,0 +1,54 @@
+"""Pooled SpiDev handles in MCP3564Driver."""
+
+import pytest
+
+from fake_mcp3564 import LOCK, FakeMCP3564, install
+from node.config import HardwareConfig
+from node.drivers import HardwareDriverError, MCP3564Driver
+from node.drivers import mcp3564_driver
+
+def _inits(adc):
+    """Init sequences run on a chip, counted by their LOCK sanity read"""
+    return sum(1 for data in adc.transactions(0b11) if (data[0] >> 2) & 0x0f == LOCK)
+
+@pytest.fixture
+def adcs(monkeypatch):
+    adcs = [FakeMCP3564({0: 1, 1: 2}) for _ in range(4)]
+    install(monkeypatch, mcp3564_driver, adcs)
+    return adcs
+
+def test_alternating_chip_selects_keep_their_handles(adcs):
+    driver = MCP3564Driver(HardwareConfig(spi_bus=1))
+    for _ in range(3):
+        driver.read_channels_raw(0, [0, 1])
+        driver.read_channels_raw(1, [0, 1])
+
+    assert [adc.opened for adc in adcs[:2]] == [(1, 0), (1, 1)]
+    assert adcs[2].opened is None
+    assert not any(adc.closed for adc in adcs)
+    # Each chip is initialized once
+    assert [_inits(adc) for adc in adcs[:2]] == [1, 1]
+
+def test_failed_transfer_reinitializes_only_that_device(adcs):
+    driver = MCP3564Driver(HardwareConfig())
+    driver.read_channels_raw(0, [0])
+    driver.read_channels_raw(1, [0])
+
+    adcs[0].fail = True
+    with pytest.raises(HardwareDriverError):
+        driver.read_channels_raw(0, [0])
+    assert driver.read_channels_raw(0, [0]) == {0: bytes([0, 0, 1])}
+    driver.read_channels_raw(1, [0])
+
+    assert [_inits(adc) for adc in adcs[:2]] == [2, 1]
+    assert adcs[2].opened is None
+
+def test_close_releases_every_handle(adcs):
+    driver = MCP3564Driver(HardwareConfig())
+    driver.read_channels_raw(0, [0])
+    driver.read_channels_raw(1, [0])
+    driver.close()
+
+    assert adcs[0].closed and adcs[1].closed
+    driver.read_channels_raw(0, [0])
+    assert adcs[2].opened == (0, 0)
@@ -0,0 +1,73 @@
+"""MCP3564Driver register shadow: skipped writes, batching and readback verification."""
+
+import logging
+import time
+
+from fake_mcp3564 import CONFIG1, CONFIG3, GAINCAL, SCAN, FakeMCP3564, install
+from node.config import HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+
+def _driver(monkeypatch, adcs, **config):
+    install(monkeypatch, mcp3564_driver, adcs)
+    return MCP3564Driver(HardwareConfig(**config))
+
+def test_init_writes_only_what_the_chip_does_not_hold(monkeypatch):
+    adc = FakeMCP3564({0: 1})
+    _driver(monkeypatch, [adc]).read_channels_raw(0, [0])
+    registers = {address: list(value) for address, value in adc.registers.items()}
+    writes = len(adc.transactions(0b10))
+
+    # A new session finds the chip already configured
+    driver = _driver(monkeypatch, [adc])
+    driver.read_channels_raw(0, [0])
+
+    # Init puts CONFIG3 back to the one-shot data format, which the scan then changes again
+    rewritten = {address for data in adc.transactions(0b10)[writes:] for address, _ in adc._split(data)}
+    assert rewritten == {CONFIG3}
+    assert adc.registers == registers
+    stats = driver.register_stats(0)
+    assert stats['writes'] == 2 and stats['writes_skipped'] > 0
+
+def test_writes_are_batched_into_incremental_transactions(monkeypatch):
+    adc = FakeMCP3564({0: 1, 1: 2})
+    driver = _driver(monkeypatch, [adc])
+    driver.read_channels_raw(0, [0, 1])
+
+    # Init covers CONFIG0..GAINCAL in one write; the scan setup covers CONFIG3..TIMER in another
+    assert [(data[0] >> 2) & 0x0f for data in adc.transactions(0b10)] == [0x01, CONFIG3]
+    assert adc.registers[GAINCAL] == [0x7c, 0xab, 0xd8]
+    assert adc.registers[SCAN] == [0x00, 0x03, 0x00]
+    assert driver.register_stats(0)['transactions'] == 3  # Readback plus two writes
+
+def test_verify_restores_a_corrupted_register(monkeypatch, caplog):
+    adc = FakeMCP3564({0: 1})
+    driver = _driver(monkeypatch, [adc])
+    driver.read_channels_raw(0, [0])
+    configured = list(adc.registers[CONFIG1])
+
+    adc.registers[CONFIG1] = [0x00]  # Glitch behind the driver's back
+    with caplog.at_level(logging.WARNING):
+        assert not driver.verify_registers(0)
+
+    assert adc.registers[CONFIG1] == configured
+    assert adc.transactions(0b10)[-1] == [0x4a, *configured]
+    assert "CONFIG1" in caplog.text
+    assert driver.verify_registers(0)
+    stats = driver.register_stats(0)
+    assert stats['verifies'] == 2 and stats['resets_detected'] == 1
+
+def test_verify_runs_on_the_configured_interval(monkeypatch):
+    adc = FakeMCP3564({0: 1})
+    driver = _driver(monkeypatch, [adc], mcp3564_verify_interval=0.05)
+    driver.read_channels_raw(0, [0])
+    configured = list(adc.registers[CONFIG1])
+
+    adc.registers[CONFIG1] = [0x00]
+    driver.read_channels_raw(0, [0])
+    assert adc.registers[CONFIG1] == [0x00]  # Not due yet
+
+    time.sleep(0.06)
+    driver.read_channels_raw(0, [0])
+    assert adc.registers[CONFIG1] == configured
+    assert driver.register_stats(0)['resets_detected'] == 1
@@ -0,0 +1,49 @@
+"""MCP3564Driver.read_channels_raw against a fake ADC running SCAN sequences."""
+
+import pytest
+
+from fake_mcp3564 import CONVERSION_START, SCAN, FakeMCP3564, install
+from node.config import HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+
+def _driver(monkeypatch, adc, **config):
+    install(monkeypatch, mcp3564_driver, [adc])
+    return MCP3564Driver(HardwareConfig(**config))
+
+def test_one_conversion_start_reads_every_channel(monkeypatch):
+    adc = FakeMCP3564({0: 0x000123, 1: -2, 2: 0x7fffff, 3: -0x800000})
+    driver = _driver(monkeypatch, adc)
+
+    raw = driver.read_channels_raw(0, [3, 0, 1, 2])
+
+    assert raw == {0: bytes([0x00, 0x01, 0x23]), 1: bytes([0xff, 0xff, 0xfe]),
+                   2: bytes([0x7f, 0xff, 0xff]), 3: bytes([0x80, 0x00, 0x00])}
+    assert driver.raw_to_voltage(raw[1]) < 0
+    assert [data for data in adc.xfers if data[0] == CONVERSION_START] == [[CONVERSION_START]]
+    assert adc.registers[SCAN] == [0x00, 0x0f, 0x00]
+
+def test_scan_setup_is_written_once_per_channel_set(monkeypatch):
+    adc = FakeMCP3564({0: 1, 1: 2, 2: 3})
+    driver = _driver(monkeypatch, adc)
+
+    driver.read_channels_raw(0, [0, 1])
+    assert adc.registers[SCAN] == [0x00, 0x03, 0x00]
+    writes = len(adc.transactions(0b10))
+
+    driver.read_channels_raw(0, [0, 1])
+    assert len(adc.transactions(0b10)) == writes
+
+    driver.read_channels_raw(0, [2])
+    assert adc.registers[SCAN] == [0x00, 0x04, 0x00]
+
+def test_unfinished_channels_map_to_none(monkeypatch):
+    adc = FakeMCP3564({0: 7})  # Channel 1 never completes
+    driver = _driver(monkeypatch, adc, mcp3564_timeout=0.005)
+
+    assert driver.read_channels_raw(0, [0, 1]) == {0: bytes([0, 0, 7]), 1: None}
+
+def test_channel_out_of_range(monkeypatch):
+    driver = _driver(monkeypatch, FakeMCP3564({}))
+    with pytest.raises(ValueError):
+        driver.read_channels_raw(0, [4])
@@ -0,0 +1,90 @@
+"""MCP3564Stream against a simulated ADC converting continuously, on a virtual clock."""
+
+import pytest
+
+from node.config import AcquisitionProfile, HardwareConfig
+from node.drivers import MCP3564Driver
+from node.drivers import mcp3564_driver
+from node.drivers.mcp3564_driver import MCP3564Stream, _SpiDevice
+
+class FakeClock:
+    """Stands in for the time module; sleeps and SPI transfers move it forward"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0.0)
+
+class ContinuousADC:
+    """Converts the SCAN channels round-robin every period; unread conversions are overwritten
+
+    The reader is stopped once the clock passes end. A stall keeps the reader
+    off the bus for that long at the first transfer after stall_at.
+    """
+
+    TRANSFER_TIME = 0.001  # Readout cost: SPI transfer plus system call overhead
+
+    def __init__(self, clock, channels, period, scan_base, end, stall_at=None, stall=0.0):
+        self.clock = clock
+        self.channels = sorted(channels)
+        self.period = period
+        self.scan_base = scan_base
+        self.start = clock.now
+        self.end = end
+        self.stall_at = stall_at
+        self.stall = stall
+        self.last_read = -1
+        self.overwritten = 0
+        self.stream = None
+
+    def xfer(self, data):
+        if self.stall_at is not None and self.clock.now >= self.stall_at:
+            self.clock.now += self.stall
+            self.stall_at = None
+        self.clock.now += self.TRANSFER_TIME
+        if self.clock.now >= self.end:
+            self.stream._stop_event.set()
+        index = int((self.clock.now - self.start) / self.period) - 1
+        if index <= self.last_read:
+            return [0x04] + [0] * (len(data) - 1)  # DR_STATUS high: nothing new
+        self.overwritten += index - self.last_read - 1
+        self.last_read = index
+        channel = self.channels[index % len(self.channels)]
+        return [0x00, (self.scan_base + channel) << 4, 0, 0, index & 0xff]
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mcp3564_driver, "time", clock)
+    return clock
+
+def _run(clock, channels, duration, stall=0.0):
+    """Run the reader loop inline until the ADC stops it"""
+    driver = MCP3564Driver(HardwareConfig())
+    profile = AcquisitionProfile(osr=4096, prescaler=1)
+    period = driver.conversion_time(profile)
+    adc = ContinuousADC(clock, channels, period, driver.SCAN_DIFF_BASE, clock.now + duration,
+                        stall_at=clock.now + duration / 2 if stall else None, stall=stall)
+    stream = MCP3564Stream(driver, _SpiDevice(spi=adc), 0, channels, 65536, profile)
+    adc.stream = stream
+    stream._reader_loop()
+    return stream, adc
+
+def test_polling_stream_keeps_up_with_conversions(clock):
+    stream, adc = _run(clock, [0, 1, 2, 3], 1.0)
+    received = len(stream.buffer)
+    assert received > 0
+    # Sleeping a full conversion time after every readout lost about one in five here
+    assert adc.overwritten <= 0.05 * (received + adc.overwritten)
+    assert stream.dropped == adc.overwritten
+
+@pytest.mark.parametrize("channels", [[0, 1, 2, 3], [1]])
+def test_dropped_counts_conversions_lost_in_a_stall(clock, channels):
+    stream, adc = _run(clock, channels, 0.6, stall=0.1)
+    assert adc.overwritten > 10
+    assert stream.dropped == adc.overwritten
+    assert len(stream.buffer) + adc.overwritten == adc.last_read + 1
@@ -0,0 +1,62 @@
+"""Chunked NDJSON loader columns, filters and chunking."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from node.storage import flatten_record, iter_columns, load_by_sensor, load_frame
+
+def _pcb(value):
+    return {adc: {key: {'voltage': value, 'current': -value}
+                  for key in ("voltage 1", "current 1", "voltage 2", "current 2")}
+            for adc in ("ADC0", "ADC1")}
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "log.json"
+    lines = []
+    for i in range(5):
+        lines.append({"sensor_name": "pcb", "timestamp": float(i), "status": "success",
+                      "circuit_mode": "open", "data": _pcb(float(i))})
+        lines.append({"sensor_name": "teros", "timestamp": i + 0.5, "status": "success",
+                      "data": {"volumetric_water_content": i / 10, "temperature": "n/a"}})
+    with open(path, 'w') as f:
+        f.write("\n".join(json.dumps(line) for line in lines) + "\n\n")
+        f.write('{"sensor_name": "pcb", "timestamp": 9')  # Torn final line
+    return str(path)
+
+def test_chunks_cover_every_complete_line(log):
+    chunks = list(iter_columns(log, chunk_size=4))
+
+    assert [len(chunk['timestamp']) for chunk in chunks] == [4, 4, 2]
+    timestamps = np.concatenate([chunk['timestamp'] for chunk in chunks])
+    assert timestamps.tolist() == [t / 2 for t in range(10)]
+
+def test_columns_match_flatten_record(log):
+    frame = load_frame(log)
+    with open(log) as f:
+        record = json.loads(f.readline())
+
+    row = frame.iloc[0]
+    for name, value in flatten_record(record).items():
+        if value is None:
+            assert row[name] is None or math.isnan(row[name])
+        else:
+            assert row[name] == value
+
+def test_sensor_filter_and_non_numeric_values(log):
+    frame = load_frame(log, sensor="teros", columns=['timestamp', 'vwc', 'temp'])
+
+    assert list(frame.columns) == ['timestamp', 'sensor', 'status', 'circuit_mode', 'vwc', 'temp']
+    assert frame['vwc'].tolist() == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert frame['temp'].isna().all()
+
+def test_load_by_sensor_splits_one_pass(log):
+    frames = load_by_sensor(log, ["pcb", "teros"], {'pcb': ['timestamp', 'v2', 'i3'],
+                                                   'teros': ['timestamp', 'vwc']})
+
+    assert list(frames['pcb'].columns) == ['timestamp', 'v2', 'i3']
+    assert frames['pcb']['i3'].tolist() == [0.0, -1.0, -2.0, -3.0, -4.0]
+    assert len(frames['teros']) == 5 and list(frames['teros'].columns) == ['timestamp', 'vwc']
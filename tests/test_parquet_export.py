@@ -0,0 +1,40 @@
+"""Incremental Parquet export through a ParseCache."""
+
+import glob
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from node.storage import export_parquet, load_frame, read_parquet
+
+T0 = 1760000000.0
+
+def _append(path, first, count):
+    with open(path, 'a') as f:
+        for i in range(first, first + count):
+            f.write(json.dumps({"sensor_name": "teros_main", "timestamp": T0 + 600.0 * i, "status": "success",
+                                "data": {"volumetric_water_content": i / 1e4}}) + "\n")
+
+def _files(root):
+    return set(glob.glob(os.path.join(root, "**", "*.parquet"), recursive=True))
+
+def test_reexport_rewrites_only_appended_days(tmp_path):
+    log, root, cache_dir = str(tmp_path / "log.json"), str(tmp_path / "parquet"), str(tmp_path / "cache")
+    _append(log, 0, 600)  # About four days
+    assert export_parquet(log, root, "KMM1", cache_dir=cache_dir) == 600
+    before = _files(root)
+
+    _append(log, 600, 20)
+    written = export_parquet(log, root, "KMM1", cache_dir=cache_dir)
+
+    changed = {os.path.basename(os.path.dirname(path)) for path in before ^ _files(root)}
+    assert len(changed) == 1
+    assert 20 < written < 200  # The appended rows plus the rest of their day
+    assert export_parquet(log, root, "KMM1", cache_dir=cache_dir) == 0
+
+    exported = read_parquet(root, columns=['timestamp', 'vwc'], board="KMM1")
+    expected = load_frame(log)[['timestamp', 'vwc']]
+    assert exported.reset_index(drop=True).equals(expected)
@@ -0,0 +1,60 @@
+"""NDJSON to partitioned Parquet export and filtered reads."""
+
+import json
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from node.storage import export_parquet, read_table
+from node.storage.parquet_store import day_partition, export_excel
+
+DAY = 86400.0
+T0 = 1760000000.0 - 1760000000.0 % DAY  # Midnight UTC
+
+def _write_log(path):
+    pcb = {adc: {key: {kind: float(n) for kind in ('voltage', 'current')}
+                 for n, key in enumerate(("voltage 1", "current 1", "voltage 2", "current 2"))}
+           for adc in ("ADC0", "ADC1")}
+    with open(path, 'w') as f:
+        for day in range(2):
+            f.write(json.dumps({"sensor_name": "pcb", "timestamp": T0 + day * DAY + 1, "status": "success",
+                                "circuit_mode": "open", "data": pcb}) + "\n")
+            f.write(json.dumps({"sensor_name": "teros_main", "timestamp": T0 + day * DAY + 2,
+                                "status": "success", "data": {"volumetric_water_content": 0.25}}) + "\n")
+        f.write('{"sensor_name": "pcb", "timest')  # Torn final line
+
+def test_export_flattens_partitions_and_skips_torn_lines(tmp_path):
+    log, root = str(tmp_path / "log.json"), str(tmp_path / "parquet")
+    _write_log(log)
+
+    assert export_parquet(log, root, "KMM1") == 4
+    days = [f"day={day}" for day in day_partition([T0, T0 + DAY])]
+    for sensor in ("pcb", "teros_main"):
+        partition = tmp_path / "parquet" / "board=KMM1" / f"sensor={sensor}"
+        assert sorted(path.name for path in partition.iterdir()) == days
+
+    table = read_table(root, columns=['timestamp', 'v1', 'i0', 'vwc', 'circuit_mode'], sensor="pcb")
+    assert table.column_names == ['timestamp', 'v1', 'i0', 'vwc', 'circuit_mode']
+    assert table.column('v1').to_pylist() == [2.0, 2.0]
+    assert table.column('i0').to_pylist() == [1.0, 1.0]
+    assert table.column('vwc').to_pylist() == [None, None]
+
+    # Re-exporting replaces the partitions instead of duplicating rows
+    assert export_parquet(log, root, "KMM1") == 4
+    assert read_table(root, columns=['timestamp']).num_rows == 4
+
+def test_time_and_board_filters(tmp_path):
+    log, root = str(tmp_path / "log.json"), str(tmp_path / "parquet")
+    _write_log(log)
+    export_parquet(log, root, "KMM1")
+    export_parquet(log, root, "KMM2")
+
+    table = read_table(root, columns=['timestamp', 'vwc'], start=T0 + DAY, board="KMM2", sensor="teros_main")
+    assert table.column('timestamp').to_pylist() == [T0 + DAY + 2]
+    assert read_table(root, columns=['timestamp'], board=["KMM1", "KMM2"], end=T0 + 2).num_rows == 2
+
+def test_excel_export_refuses_oversized_frames(tmp_path):
+    pandas = pytest.importorskip("pandas")
+    with pytest.raises(ValueError):
+        export_excel(pandas.DataFrame({'x': range(3)}), str(tmp_path / "out.xlsx"), max_rows=2)
@@ -0,0 +1,36 @@
+"""ParseCache loads of a time window."""
+
+import json
+
+from node.storage import ParseCache, load_frame
+from node.storage import parse_cache
+
+T0 = 1760000000.0
+
+def _append(path, first, count):
+    with open(path, 'a') as f:
+        for i in range(first, first + count):
+            f.write(json.dumps({"sensor_name": "teros_main", "timestamp": T0 + 60.0 * i, "status": "success",
+                                "data": {"volumetric_water_content": i / 1e4}}) + "\n")
+
+def test_window_loads_only_overlapping_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "MAX_PARTS", 4)
+    monkeypatch.setattr(parse_cache, "PART_ROWS", 300)
+    log, cache_dir = str(tmp_path / "log.json"), str(tmp_path / "cache")
+    for step in range(12):  # Appended between runs, so parts get merged along the way
+        _append(log, step * 100, 100)
+        load_frame(log, cache_dir=cache_dir)
+
+    cache = ParseCache(cache_dir)
+    assert [part['rows'] for part in cache.update(log)['parts']] == [300, 300, 300, 300]
+
+    loaded = []
+    load_part = ParseCache._load_part
+    monkeypatch.setattr(ParseCache, "_load_part",
+                        lambda self, directory, name: loaded.append(name) or load_part(self, directory, name))
+    start, end = T0 + 60.0 * 350, T0 + 60.0 * 420
+    cached = load_frame(log, columns=['vwc'], start=start, end=end, cache_dir=cache_dir)
+
+    assert cached.equals(load_frame(log, columns=['vwc'], start=start, end=end))
+    assert len(cached) == 70
+    assert len(loaded) == 1
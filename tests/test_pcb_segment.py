@@ -0,0 +1,58 @@
+"""PCB segment writer, memmap reader and physical-unit columns."""
+
+import numpy as np
+import pytest
+
+from node.adapters import PCBSegmentAdapter
+from node.config import HardwareConfig, SensorReading
+from node.storage import PCBSegment, load_segments, records_to_columns, CIRCUIT_MODES
+
+def _reading(timestamp, code, skip=()):
+    data = {}
+    for adc in ("ADC0", "ADC1"):
+        data[adc] = {key: {'raw_value': code} for key in ("voltage 1", "current 1", "voltage 2", "current 2")
+                     if (adc, key) not in skip}
+    return SensorReading(sensor_name="pcb", timestamp=timestamp, data=data)
+
+def _segments(tmp_path):
+    return sorted(str(path) for path in tmp_path.glob("*.pcbseg"))
+
+def test_round_trip_through_memmap(tmp_path):
+    config = HardwareConfig()
+    adapter = PCBSegmentAdapter(config, str(tmp_path), annotate=lambda reading: {'circuit_mode': 'closed'})
+    adapter.process_batch([_reading(10.0, 0x400000), _reading(11.0, 0xc00000, skip={("ADC1", "voltage 2")})])
+    adapter.close()
+
+    [path] = _segments(tmp_path)
+    segment = PCBSegment(path)
+    assert len(segment) == 2
+    assert segment.records['raw'][1, 0] == -0x400000
+    assert segment.records['circuit_mode'].tolist() == [CIRCUIT_MODES['closed']] * 2
+
+    columns = records_to_columns(segment.records, segment.channels)
+    assert columns['timestamp'].tolist() == [10.0, 11.0]
+    # Kinds come from the configured channel scaling
+    assert columns['ADC0 voltage 1'] == pytest.approx([2.5, -2.5])
+    assert columns['ADC0 current 1'] == pytest.approx([500.0, -500.0])
+    assert np.isnan(columns['ADC1 voltage 2'][1])
+
+def test_torn_record_is_ignored(tmp_path):
+    adapter = PCBSegmentAdapter(HardwareConfig(), str(tmp_path))
+    adapter.process_batch([_reading(float(t), 1) for t in range(3)])
+    adapter.close()
+
+    [path] = _segments(tmp_path)
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * 10)
+    assert len(PCBSegment(path)) == 3
+
+def test_load_segments_concatenates_and_slices(tmp_path):
+    adapter = PCBSegmentAdapter(HardwareConfig(), str(tmp_path), max_records=4)
+    for t in range(10):
+        adapter.process_reading(_reading(float(t), t))
+    adapter.close()
+
+    assert len(_segments(tmp_path)) == 3
+    records, channels = load_segments(str(tmp_path / "*.pcbseg"), start=2.5, end=7.0)
+    assert records['timestamp'].tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert len(channels) == 8
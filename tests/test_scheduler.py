@@ -0,0 +1,109 @@
+"""DeadlineScheduler ordering and missed-deadline policies on a fake monotonic clock."""
+
+import heapq
+import threading
+
+import pytest
+
+from node.management import scheduler as scheduler_module
+from node.management.scheduler import DeadlineScheduler, MissedDeadlinePolicy
+
+class FakeClock:
+    """Stands in for the time module; only jobs move it forward"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    return clock
+
+def run_until(scheduler, clock, end):
+    """Fire due jobs inline in deadline order, jumping the clock to each deadline, up to end"""
+    scheduler._running = True
+    generation = scheduler._generation
+    while True:
+        with scheduler._cond:
+            while scheduler._heap and not scheduler._heap[0][2].active:
+                heapq.heappop(scheduler._heap)
+            if not scheduler._heap or scheduler._heap[0][0] > end:
+                break
+            clock.now = max(clock.now, scheduler._heap[0][0])
+            job = scheduler._next_due(generation)
+            job.idle.clear()
+        scheduler._execute(job)
+    clock.now = max(clock.now, end)
+
+def _recorder(clock, log, name, duration=0.0):
+    def run():
+        log.append((name, round(clock.now - 100.0, 6)))
+        clock.now += duration
+    return run
+
+def test_jobs_fire_in_deadline_order_without_drift(clock):
+    scheduler = DeadlineScheduler(max_workers=0)
+    log = []
+    scheduler.add_job("a", _recorder(clock, log, "a", 0.2), 1.0)
+    scheduler.add_job("b", _recorder(clock, log, "b", 0.1), 1.25)
+
+    run_until(scheduler, clock, 104.9)
+
+    # Run time does not push later deadlines back
+    assert log == [("a", 1.0), ("b", 1.25), ("a", 2.0), ("b", 2.5), ("a", 3.0), ("b", 3.75), ("a", 4.0)]
+    for job in scheduler.jobs.values():
+        assert job.missed == 0 and job.max_lateness == 0.0
+
+@pytest.mark.parametrize("policy, runs, missed, lateness", [
+    # The first run overshoots to 2.5 intervals past the origin
+    (MissedDeadlinePolicy.SKIP, [0.0, 3.0, 4.0], 2, 0.0),
+    (MissedDeadlinePolicy.CATCH_UP, [0.0, 2.5, 2.5, 3.0, 4.0], 0, 1.5),
+    (MissedDeadlinePolicy.COALESCE, [0.0, 2.5, 3.0, 4.0], 1, 0.5),
+])
+def test_overrun_policy(clock, policy, runs, missed, lateness):
+    scheduler = DeadlineScheduler(max_workers=0)
+    log = []
+    durations = iter([2.5])
+
+    def read():
+        log.append(round(clock.now - 100.0, 6))
+        clock.now += next(durations, 0.0)
+
+    job = scheduler.add_job("read", read, 1.0, policy=policy, first_run=clock.now)
+    run_until(scheduler, clock, 104.0)
+
+    assert log == runs
+    assert job.missed == missed
+    assert job.max_lateness == pytest.approx(lateness)
+
+def test_restart_with_a_run_in_flight_keeps_one_deadline(clock):
+    scheduler = DeadlineScheduler(max_workers=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def read():
+        calls.append(clock.now)
+        started.set()
+        release.wait(5.0)
+
+    job = scheduler.add_job("read", read, 10.0, first_run=clock.now)
+    scheduler.start()
+    assert started.wait(5.0)
+    old_thread = scheduler._thread
+    scheduler.stop(timeout=0.05)  # The read outlasts the stop
+    scheduler.start()
+
+    release.set()
+    old_thread.join(5.0)
+    assert not old_thread.is_alive()
+    with scheduler._cond:
+        queued = [entry for entry in scheduler._heap if entry[2] is job]
+    scheduler.stop()
+
+    # The clock never moved, so the restart must not have run the job again
+    assert calls == [100.0]
+    assert [deadline for deadline, _, _ in queued] == [110.0]
@@ -0,0 +1,104 @@
+"""SerialChannel against a fake device on a pty."""
+
+import threading
+import time
+
+import pytest
+
+from fake_serial import FakeDevice
+from node.config import HardwareConfig
+from node.drivers import HardwareDriverError, SerialDriver, SerialTimeoutError
+
+@pytest.fixture
+def open_channel():
+    opened = []
+
+    def factory(replies, on_unsolicited=None):
+        device = FakeDevice(replies)
+        driver = SerialDriver(HardwareConfig(serial_settle_time=0.0))
+        driver.connect(device.port)
+        opened.append((driver, device))
+        return driver.start_channel(on_unsolicited=on_unsolicited), device
+
+    yield factory
+    for driver, device in opened:
+        driver.close()
+        device.close()
+
+def test_requests_are_pipelined(open_channel):
+    channel, device = open_channel({"A": (0.1, "a"), "B": (0.1, "b"), "C": (0.1, "c")})
+
+    start = time.monotonic()
+    futures = [channel.submit(command) for command in (b"A\n", b"B\n", b"C\n")]
+    assert time.monotonic() - start < 0.05
+
+    assert [future.result() for future in futures] == ["a", "b", "c"]
+    # Every command was on the wire before the device answered the first
+    assert max(t for t, _ in device.received) < device.sent[0][0]
+
+def test_deadline_is_per_request(open_channel):
+    channel, device = open_channel({"SLOW": (0.5, "slow"), "A": (0.0, "a")})
+
+    start = time.monotonic()
+    slow = channel.submit(b"SLOW\n", timeout=0.1)
+    patient = channel.submit(b"A\n", timeout=2.0)
+    with pytest.raises(SerialTimeoutError):
+        slow.result()
+    assert time.monotonic() - start < 0.3
+    assert not patient.done()
+
+    assert patient.result() == "a"
+    assert channel.timeouts == 1
+
+def test_cancelled_request_is_never_sent(open_channel):
+    entered, release = threading.Event(), threading.Event()
+
+    def block(message):
+        entered.set()
+        release.wait(2.0)
+
+    channel, device = open_channel({"A": (0.0, "a"), "CANCELLED": (0.0, "cancelled")}, on_unsolicited=block)
+    # Hold the I/O thread in the unsolicited handler so nothing is sent meanwhile
+    device.push("hello")
+    assert entered.wait(2.0)
+    cancelled = channel.submit(b"CANCELLED\n")
+    cancelled.cancel()
+    answered = channel.submit(b"A\n")
+    release.set()
+
+    assert answered.result() == "a"
+    assert [command for _, command in device.received] == ["A"]
+
+def test_late_reply_is_dropped_within_grace(open_channel):
+    channel, device = open_channel({"SLOW": (0.3, "slow"), "A": (0.0, "a")})
+
+    with pytest.raises(SerialTimeoutError):
+        channel.request(b"SLOW\n", timeout=0.1)
+    assert channel.request(b"A\n", timeout=2.0) == "a"
+    assert channel.late_replies == 1
+    assert channel.unsolicited == 0
+
+def test_accept_keeps_unanswered_command_off_the_next_reply(open_channel):
+    channel, device = open_channel({"R": (0.05, "r")})
+
+    # Q is never answered; without its predicate it would take R's reply
+    unanswered = channel.submit(b"Q\n", timeout=0.3, accept=lambda message: message == "q")
+    answered = channel.submit(b"R\n", timeout=2.0)
+
+    assert answered.result() == "r"
+    with pytest.raises(SerialTimeoutError):
+        unanswered.result()
+
+def test_hangup_fails_outstanding_requests(open_channel):
+    channel, device = open_channel({"SLOW": (5.0, "slow")})
+
+    future = channel.submit(b"SLOW\n", timeout=10.0)
+    time.sleep(0.05)
+    device.hangup()
+
+    with pytest.raises(HardwareDriverError) as error:
+        future.result(timeout=2.0)
+    assert not isinstance(error.value, SerialTimeoutError)
+    channel._thread.join(2.0)
+    assert not channel.running
+    assert channel.error is not None
@@ -0,0 +1,35 @@
+"""CRC-checked binary frames and batched Teros frame records."""
+
+import struct
+import time
+
+import pytest
+
+from node.drivers.serial_framing import Frame, FrameDecoder, encode_frame
+from node.sensors.teros_arduino_sensor import TerosStream
+
+RECORD = struct.Struct('<ifff')
+
+def test_decoder_reassembles_pieces_and_rejects_corruption():
+    good = [encode_frame(7, b"abc"), encode_frame(8, b""), encode_frame(9, b"xyz")]
+    corrupt = bytearray(good[1])
+    corrupt[-1] ^= 0xff
+    stream = b"noise" + good[0] + bytes(corrupt) + good[2]
+
+    decoder = FrameDecoder()
+    frames = [frame for i in range(len(stream)) for frame in decoder.feed(stream[i:i + 1])]
+
+    assert frames == [Frame(7, b"abc"), Frame(9, b"xyz")]
+    assert decoder.crc_errors == 1 and decoder.discarded >= len(b"noise")
+
+def test_batched_frame_records_are_back_dated():
+    stream = TerosStream(None, 10.0, 16, frame_records=3)
+    payload = b"".join(RECORD.pack(n, 0.25, 21.5, 120.0) for n in range(3))
+
+    before = time.time()
+    stream._on_frame(Frame(40, payload))
+    samples = stream.buffer.latest(3)
+
+    assert samples['sequence'].tolist() == [40, 41, 42]
+    assert samples['timestamp'][-1] >= before
+    assert (samples['timestamp'][1:] - samples['timestamp'][:-1]).tolist() == pytest.approx([10.0, 10.0])
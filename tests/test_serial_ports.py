@@ -0,0 +1,83 @@
+"""Cached serial port discovery and the connect handshake."""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+import serial.tools.list_ports
+
+from fake_serial import FakeDevice
+from node.config import HardwareConfig
+from node.drivers import HardwareDriverError, SerialDriver
+from node.utils.serial_utils import SerialPortRegistry
+
+def _port(device, description="USB Serial", vid=None, pid=None, serial_number=None):
+    return SimpleNamespace(device=device, description=description, vid=vid, pid=pid, serial_number=serial_number)
+
+@pytest.fixture
+def ports(monkeypatch):
+    listed = []
+    monkeypatch.setattr(serial.tools.list_ports, "comports", lambda: list(listed))
+    return listed
+
+def test_usb_identity_wins_over_the_description_heuristic(ports, tmp_path):
+    ports.extend([
+        _port("/dev/ttyACM0", "Arduino Uno", vid=0x2341, pid=0x0043, serial_number="OTHER"),
+        _port("/dev/ttyACM1", "ttyACM1", vid=0x2341, pid=0x0043, serial_number="KMM1"),
+    ])
+    config = HardwareConfig(serial_vid=0x2341, serial_pid=0x0043, serial_number="KMM1")
+    registry = SerialPortRegistry.from_config(config)
+    registry.watch_paths = (str(tmp_path),)
+
+    assert registry.find() == "/dev/ttyACM1"
+    assert SerialPortRegistry(watch_paths=(str(tmp_path),)).find() == "/dev/ttyACM0"
+
+def test_rescans_only_when_the_by_id_directory_changes(ports, tmp_path):
+    ports.append(_port("/dev/ttyACM0", serial_number="KMM1"))
+    registry = SerialPortRegistry(serial_number="KMM1", watch_paths=(str(tmp_path),))
+    os.utime(tmp_path, ns=(1, 1))
+
+    assert [registry.find() for _ in range(3)] == ["/dev/ttyACM0"] * 3
+    assert registry.scans == 1
+
+    # Replugged on another port: udev touches the directory
+    ports[:] = [_port("/dev/ttyACM1", serial_number="KMM1")]
+    assert registry.find() == "/dev/ttyACM0"
+    os.utime(tmp_path, ns=(2, 2))
+    assert registry.find() == "/dev/ttyACM1" and registry.scans == 2
+
+    registry.invalidate()
+    registry.find()
+    assert registry.scans == 3
+
+def test_without_a_watched_directory_rescans_on_the_refresh_interval(ports, tmp_path):
+    ports.append(_port("/dev/ttyUSB0"))
+    registry = SerialPortRegistry(watch_paths=(str(tmp_path / "missing"),), refresh_interval=0.05)
+
+    registry.find()
+    registry.find()
+    assert registry.scans == 1
+    time.sleep(0.06)
+    registry.find()
+    assert registry.scans == 2
+
+def test_connect_returns_once_the_device_answers_the_probe():
+    # The device ignores probes until it has "booted"
+    booted = time.monotonic() + 0.3
+    device = FakeDevice({"S": (0.0, lambda: "U" if time.monotonic() >= booted else "")})
+    driver = SerialDriver(HardwareConfig(serial_ready_retry=0.05))
+    try:
+        start = time.monotonic()
+        driver.connect(device.port, probe=b"S\n", expect="U")
+        assert 0.3 <= time.monotonic() - start < 1.0
+
+        driver.disconnect()
+        device.replies.clear()
+        driver.config.serial_ready_timeout = 0.2
+        with pytest.raises(HardwareDriverError):
+            driver.connect(device.port, probe=b"S\n", expect="U")
+        assert not driver.is_connected
+    finally:
+        driver.close()
+        device.close()
@@ -0,0 +1,53 @@
+"""Polled TerosArduinoSensor reads over its SerialChannel."""
+
+import itertools
+import struct
+
+import pytest
+
+from fake_serial import FakeDevice
+from node.config import HardwareConfig
+from node.drivers.serial_framing import encode_frame
+from node.sensors import TerosArduinoSensor
+
+RECORD = struct.Struct('<ifff')
+
+@pytest.fixture
+def arduino():
+    opened = []
+
+    def factory(framed: bool):
+        polls = itertools.count(1)
+        if framed:
+            # The sketch numbers polled frames with its running sequence
+            def measurement():
+                count = next(polls)
+                return encode_frame(count, RECORD.pack(count, 0.25, 21.5, 120.0))
+        else:
+            def measurement():
+                return f"{next(polls)},0.25, 21.5, 120.0"
+        device = FakeDevice({"S": (0.0, "U"), "F1": (0.0, "\r\nK"), "R": (0.0, measurement)})
+        config = HardwareConfig(teros_frame_records=1 if framed else 0)
+        sensor = TerosArduinoSensor("teros", config, port_detector_func=lambda: device.port)
+        opened.append((sensor, device))
+        return sensor, device
+
+    yield factory
+    for sensor, device in opened:
+        sensor.close()
+        device.close()
+
+@pytest.mark.parametrize("framed", [False, True])
+def test_late_reply_does_not_answer_next_poll(arduino, framed):
+    sensor, device = arduino(framed)
+    assert sensor.read().data['elapsed_time'] == 1
+
+    # The second measurement outlasts its poll
+    device.replies["R"] = (0.3, device.replies["R"][1])
+    sensor.config.serial_timeout = 0.1
+    assert sensor.read().data['status'] == 'no_response'
+
+    device.replies["R"] = (0.0, device.replies["R"][1])
+    sensor.config.serial_timeout = 1.0
+    assert [sensor.read().data['elapsed_time'] for _ in range(2)] == [3, 4]
+    assert sensor.channel.timeouts == 1
@@ -0,0 +1,61 @@
+"""TerosArduinoSensor push-mode streaming against a fake Arduino on a pty."""
+
+import itertools
+import time
+
+import pytest
+
+from fake_serial import FakeDevice
+from node.config import HardwareConfig
+from node.sensors import TerosArduinoSensor
+from node.sensors.teros_arduino_sensor import TerosStream
+
+@pytest.fixture
+def arduino():
+    opened = []
+
+    def factory(replies):
+        device = FakeDevice(dict(replies, S=(0.0, "U")))
+        sensor = TerosArduinoSensor("teros", HardwareConfig(), port_detector_func=lambda: device.port,
+                                    stream_interval=0.05)
+        opened.append((sensor, device))
+        return sensor, device
+
+    yield factory
+    for sensor, device in opened:
+        sensor.close()
+        device.close()
+
+def _wait_for_sequence(sensor, sequence, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        sample = sensor.stream.latest()
+        if sample is not None and int(sample['sequence']) == sequence:
+            return True
+        time.sleep(0.005)
+    return False
+
+def test_read_returns_the_newest_pushed_sample(arduino):
+    sensor, device = arduino({"X": (0.0, "K"), "P50": (0.0, "K")})
+    assert sensor.read().data['status'] == 'no_response'  # Streaming, nothing pushed yet
+
+    device.push("D1,1,0.25,21.5,120.0")
+    device.push("D3,3,0.30,21.0,125.0")
+    assert _wait_for_sequence(sensor, 3)
+
+    reading = sensor.read()
+    assert reading.status == "success"
+    assert reading.data['sequence'] == 3 and reading.data['missed'] == 1
+    assert reading.data['volumetric_water_content'] == pytest.approx(0.30)
+
+def test_failed_stream_start_falls_back_to_polling(arduino, monkeypatch):
+    monkeypatch.setattr(TerosStream, "ACK_TIMEOUT", 0.1)
+    polls = itertools.count(1)
+    # Firmware without push mode never acknowledges X
+    sensor, device = arduino({"R": (0.0, lambda: f"{next(polls)},0.25,21.5,120.0")})
+
+    assert sensor.read().data['elapsed_time'] == 1
+    start = time.monotonic()
+    assert sensor.read().data['elapsed_time'] == 2
+    assert time.monotonic() - start < 0.1
+    assert [command for _, command in device.received].count("X") == 1
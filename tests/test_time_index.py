@@ -0,0 +1,55 @@
+"""Sidecar time index written by FileStorageAdapter and windowed loads."""
+
+import os
+
+from node.adapters import FileStorageAdapter
+from node.config import SensorReading
+from node.storage import build_index, load_frame, read_index, seek_range
+from node.storage.time_index import index_path
+
+def _write(directory, count, **kwargs):
+    adapter = FileStorageAdapter(directory, flush_interval=0, index_every=10, **kwargs)
+    for t in range(count):
+        adapter.process_reading(SensorReading(sensor_name="pcb", timestamp=float(t), data={'t': t}))
+    adapter.close()
+    return adapter.path_for("pcb")
+
+def test_window_reads_only_the_indexed_range(tmp_path):
+    path = _write(str(tmp_path), 100)
+
+    entries = read_index(path)
+    assert entries['timestamp'].tolist() == [float(t) for t in range(0, 100, 10)]
+
+    lo, hi = seek_range(path, 50.0, 60.0)
+    assert 0 < lo and hi < os.path.getsize(path)
+    frame = load_frame(path, columns=['timestamp'], start=50.0, end=60.0)
+    assert frame['timestamp'].tolist() == [float(t) for t in range(50, 60)]
+
+def test_reopen_trims_entries_past_the_log(tmp_path):
+    path = _write(str(tmp_path), 100)
+    with open(path, 'rb+') as f:
+        f.truncate(os.path.getsize(path) // 2)
+
+    _write(str(tmp_path), 5)
+    entries = read_index(path)
+    assert (entries['offset'] < os.path.getsize(path)).all()
+    assert entries['timestamp'][-1] == 0.0  # The reopened file starts a new entry
+
+def test_stale_index_falls_back_to_a_full_scan(tmp_path):
+    path = _write(str(tmp_path), 100)
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    with open(path, 'wb') as f:
+        f.writelines(lines[1:])  # Offsets no longer land on the indexed records
+
+    assert seek_range(path, 50.0, 60.0) == (0, None)
+    assert len(load_frame(path, start=50.0, end=60.0)) == 10
+
+def test_rotation_moves_the_index_and_build_index_recreates_it(tmp_path):
+    path = _write(str(tmp_path), 30, max_bytes=2000)
+    rotated = [str(p) for p in tmp_path.glob("*.json") if str(p) != path]
+
+    assert rotated and all(os.path.exists(index_path(segment)) for segment in rotated)
+    os.remove(index_path(path))
+    expected = (len(load_frame(path)) + 9) // 10
+    assert build_index(path, every=10) == expected == len(read_index(path))